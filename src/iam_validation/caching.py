@@ -0,0 +1,367 @@
+"""Helpers for caching intermediate results in memory.
+
+Functions
+---------
+series_nbytes(s)
+    Get the memory used by a Series, including its index.
+fingerprint(parts)
+    Get a short hex digest that identifies a sequence of values.
+callable_name(func)
+    Get a name that identifies a function, for use in fingerprints.
+criterion_fingerprint(criterion)
+    Get a fingerprint of the configuration of a criterion or target object.
+write_atomic(path, write)
+    Write a file through a temporary file, so that it is never seen partially
+    written.
+
+Classes
+-------
+ByteSizeLRUCache
+    Least-recently-used cache bounded by the total size in bytes of its values.
+CacheStats
+    Hit, miss and eviction counts of a `ByteSizeLRUCache`.
+BlockResultStore
+    Store of results for blocks of input data, validated by content hashes.
+UnidentifiableCallableError
+    Raised when a function can not be identified for a fingerprint.
+"""
+import collections
+import dataclasses
+import functools
+import hashlib
+import os
+import tempfile
+import typing as tp
+from collections.abc import Callable, Hashable, Iterable
+from pathlib import Path
+
+import pandas as pd
+import pyam
+
+from . import pyam_helpers
+
+
+
+def series_nbytes(s: pd.Series) -> int:
+    """Get the memory used by a Series, including its index."""
+    return int(s.memory_usage(index=True, deep=False))
+###END def series_nbytes
+
+
+def fingerprint(parts: Iterable[tp.Any]) -> str:
+    """Get a short hex digest that identifies a sequence of values.
+
+    The values are hashed through their `repr`, so they should be of types
+    that have a deterministic `repr` that identifies their value (such as
+    strings, numbers and tuples or lists of them).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for _part in parts:
+        digest.update(repr(_part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+###END def fingerprint
+
+
+class UnidentifiableCallableError(ValueError):
+    """Raised when a function can not be identified for a fingerprint."""
+    ...
+###END class UnidentifiableCallableError
+
+
+def callable_name(func: Callable[..., tp.Any]) -> str:
+    """Get a name that identifies a function, for use in fingerprints.
+
+    Returns the module and qualified name of `func`, with the arguments
+    included for `functools.partial` objects.
+
+    Raises
+    ------
+    UnidentifiableCallableError
+        If `func` is a lambda or a function defined inside another function.
+        Functions created by the same factory function with different
+        parameters (such as closures) have the same qualified name, so they
+        can not be told apart by name.
+    """
+    if isinstance(func, functools.partial):
+        return f'{callable_name(func.func)}(*{func.args!r}, **{func.keywords!r})'
+    module: str = getattr(func, '__module__', None) or ''
+    qualname: str = getattr(func, '__qualname__', None) \
+        or type(func).__qualname__
+    if '<lambda>' in qualname or '<locals>' in qualname:
+        raise UnidentifiableCallableError(
+            f'The function {module}.{qualname} is a lambda or a local '
+            'function, and can not be identified by its name. Use a '
+            'module-level function or a `functools.partial` object instead.'
+        )
+    return f'{module}.{qualname}'
+###END def callable_name
+
+
+def _fingerprint_part(value: tp.Any) -> tp.Any:
+    """Convert an attribute value to a part for `criterion_fingerprint`."""
+    if isinstance(value, pyam.IamDataFrame):
+        return ('IamDataFrame', pyam_helpers.content_hash(value))
+    if isinstance(value, (pd.Series, pd.DataFrame, pd.Index)):
+        return (
+            type(value).__name__,
+            hashlib.blake2b(
+                pd.util.hash_pandas_object(value, index=True) \
+                    .to_numpy().tobytes(),
+                digest_size=16,
+            ).hexdigest(),
+        )
+    if isinstance(value, (list, tuple)):
+        return type(value)(_fingerprint_part(_v) for _v in value)
+    if isinstance(value, dict):
+        return sorted(
+            (str(_k), _fingerprint_part(_v)) for _k, _v in value.items()
+        )
+    if callable(value):
+        return callable_name(value)
+    return value
+###END def _fingerprint_part
+
+
+def criterion_fingerprint(criterion: tp.Any) -> str:
+    """Get a fingerprint of the configuration of a criterion or target object.
+
+    If `criterion` has a `fingerprint` method (such as `TimeseriesRefCriterion`
+    and `CriterionTargetRange`), its return value is used. Otherwise, the
+    fingerprint is computed from the class of `criterion` and all its instance
+    attributes, with `IamDataFrame` and pandas attributes identified by a hash
+    of their content and functions by `callable_name`. This works for the
+    `Criterion` subclasses of `pathways_ensemble_analysis`, which only store
+    their parameters as attributes.
+
+    The fingerprint is deterministic between Python sessions as long as the
+    `repr` of all attribute values is.
+    """
+    method: tp.Any = getattr(criterion, 'fingerprint', None)
+    if callable(method):
+        return method()
+    return fingerprint(
+        (
+            callable_name(type(criterion)),
+            sorted(
+                (_name, _fingerprint_part(_value))
+                for _name, _value in vars(criterion).items()
+            ),
+        )
+    )
+###END def criterion_fingerprint
+
+
+def write_atomic(path: Path, write: Callable[[str], None]) -> None:
+    """Write a file through a temporary file, then move it into place.
+
+    `write` is called with the path of a temporary file in the same directory
+    as `path`, and the temporary file is then renamed to `path`. Ensures that
+    readers (including other processes) never see a partially written file,
+    and that an existing file at `path` is kept if `write` fails.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+###END def write_atomic
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    """Hit, miss and eviction counts of a `ByteSizeLRUCache`.
+
+    Fields
+    ------
+    hits : int
+        Number of lookups that found a value.
+    misses : int
+        Number of lookups that did not find a value.
+    evictions : int
+        Number of values removed to keep the cache within its size limit.
+    entries : int
+        Number of values currently in the cache.
+    nbytes : int
+        Total size in bytes of the values currently in the cache.
+    max_nbytes : int
+        The size limit of the cache in bytes.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    max_nbytes: int
+###END class CacheStats
+
+
+_V = tp.TypeVar('_V')
+
+
+class ByteSizeLRUCache(tp.Generic[_V]):
+    """Least-recently-used cache bounded by the total size of its values.
+
+    When a value is added and the total size of the cached values exceeds
+    `max_nbytes`, the least recently used values are evicted until the total
+    is within the limit again. Values that are larger than `max_nbytes` on
+    their own are not cached at all.
+
+    Init parameters
+    ---------------
+    max_nbytes : int
+        Maximum total size of the cached values, in bytes.
+    sizeof : callable, optional
+        Function that returns the size in bytes of a value. Optional, by
+        default `series_nbytes`, which works for `pandas.Series` values.
+    """
+
+    def __init__(
+            self,
+            max_nbytes: int,
+            sizeof: Callable[[_V], int] = series_nbytes,  # pyright: ignore[reportArgumentType]
+    ):
+        if max_nbytes < 0:
+            raise ValueError('`max_nbytes` must be non-negative.')
+        self.max_nbytes: int = max_nbytes
+        self.sizeof: Callable[[_V], int] = sizeof
+        self._entries: collections.OrderedDict[Hashable, tuple[_V, int]] = \
+            collections.OrderedDict()
+        self._nbytes: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+    ###END def ByteSizeLRUCache.__init__
+
+    def __len__(self) -> int:
+        return len(self._entries)
+    ###END def ByteSizeLRUCache.__len__
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    ###END def ByteSizeLRUCache.__contains__
+
+    def get(self, key: Hashable) -> _V | None:
+        """Get a cached value and mark it as most recently used.
+
+        Returns None if `key` is not in the cache.
+        """
+        entry: tuple[_V, int] | None = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+    ###END def ByteSizeLRUCache.get
+
+    def put(self, key: Hashable, value: _V) -> None:
+        """Add a value to the cache, evicting old values if needed."""
+        nbytes: int = self.sizeof(value)
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[1]
+        if nbytes > self.max_nbytes:
+            return
+        self._entries[key] = (value, nbytes)
+        self._nbytes += nbytes
+        while self._nbytes > self.max_nbytes:
+            _, (_, _evicted_nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= _evicted_nbytes
+            self._evictions += 1
+    ###END def ByteSizeLRUCache.put
+
+    def clear(self) -> None:
+        """Remove all values from the cache. Does not reset the statistics."""
+        self._entries.clear()
+        self._nbytes = 0
+    ###END def ByteSizeLRUCache.clear
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current statistics of the cache."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            nbytes=self._nbytes,
+            max_nbytes=self.max_nbytes,
+        )
+    ###END def ByteSizeLRUCache.stats
+
+###END class ByteSizeLRUCache
+
+
+class BlockResultStore:
+    """Store of results for blocks of input data, validated by content hashes.
+
+    Used to avoid recomputing results for the parts of a dataset that have not
+    changed since the last time it was evaluated, such as the model/scenario
+    combinations that are unchanged in a resubmission (see the
+    `results_store` parameter of `TimeseriesRefCriterion`). Results are
+    stored by a key that identifies the computation (e.g., a criterion and its
+    arguments) and a block key (e.g., a `(model, scenario)` tuple), together
+    with a hash of the content of the block that the result was computed from
+    (see `pyam_helpers.block_hashes`). A stored result is only returned if the
+    hash matches, and storing a result for a block replaces any result stored
+    for an earlier version of the same block, so the store holds at most one
+    result per key and block.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that found a result with a matching hash.
+    misses : int
+        Number of lookups that did not.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[Hashable, Hashable], tuple[str, pd.Series]] \
+            = {}
+        self.hits: int = 0
+        self.misses: int = 0
+    ###END def BlockResultStore.__init__
+
+    def __len__(self) -> int:
+        return len(self._entries)
+    ###END def BlockResultStore.__len__
+
+    def get(
+            self,
+            key: Hashable,
+            block: Hashable,
+            block_hash: str,
+    ) -> pd.Series | None:
+        """Get the stored result for a block if its hash matches.
+
+        Returns None if there is no result for `key` and `block`, or if it was
+        computed from a block with a different hash.
+        """
+        entry: tuple[str, pd.Series] | None = self._entries.get((key, block))
+        if entry is None or entry[0] != block_hash:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+    ###END def BlockResultStore.get
+
+    def put(
+            self,
+            key: Hashable,
+            block: Hashable,
+            block_hash: str,
+            value: pd.Series,
+    ) -> None:
+        """Store the result for a block, replacing any earlier result."""
+        self._entries[(key, block)] = (block_hash, value)
+    ###END def BlockResultStore.put
+
+    def clear(self) -> None:
+        """Remove all results. Does not reset `hits` and `misses`."""
+        self._entries.clear()
+    ###END def BlockResultStore.clear
+
+###END class BlockResultStore
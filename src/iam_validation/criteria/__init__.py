@@ -1,3 +1,4 @@
 """Extra subclasses and functionality for `pea` Criterion classes."""
 
 from .timeseries_criteria_core import TimeseriesRefCriterion
+from .timeseries_criterion_set import TimeseriesCriterionSet
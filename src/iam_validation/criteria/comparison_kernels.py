@@ -0,0 +1,314 @@
+"""Registry of array comparison kernels for `TimeseriesRefCriterion`.
+
+A comparison kernel computes comparison values (such as differences or
+ratios) from aligned NumPy arrays of reference values and data values, in that
+order. Kernels compute their result into a single output array with in-place
+NumPy operations, and handle division by zero through a `ZeroDivisionPolicy`
+rather than by masking the result afterwards. They never modify their inputs,
+so the arrays can be taken directly from the underlying data of the
+`pyam.IamDataFrame` objects being compared without copying them.
+
+The kernels in `COMPARISON_KERNELS` can be selected by name through the
+`comparison_function` parameter of `TimeseriesRefCriterion`, and are used by
+both the `"pyam"` and the `"dense"` comparison engines. Additional kernels can
+be added with `register_comparison_kernel`.
+
+The built-in kernels are (with `ref` the reference values and `data` the data
+values):
+    - `"diff"`: `data - ref`
+    - `"absdiff"`: `abs(data - ref)`
+    - `"ratio"`: `data / ref`
+    - `"log_ratio"`: `log(data / ref)`
+    - `"pct_diff"`: `100 * (data / ref - 1)`
+    - `"rel_diff"`: `(data - ref) / abs(ref)`, i.e., the relative difference
+      with the same sign as `data - ref` also when `ref` is negative.
+
+Functions
+---------
+get_comparison_kernel
+    Get a registered kernel by name.
+register_comparison_kernel
+    Add a kernel to the registry.
+
+Classes
+-------
+ComparisonKernel
+    A named array comparison function with a default zero-division policy.
+ZeroDivisionPolicy
+    Values to use where the reference value is zero.
+UnknownComparisonKernelError
+    Raised when a kernel name is not in the registry.
+"""
+import dataclasses
+import functools
+import typing as tp
+from collections.abc import Callable
+
+import numpy as np
+
+
+
+ArrayComparisonFunc: tp.TypeAlias = Callable[[np.ndarray, np.ndarray], np.ndarray]
+"""Function that compares aligned reference and data arrays (in that order)."""
+
+
+class UnknownComparisonKernelError(ValueError):
+    """Raised when a comparison kernel name is not in the registry."""
+    ...
+###END class UnknownComparisonKernelError
+
+
+@dataclasses.dataclass(frozen=True)
+class ZeroDivisionPolicy:
+    """Values to use where a kernel divides by a zero reference value.
+
+    Fields
+    ------
+    div_by_zero_value : float or None
+        Value to use where the reference value is zero and the data value is
+        not (including where the data value is NaN). If None, the value given
+        by IEEE floating-point arithmetic is kept (e.g., `inf` or `-inf` for
+        `"ratio"`, depending on the sign of the data value).
+    zero_by_zero_value : float or None
+        Value to use where both the reference value and the data value are
+        zero. If None, the value given by IEEE floating-point arithmetic is
+        kept (usually NaN).
+    """
+    div_by_zero_value: float | None = None
+    zero_by_zero_value: float | None = None
+
+    def apply(
+            self,
+            result: np.ndarray,
+            ref: np.ndarray,
+            data: np.ndarray,
+    ) -> np.ndarray:
+        """Set the elements of `result` where `ref` is zero, in place.
+
+        Returns `result`.
+        """
+        if self.div_by_zero_value is None and self.zero_by_zero_value is None:
+            return result
+        ref_is_zero: np.ndarray = ref == 0.0
+        if not ref_is_zero.any():
+            return result
+        data_is_zero: np.ndarray = data[ref_is_zero] == 0.0
+        zero_result: np.ndarray = result[ref_is_zero]
+        if self.div_by_zero_value is not None:
+            zero_result[~data_is_zero] = self.div_by_zero_value
+        if self.zero_by_zero_value is not None:
+            zero_result[data_is_zero] = self.zero_by_zero_value
+        result[ref_is_zero] = zero_result
+        return result
+    ###END def ZeroDivisionPolicy.apply
+
+###END class ZeroDivisionPolicy
+
+
+@dataclasses.dataclass(frozen=True)
+class ComparisonKernel:
+    """A named array comparison function.
+
+    Instances are callable with the reference array, the data array and an
+    optional `ZeroDivisionPolicy`, and return a new array with the comparison
+    values.
+
+    Fields
+    ------
+    name : str
+        The name used to select the kernel.
+    func : callable
+        Function that takes the reference array, the data array and a
+        `ZeroDivisionPolicy` (in that order), and returns the comparison
+        values as a new array. It must not modify its input arrays.
+    zero_division : ZeroDivisionPolicy
+        The policy used when none is passed in a call. For kernels that do not
+        divide by the reference, the policy is ignored.
+    """
+    name: str
+    func: Callable[[np.ndarray, np.ndarray, ZeroDivisionPolicy], np.ndarray]
+    zero_division: ZeroDivisionPolicy = ZeroDivisionPolicy()
+
+    def __call__(
+            self,
+            ref: np.ndarray,
+            data: np.ndarray,
+            zero_division: tp.Optional[ZeroDivisionPolicy] = None,
+    ) -> np.ndarray:
+        return self.func(
+            ref,
+            data,
+            zero_division if zero_division is not None else self.zero_division,
+        )
+    ###END def ComparisonKernel.__call__
+
+    def bind(
+            self,
+            zero_division: tp.Optional[ZeroDivisionPolicy] = None,
+    ) -> ArrayComparisonFunc:
+        """Get a function of the reference and data arrays only.
+
+        Parameters
+        ----------
+        zero_division : ZeroDivisionPolicy, optional
+            The policy to use. Optional, by default `self.zero_division`.
+        """
+        return functools.partial(self, zero_division=zero_division)
+    ###END def ComparisonKernel.bind
+
+###END class ComparisonKernel
+
+
+def _as_float_arrays(
+        ref: np.ndarray,
+        data: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get float views of the inputs, converting only if necessary."""
+    return np.asarray(ref, dtype=float), np.asarray(data, dtype=float)
+###END def _as_float_arrays
+
+
+def _diff(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    return np.subtract(data, ref)
+###END def _diff
+
+
+def _absdiff(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    result: np.ndarray = np.subtract(data, ref)
+    return np.abs(result, out=result)
+###END def _absdiff
+
+
+def _ratio(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result: np.ndarray = np.divide(data, ref)
+    return zero_division.apply(result, ref, data)
+###END def _ratio
+
+
+def _log_ratio(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result: np.ndarray = np.divide(data, ref)
+        np.log(result, out=result)
+    return zero_division.apply(result, ref, data)
+###END def _log_ratio
+
+
+def _pct_diff(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result: np.ndarray = np.divide(data, ref)
+    np.subtract(result, 1.0, out=result)
+    np.multiply(result, 100.0, out=result)
+    return zero_division.apply(result, ref, data)
+###END def _pct_diff
+
+
+def _rel_diff(
+        ref: np.ndarray,
+        data: np.ndarray,
+        zero_division: ZeroDivisionPolicy,
+) -> np.ndarray:
+    ref, data = _as_float_arrays(ref, data)
+    result: np.ndarray = np.subtract(data, ref)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(result, np.abs(ref), out=result)
+    return zero_division.apply(result, ref, data)
+###END def _rel_diff
+
+
+COMPARISON_KERNELS: dict[str, ComparisonKernel] = {
+    _kernel.name: _kernel for _kernel in (
+        ComparisonKernel('diff', _diff),
+        ComparisonKernel('absdiff', _absdiff),
+        ComparisonKernel(
+            'ratio',
+            _ratio,
+            ZeroDivisionPolicy(div_by_zero_value=np.inf, zero_by_zero_value=1.0),
+        ),
+        ComparisonKernel(
+            'log_ratio',
+            _log_ratio,
+            ZeroDivisionPolicy(zero_by_zero_value=0.0),
+        ),
+        ComparisonKernel(
+            'pct_diff',
+            _pct_diff,
+            ZeroDivisionPolicy(zero_by_zero_value=0.0),
+        ),
+        ComparisonKernel(
+            'rel_diff',
+            _rel_diff,
+            ZeroDivisionPolicy(zero_by_zero_value=0.0),
+        ),
+    )
+}
+"""Registered comparison kernels, keyed by name. The default zero-division
+policy of `"ratio"` gives 1.0 for 0/0 and inf for x/0, and those of
+`"log_ratio"`, `"pct_diff"` and `"rel_diff"` give 0.0 (no difference) for
+0/0, and the IEEE floating-point result for x/0."""
+
+
+def get_comparison_kernel(name: str) -> ComparisonKernel:
+    """Get a registered comparison kernel by name.
+
+    Raises
+    ------
+    UnknownComparisonKernelError
+        If no kernel is registered with the given name.
+    """
+    try:
+        return COMPARISON_KERNELS[name]
+    except KeyError as _err:
+        raise UnknownComparisonKernelError(
+            f'Unknown comparison function name {name!r}. Must be one of '
+            f'{list(COMPARISON_KERNELS)}.'
+        ) from _err
+###END def get_comparison_kernel
+
+
+def register_comparison_kernel(
+        kernel: ComparisonKernel,
+        replace: bool = False,
+) -> None:
+    """Add a comparison kernel to the registry.
+
+    Parameters
+    ----------
+    kernel : ComparisonKernel
+        The kernel to add, registered under `kernel.name`.
+    replace : bool, optional
+        Whether to replace an existing kernel with the same name. If False, a
+        `ValueError` is raised if the name is already registered. Optional, by
+        default False.
+    """
+    if not replace and kernel.name in COMPARISON_KERNELS:
+        raise ValueError(
+            f'A comparison kernel named {kernel.name!r} is already registered.'
+        )
+    COMPARISON_KERNELS[kernel.name] = kernel
+###END def register_comparison_kernel
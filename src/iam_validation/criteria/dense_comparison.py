@@ -0,0 +1,312 @@
+"""Dense-array comparison engine for `TimeseriesRefCriterion`.
+
+The default comparison path of `TimeseriesRefCriterion.compare` broadcasts the
+reference data to the models and scenarios of the data to be vetted by
+renaming and concatenating `pyam.IamDataFrame` objects, and then aligns the two
+datasets on their full MultiIndexes. For large ensembles, that means the
+reference data is copied once for every model/scenario combination before any
+comparison is made.
+
+This module provides an alternative that avoids materializing the broadcast
+reference at all. The reference data is factorized once over its
+non-broadcast dimensions (by default `region`, `variable` and `year`) into a
+dense array. The rows of the data to be vetted are then mapped onto positions
+in that array by translating the codes of their MultiIndex levels, so that
+the reference value for each row can be fetched with a single fancy-indexing
+operation, and comparison values can be computed directly on numpy arrays.
+
+Classes
+-------
+DenseReference
+    Reference data factorized into a dense array over its non-broadcast
+    dimensions.
+AlignedArrays
+    Reference and data values aligned to the rows of the data being compared.
+"""
+import dataclasses
+import typing as tp
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from .. import pyam_helpers
+from ..dims import DIM
+from . import comparison_kernels
+
+
+
+ArrayComparisonFunc: tp.TypeAlias = comparison_kernels.ArrayComparisonFunc
+
+
+DENSE_COMPARISON_FUNCS: dict[str, comparison_kernels.ComparisonKernel] = \
+    comparison_kernels.COMPARISON_KERNELS
+"""Array comparison functions available for the named comparison functions
+of `TimeseriesRefCriterion` when the dense engine is used. This is the
+registry in the `comparison_kernels` module, so kernels added with
+`comparison_kernels.register_comparison_kernel` are also available here."""
+
+
+@dataclasses.dataclass(frozen=True)
+class AlignedArrays:
+    """Reference and data values aligned to the rows of compared data.
+
+    Fields
+    ------
+    index : pandas.MultiIndex
+        The index of the rows of the data that were kept after aligning. The
+        order and the `unit` level are the same as in the data.
+    reference : numpy.ndarray
+        Reference values for each row in `index`, converted to the unit of the
+        row. NaN where no reference value was found (only possible for
+        `join='input'`).
+    data : numpy.ndarray
+        The data values for each row in `index`.
+    """
+    index: pd.MultiIndex
+    reference: np.ndarray
+    data: np.ndarray
+###END class AlignedArrays
+
+
+class DenseReference:
+    """Reference data factorized into a dense array over its key dimensions.
+
+    The key dimensions are all dimensions of the reference data except the
+    broadcast dimensions and the unit dimension. The reference values are
+    stored in an array with one axis per key dimension, together with an
+    array of the same shape with the unit code for each value (-1 where the
+    reference has no value).
+
+    Init parameters
+    ---------------
+    reference : pandas.Series
+        The reference data, as a `pandas.Series` with a MultiIndex in the
+        format used by `pyam.IamDataFrame` (e.g., as returned by
+        `pyam_helpers.as_pandas_series`).
+    broadcast_dims : sequence of str
+        The dimensions to broadcast over. The reference must have a single
+        value in each of these dimensions, or a
+        `pyam_helpers.MultipleCoordinateValuesError` is raised.
+    unit_dim : str, optional
+        Name of the unit dimension. Optional, by default `dims.DIM.UNIT`.
+
+    Attributes
+    ----------
+    key_dims : tuple of str
+        The names of the key dimensions, in the order of the axes of
+        `values`.
+    key_levels : tuple of pandas.Index
+        The coordinate values along each axis of `values`.
+    values : numpy.ndarray
+        The dense array of reference values (NaN where there is no value).
+    units : pandas.Index
+        The units used in the reference, indexed by the codes in `unit_codes`.
+    unit_codes : numpy.ndarray
+        Array with the same shape as `values`, with the code in `units` of
+        the unit of each value, or -1 where the reference has no value.
+    """
+
+    def __init__(
+            self,
+            reference: pd.Series,
+            broadcast_dims: Sequence[str],
+            unit_dim: str = DIM.UNIT,
+    ):
+        ref_index: pd.MultiIndex = tp.cast(
+            pd.MultiIndex,
+            reference.index
+        ).remove_unused_levels()
+        for _dim in broadcast_dims:
+            if len(ref_index.levels[ref_index.names.index(_dim)]) > 1:
+                raise pyam_helpers.MultipleCoordinateValuesError(
+                    f'The reference has multiple coordinate values for the '
+                    f'dimension {_dim}. Can only broadcast on dimensions where '
+                    f'the reference only has a single coordinate value.'
+                )
+        self.broadcast_dims: tuple[str, ...] = tuple(broadcast_dims)
+        self.unit_dim: str = unit_dim
+        self.key_dims: tuple[str, ...] = tuple(
+            tp.cast(str, _name) for _name in ref_index.names
+            if _name not in self.broadcast_dims and _name != unit_dim
+        )
+        _key_positions: list[int] = [
+            ref_index.names.index(_dim) for _dim in self.key_dims
+        ]
+        self.key_levels: tuple[pd.Index, ...] = tuple(
+            ref_index.levels[_pos] for _pos in _key_positions
+        )
+        shape: tuple[int, ...] = tuple(len(_level) for _level in self.key_levels)
+        flat_positions: np.ndarray = np.ravel_multi_index(
+            tuple(ref_index.codes[_pos] for _pos in _key_positions),
+            shape,
+        )
+        if len(np.unique(flat_positions)) != len(flat_positions):
+            raise ValueError(
+                'The reference has more than one value for the same '
+                f'combination of the dimensions {self.key_dims}, probably '
+                'because it has more than one unit for the same variable.'
+            )
+        _unit_pos: int = ref_index.names.index(unit_dim)
+        self.units: pd.Index = ref_index.levels[_unit_pos]
+        values: np.ndarray = np.full(int(np.prod(shape)), np.nan)
+        values[flat_positions] = reference.to_numpy(dtype=float)
+        unit_codes: np.ndarray = np.full(values.shape, -1, dtype=np.intp)
+        unit_codes[flat_positions] = ref_index.codes[_unit_pos]
+        self.values: np.ndarray = values.reshape(shape)
+        self.unit_codes: np.ndarray = unit_codes.reshape(shape)
+    ###END def DenseReference.__init__
+
+    def align(
+            self,
+            data: pd.Series,
+            join: tp.Literal['inner', 'input'] = 'inner',
+            unit_context: tp.Optional[str] = None,
+    ) -> AlignedArrays:
+        """Align the reference values to the rows of `data`.
+
+        Parameters
+        ----------
+        data : pandas.Series
+            The data to be compared, with a MultiIndex that has (at least) the
+            broadcast dimensions, the key dimensions and the unit dimension of
+            the reference.
+        join : `"inner"` or `"input"`, optional
+            Whether to keep only rows of `data` that have a corresponding
+            reference value (`"inner"`), or all rows (`"input"`, in which case
+            the reference value is NaN for rows without a match). Optional, by
+            default `"inner"`.
+        unit_context : str, optional
+            Context passed to `pyam_helpers.get_unit_conversion_factor` when
+            converting the reference values to the units of `data`.
+
+        Returns
+        -------
+        AlignedArrays
+            The aligned reference and data values.
+        """
+        data_index: pd.MultiIndex = tp.cast(pd.MultiIndex, data.index)
+        found: np.ndarray = np.ones(len(data_index), dtype=bool)
+        positions: list[np.ndarray] = []
+        for _dim, _ref_level in zip(self.key_dims, self.key_levels):
+            _level_num: int = data_index.names.index(_dim)
+            # Map each coordinate value of the data level to its position in
+            # the reference level once, then look up the rows through their
+            # level codes (with -1 for values not in the reference).
+            _level_map: np.ndarray = np.append(
+                _ref_level.get_indexer(data_index.levels[_level_num]),
+                -1,
+            )
+            _row_positions: np.ndarray = _level_map[data_index.codes[_level_num]]
+            found &= _row_positions >= 0
+            positions.append(_row_positions)
+        flat_positions: np.ndarray = np.ravel_multi_index(
+            tuple(np.where(found, _pos, 0) for _pos in positions),
+            self.values.shape,
+        )
+        ref_unit_codes: np.ndarray = np.where(
+            found,
+            self.unit_codes.ravel()[flat_positions],
+            -1,
+        )
+        found &= ref_unit_codes >= 0
+        data_values: np.ndarray = data.to_numpy(dtype=float)
+        if join == 'inner':
+            keep: np.ndarray = found
+            index: pd.MultiIndex = data_index[keep]
+            flat_positions = flat_positions[keep]
+            ref_unit_codes = ref_unit_codes[keep]
+            data_values = data_values[keep]
+            found = found[keep]
+        elif join == 'input':
+            index = data_index
+        else:
+            raise ValueError(
+                f'Unsupported join value {join!r} for dense comparisons. Must '
+                'be "inner" or "input".'
+            )
+        ref_values: np.ndarray = np.where(
+            found,
+            self.values.ravel()[flat_positions],
+            np.nan,
+        )
+        ref_values *= self._conversion_factors(
+            ref_unit_codes,
+            index,
+            unit_context=unit_context,
+        )
+        return AlignedArrays(
+            index=index,
+            reference=ref_values,
+            data=data_values,
+        )
+    ###END def DenseReference.align
+
+    def _conversion_factors(
+            self,
+            ref_unit_codes: np.ndarray,
+            index: pd.MultiIndex,
+            unit_context: tp.Optional[str] = None,
+    ) -> np.ndarray:
+        """Get unit conversion factors from reference to data units by row.
+
+        The factors are computed once per distinct pair of reference unit and
+        data unit, and then broadcast to the rows. Rows without a reference
+        value get a factor of 1.0.
+        """
+        _unit_level_num: int = index.names.index(self.unit_dim)
+        data_units: pd.Index = index.levels[_unit_level_num]
+        data_unit_codes: np.ndarray = np.asarray(index.codes[_unit_level_num])
+        pair_codes: np.ndarray = (ref_unit_codes + 1) * (len(data_units) + 1) \
+            + (data_unit_codes + 1)
+        unique_pairs, pair_inverse = np.unique(pair_codes, return_inverse=True)
+        pair_factors: np.ndarray = np.ones(len(unique_pairs))
+        for _i, _pair in enumerate(unique_pairs):
+            _ref_code, _data_code = divmod(int(_pair), len(data_units) + 1)
+            if _ref_code == 0 or _data_code == 0:
+                continue
+            pair_factors[_i] = pyam_helpers.get_unit_conversion_factor(
+                self.units[_ref_code - 1],
+                data_units[_data_code - 1],
+                context=unit_context,
+            )
+        return pair_factors[pair_inverse]
+    ###END def DenseReference._conversion_factors
+
+###END class DenseReference
+
+
+def dense_compare(
+        reference: DenseReference,
+        data: pd.Series,
+        comparison_func: ArrayComparisonFunc,
+        join: tp.Literal['inner', 'input'] = 'inner',
+) -> pd.Series:
+    """Compare data to a dense reference with an array comparison function.
+
+    Parameters
+    ----------
+    reference : DenseReference
+        The factorized reference data.
+    data : pandas.Series
+        The data to compare, in the format returned by
+        `pyam_helpers.as_pandas_series`.
+    comparison_func : callable
+        Function that takes aligned reference and data arrays (in that order)
+        and returns an array of comparison values.
+    join : `"inner"` or `"input"`, optional
+        How to join the reference and the data. See `DenseReference.align`.
+
+    Returns
+    -------
+    pandas.Series
+        Comparison values, with the same index levels, order and units as the
+        matching rows of `data`.
+    """
+    aligned: AlignedArrays = reference.align(data, join=join)
+    return pd.Series(
+        comparison_func(aligned.reference, aligned.data),
+        index=aligned.index,
+        name=data.name,
+    )
+###END def dense_compare
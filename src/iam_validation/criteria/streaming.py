@@ -0,0 +1,282 @@
+"""Streaming evaluation of `TimeseriesRefCriterion` over chunks of data.
+
+`TimeseriesRefCriterion.compare` and `TimeseriesRefCriterion.get_values`
+process all the data they are given at once, so the peak memory use is
+several times the size of the full dataset. Since the reference is broadcast
+over the model and scenario dimensions (by default), and aggregations are
+only done over time and regions, the data for each model/scenario
+combination can be processed independently. The functions in this module
+process the data in chunks that each contain complete model/scenario blocks,
+and yield the results for each chunk together with running summary
+statistics, so that the peak memory use is bounded by the chunk size rather
+than the size of the full dataset.
+
+The data can be given either as an `IamDataFrame`, which is split with
+`pyam_helpers.iter_partitions`, or as an iterable of `IamDataFrame` chunks
+(e.g., read one file or one database query at a time), in which case it is
+never held in memory all at once. In the latter case, each combination of
+coordinates of the broadcast dimensions must be contained in a single chunk.
+
+Outer and reference joins (`join="outer"` or `join="reference"`) are not
+supported, since they join each block with reference coordinates that depend
+on the coordinates of all the other blocks.
+
+Functions
+---------
+stream_compare
+    Yield the results of `TimeseriesRefCriterion.compare` chunk by chunk.
+stream_values
+    Yield the results of `TimeseriesRefCriterion.get_values` chunk by chunk.
+
+Classes
+-------
+RunningSummary
+    Summary statistics of the values of all chunks processed so far.
+StreamChunk
+    The result for one chunk, with the running summary up to that chunk.
+"""
+import dataclasses
+import math
+import typing as tp
+from collections.abc import Iterable, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+import pyam
+
+from .. import pyam_helpers
+from .timeseries_criteria_core import (
+    AggDims,
+    TimeseriesRefCriterion,
+)
+
+
+
+@dataclasses.dataclass(frozen=True)
+class RunningSummary:
+    """Summary statistics of the values of all chunks processed so far.
+
+    Fields
+    ------
+    count : int
+        Number of non-NaN values.
+    nan_count : int
+        Number of NaN values.
+    total : float
+        Sum of the non-NaN values.
+    min : float
+        Smallest value, or NaN if there are no non-NaN values.
+    max : float
+        Largest value, or NaN if there are no non-NaN values.
+    """
+    count: int = 0
+    nan_count: int = 0
+    total: float = 0.0
+    min: float = math.nan
+    max: float = math.nan
+
+    @property
+    def mean(self) -> float:
+        """Mean of the non-NaN values, or NaN if there are none."""
+        return self.total / self.count if self.count > 0 else math.nan
+    ###END def RunningSummary.mean
+
+    def update(self, values: pd.Series) -> 'RunningSummary':
+        """Return a new summary that also includes `values`."""
+        _values: np.ndarray = values.to_numpy(dtype=float)
+        is_nan: np.ndarray = np.isnan(_values)
+        valid: np.ndarray = _values[~is_nan]
+        if len(valid) == 0:
+            return dataclasses.replace(
+                self,
+                nan_count=self.nan_count + int(is_nan.sum()),
+            )
+        return RunningSummary(
+            count=self.count + len(valid),
+            nan_count=self.nan_count + int(is_nan.sum()),
+            total=self.total + float(valid.sum()),
+            min=float(np.fmin(self.min, valid.min())),
+            max=float(np.fmax(self.max, valid.max())),
+        )
+    ###END def RunningSummary.update
+
+###END class RunningSummary
+
+
+@dataclasses.dataclass(frozen=True)
+class StreamChunk:
+    """The result for one chunk of a streaming evaluation.
+
+    Fields
+    ------
+    number : int
+        The number of the chunk, starting from 0.
+    values : pandas.Series
+        The result for the chunk.
+    summary : RunningSummary
+        Summary statistics of the results of this and all previous chunks.
+    """
+    number: int
+    values: pd.Series
+    summary: RunningSummary
+###END class StreamChunk
+
+
+def _iter_chunks(
+        criterion: TimeseriesRefCriterion,
+        data: pyam.IamDataFrame | Iterable[pyam.IamDataFrame],
+        max_rows: tp.Optional[int],
+) -> Iterator[pyam.IamDataFrame]:
+    """Iterate over chunks, checking that no broadcast block is split."""
+    if isinstance(data, pyam.IamDataFrame):
+        # Partitions are complete by construction, no need to check them.
+        yield from pyam_helpers.iter_partitions(
+            data,
+            dims=criterion.broadcast_dims,
+            max_rows=max_rows,
+        )
+        return
+    seen_blocks: set[tuple[tp.Any, ...]] = set()
+    for _chunk in data:
+        _index: pd.MultiIndex = tp.cast(
+            pd.MultiIndex,
+            pyam_helpers.as_pandas_series(_chunk, copy=False).index,
+        )
+        _blocks: set[tuple[tp.Any, ...]] = set(
+            pd.MultiIndex.from_arrays(
+                [_index.get_level_values(_dim)
+                 for _dim in criterion.broadcast_dims]
+            ).unique()
+        )
+        _repeated: set[tuple[tp.Any, ...]] = _blocks & seen_blocks
+        if len(_repeated) > 0:
+            raise ValueError(
+                'Data for the same combination of broadcast dimensions must be '
+                'in a single chunk, but the following combinations occur in '
+                f'more than one chunk: {sorted(_repeated)[:10]}'
+            )
+        seen_blocks |= _blocks
+        yield _chunk
+###END def _iter_chunks
+
+
+def _check_join(join: tp.Optional[str]) -> None:
+    """Raise a ValueError if `join` depends on the full dataset."""
+    if join in ('outer', 'reference'):
+        raise ValueError(
+            f'`join={join!r}` is not supported for streaming evaluation, '
+            'since the result for each chunk would depend on the coordinates '
+            'of the other chunks. Use "inner", "input" or None, or evaluate '
+            'the full dataset at once.'
+        )
+###END def _check_join
+
+
+def stream_compare(
+        criterion: TimeseriesRefCriterion,
+        data: pyam.IamDataFrame | Iterable[pyam.IamDataFrame],
+        *,
+        max_rows: tp.Optional[int] = None,
+        joint_only: tp.Optional[bool] = None,
+        filter: tp.Optional[Mapping[str, tp.Any]] = None,
+        join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+            = 'inner',
+) -> Iterator[StreamChunk]:
+    """Yield the results of `criterion.compare` chunk by chunk.
+
+    Parameters
+    ----------
+    criterion : TimeseriesRefCriterion
+        The criterion to evaluate.
+    data : pyam.IamDataFrame or iterable of pyam.IamDataFrame
+        The data to compare. If an `IamDataFrame`, it is split into partitions
+        by the broadcast dimensions of `criterion`. If an iterable, each
+        element is processed as one chunk, and a `ValueError` is raised if
+        data for the same combination of broadcast dimension coordinates
+        occurs in more than one chunk.
+    max_rows : int, optional
+        Maximum number of rows in each chunk when `data` is an
+        `IamDataFrame`, see `pyam_helpers.iter_partitions`. Ignored if `data`
+        is an iterable. Optional, by default one chunk per combination of
+        broadcast dimension coordinates.
+    joint_only, filter, join
+        Passed to `criterion.compare`. `join` can not be `"outer"` or
+        `"reference"`.
+
+    Yields
+    ------
+    StreamChunk
+        The comparison values for each chunk, with a running summary.
+
+    Raises
+    ------
+    ValueError
+        If `join` is `"outer"` or `"reference"`.
+    """
+    _check_join(join)
+    summary: RunningSummary = RunningSummary()
+    for _num, _chunk in enumerate(_iter_chunks(criterion, data, max_rows)):
+        _values: pd.Series = criterion.compare(
+            _chunk,
+            joint_only=joint_only,
+            filter=filter,
+            join=join,
+        )
+        summary = summary.update(_values)
+        yield StreamChunk(number=_num, values=_values, summary=summary)
+###END def stream_compare
+
+
+def stream_values(
+        criterion: TimeseriesRefCriterion,
+        data: pyam.IamDataFrame | Iterable[pyam.IamDataFrame],
+        *,
+        max_rows: tp.Optional[int] = None,
+        agg_dims: tp.Optional[AggDims] = None,
+        filter: tp.Optional[Mapping[str, tp.Any]] = None,
+        joint_only: tp.Optional[bool] = None,
+        join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+            = 'inner',
+) -> Iterator[StreamChunk]:
+    """Yield the results of `criterion.get_values` chunk by chunk.
+
+    Since aggregation is only done over time and regions, which are never
+    broadcast dimensions, the aggregated values for each chunk are the same
+    as the corresponding values from calling `criterion.get_values` on the
+    full dataset.
+
+    Parameters
+    ----------
+    criterion : TimeseriesRefCriterion
+        The criterion to evaluate.
+    data : pyam.IamDataFrame or iterable of pyam.IamDataFrame
+        The data to evaluate. See `stream_compare`.
+    max_rows : int, optional
+        See `stream_compare`.
+    agg_dims, filter, joint_only, join
+        Passed to `criterion.get_values`. `join` can not be `"outer"` or
+        `"reference"`.
+
+    Yields
+    ------
+    StreamChunk
+        The values for each chunk, with a running summary.
+
+    Raises
+    ------
+    ValueError
+        If `join` is `"outer"` or `"reference"`.
+    """
+    _check_join(join)
+    summary: RunningSummary = RunningSummary()
+    for _num, _chunk in enumerate(_iter_chunks(criterion, data, max_rows)):
+        _values: pd.Series = criterion.get_values(
+            _chunk,
+            agg_dims=agg_dims,
+            filter=filter,
+            joint_only=joint_only,
+            join=join,
+        )
+        summary = summary.update(_values)
+        yield StreamChunk(number=_num, values=_values, summary=summary)
+###END def stream_values
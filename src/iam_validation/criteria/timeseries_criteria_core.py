@@ -10,9 +10,14 @@ methods of the `pathways-ensemble-analysis` package (`pea`).
 import typing as tp
 from collections.abc import Iterable, Callable, Iterator, Mapping
 from enum import StrEnum
+import concurrent.futures
 import dataclasses
 import functools
+import hashlib
 import logging
+import math
+import multiprocessing
+import os
 
 import numpy as np
 import pyam
@@ -24,6 +29,10 @@ from pathways_ensemble_analysis.criteria.base import Criterion
 
 from ..type_helpers import not_none
 from .. import pyam_helpers
+from .. import pdhelpers
+from .. import caching
+from . import comparison_kernels
+from . import dense_comparison
 from ..dims import (
     IamDimNames,
     DIM,
@@ -100,6 +109,56 @@ class AggFuncTuple:
 ###END class AggFuncTuple
 
 
+@dataclasses.dataclass(frozen=True)
+class WeightedRegionAgg:
+    """Weighted aggregation over regions, for `TimeseriesRefCriterion`.
+
+    Pass an instance as the `region_agg` parameter of `TimeseriesRefCriterion`
+    to aggregate comparison values over regions with weights, such as
+    population or GDP. The weights are looked up for all rows at once by
+    their level codes (see `pdhelpers.row_weights`), and the weighted
+    reductions are computed with segment sums over the grouped rows (see
+    `pdhelpers.LevelGrouping.weighted_reduce`), rather than by calling a
+    Python function for each group.
+
+    Fields
+    ------
+    weights : pandas.Series
+        The weights, indexed by region (a flat Index with the region
+        dimension name), or by region and year (a MultiIndex with the region
+        and time dimension names). Weights indexed by year can only be used if
+        region aggregation is done before time aggregation (i.e., with
+        `agg_dim_order="region_first"` when aggregating over both).
+    func : str, optional
+        The weighted reduction, one of `pdhelpers.WEIGHTED_REDUCTIONS`:
+        `"mean"` (the default) for the weighted mean, or `"sum"` for the sum of
+        the weighted values.
+
+    Raises
+    ------
+    ValueError
+        If `func` is not a supported weighted reduction.
+    """
+    weights: pd.Series
+    func: str = 'mean'
+
+    def __post_init__(self):
+        if self.func not in pdhelpers.WEIGHTED_REDUCTIONS:
+            raise ValueError(
+                f'Unsupported weighted reduction {self.func!r}. Must be one of '
+                f'{sorted(pdhelpers.WEIGHTED_REDUCTIONS)}.'
+            )
+    ###END def WeightedRegionAgg.__post_init__
+
+###END class WeightedRegionAgg
+
+
+class MissingRegionWeightsError(ValueError):
+    """Raised when values are aggregated over regions without weights."""
+    ...
+###END class MissingRegionWeightsError
+
+
 class AggDimOrder(StrEnum):
     """The order in which aggregations should be performed.
     
@@ -127,6 +186,195 @@ class AggDims(StrEnum):
 ###END class AggDims
 
 
+class CompareEngine(StrEnum):
+    """Which implementation `TimeseriesRefCriterion.compare` should use.
+
+    `PYAM` broadcasts and joins the reference data and the data to be vetted
+    as `pyam.IamDataFrame` objects before passing them to the comparison
+    function, and works with any comparison function. `DENSE` factorizes the
+    reference into a dense array and computes comparisons directly on numpy
+    arrays (see the `dense_comparison` module), which is much faster for
+    large datasets, but only works with named comparison functions (the
+    kernels in `comparison_kernels.COMPARISON_KERNELS`) and with `join` equal
+    to `"inner"` or `"input"`. Both engines give the same values, but the
+    `DENSE` result is always sorted by its index, while the row order of the
+    `PYAM` result depends on the data to be vetted and on pyam internals.
+    """
+    PYAM = 'pyam'
+    DENSE = 'dense'
+###END class CompareEngine
+
+
+def _identity_rating(x: float) -> float:
+    """Default rating function of `TimeseriesRefCriterion`. Defined at module
+    level rather than as a lambda so that criteria can be pickled."""
+    return x
+###END def _identity_rating
+
+
+# Criterion used by `_get_values_in_worker` in worker processes of
+# `TimeseriesRefCriterion.get_values` with `n_jobs`. Set once per worker by
+# `_init_values_worker`, so that the criterion (and its reference) is not sent
+# along with each task.
+_WORKER_CRITERION: 'TimeseriesRefCriterion | None' = None
+
+
+def _init_values_worker(criterion: 'TimeseriesRefCriterion') -> None:
+    """Initializer for worker processes of `get_values` with `n_jobs`."""
+    global _WORKER_CRITERION
+    _WORKER_CRITERION = criterion
+###END def _init_values_worker
+
+
+def _get_values_in_worker(
+        data: pd.Series,
+        kwargs: Mapping[str, tp.Any],
+) -> pd.Series:
+    """Get values for one partition with the worker's criterion."""
+    return not_none(_WORKER_CRITERION).get_values(
+        pyam.IamDataFrame(data),
+        **kwargs,
+    )
+###END def _get_values_in_worker
+
+
+def _get_values_for_partition(
+        criterion: 'TimeseriesRefCriterion',
+        data: pd.Series,
+        kwargs: Mapping[str, tp.Any],
+) -> pd.Series:
+    """Get values for one partition, for tasks sent to a given executor."""
+    return criterion.get_values(pyam.IamDataFrame(data), **kwargs)
+###END def _get_values_for_partition
+
+
+@dataclasses.dataclass(frozen=True)
+class ReferenceIndex:
+    """Precomputed index data for the reference of a `TimeseriesRefCriterion`.
+
+    Instances are created and cached by `TimeseriesRefCriterion`, and rebuilt
+    when the reference object or its underlying data is replaced (see
+    `ReferenceIndex.is_valid_for`).
+
+    Fields
+    ------
+    data : pandas.Series
+        The data of the reference as a Series (as returned by
+        `pyam_helpers.as_pandas_series` without copying).
+    index : pandas.MultiIndex
+        The index of `data` with unused levels removed.
+    coordinates : dict[str, pandas.Index]
+        The coordinate values of the reference in each dimension that is not
+        broadcast over and not the unit dimension.
+    broadcast_dims : tuple of str
+        The broadcast dimensions that the index was built for.
+    unit_dim : str
+        The name of the unit dimension.
+    """
+    data: pd.Series
+    index: pd.MultiIndex
+    coordinates: dict[str, pd.Index]
+    broadcast_dims: tuple[str, ...]
+    unit_dim: str
+
+    @classmethod
+    def from_reference(
+            cls,
+            reference: pyam.IamDataFrame,
+            broadcast_dims: Iterable[str],
+            unit_dim: str = DIM.UNIT,
+    ) -> 'ReferenceIndex':
+        """Build the index for a reference `IamDataFrame`."""
+        data: pd.Series = pyam_helpers.as_pandas_series(reference, copy=False)
+        index: pd.MultiIndex = tp.cast(
+            pd.MultiIndex,
+            data.index,
+        ).remove_unused_levels()
+        _broadcast_dims: tuple[str, ...] = tuple(broadcast_dims)
+        return cls(
+            data=data,
+            index=index,
+            coordinates={
+                tp.cast(str, _dim): _level
+                for _dim, _level in zip(index.names, index.levels)
+                if _dim not in _broadcast_dims and _dim != unit_dim
+            },
+            broadcast_dims=_broadcast_dims,
+            unit_dim=unit_dim,
+        )
+    ###END def ReferenceIndex.from_reference
+
+    def is_valid_for(
+            self,
+            reference: pyam.IamDataFrame,
+            broadcast_dims: Iterable[str],
+    ) -> bool:
+        """Check whether the index is still valid for a reference.
+
+        The index is valid if `reference` still holds the same underlying data
+        object that the index was built from, and the broadcast dimensions are
+        unchanged. Note that in-place modifications of the values of the
+        reference Series are not detected, but most `pyam.IamDataFrame`
+        methods that modify data in place replace the underlying Series.
+        """
+        return pyam_helpers.as_pandas_series(reference, copy=False) \
+            is self.data and tuple(broadcast_dims) == self.broadcast_dims
+    ###END def ReferenceIndex.is_valid_for
+
+    @functools.cached_property
+    def dense(self) -> dense_comparison.DenseReference:
+        """The reference factorized for the dense comparison engine.
+
+        Built on first access and cached on the instance.
+        """
+        return dense_comparison.DenseReference(
+            self.data,
+            broadcast_dims=self.broadcast_dims,
+            unit_dim=self.unit_dim,
+        )
+    ###END def ReferenceIndex.dense
+
+    @functools.cached_property
+    def content_hash(self) -> str:
+        """Hash of the index and values of the reference data.
+
+        Computed on first access and cached on the instance.
+        """
+        return hashlib.blake2b(
+            pd.util.hash_pandas_object(self.data, index=True)
+                .to_numpy().tobytes(),
+            digest_size=16,
+        ).hexdigest()
+    ###END def ReferenceIndex.content_hash
+
+    def joint_coordinates(
+            self,
+            iamdf: pyam.IamDataFrame,
+    ) -> dict[str, list[str|int]]:
+        """Get the coordinates in each dimension shared with `iamdf`.
+
+        Returns a dict with the same keys as `self.coordinates`, and lists of
+        the coordinate values of each dimension that are present both in the
+        reference and in `iamdf`. The coordinates of `iamdf` are taken from
+        the level codes of its underlying index (see
+        `pyam_helpers.used_level_values`).
+        """
+        index: pd.MultiIndex = tp.cast(
+            pd.MultiIndex,
+            pyam_helpers.as_pandas_series(iamdf, copy=False).index,
+        )
+        return {
+            _dim: _coords.intersection(
+                pyam_helpers.used_level_values(index, _dim),
+                sort=False,
+            ).to_list()
+            for _dim, _coords in self.coordinates.items()
+        }
+    ###END def ReferenceIndex.joint_coordinates
+
+###END class ReferenceIndex
+
+
 class TimeseriesRefCriterion(Criterion):
     """Base class for criteria that compare IAM output timeseries.
 
@@ -168,8 +416,18 @@ class TimeseriesRefCriterion(Criterion):
         to conserve memory, and allow for defining multiple criteria with the
         same reference without taking up additional memory. Ensure that you do
         not unintentionally modify the reference object after passing it in.
-    comparison_function : callable
-        The function to use to compare the timeseries. The function should take
+        Index data for the reference is precomputed when the criterion is
+        created and reused by all calls to `compare` (see the
+        `reference_index` property). It is rebuilt automatically if
+        `self.reference` is set to a new object.
+    comparison_function : callable or str
+        The function to use to compare the timeseries, or the name of a
+        comparison kernel in `comparison_kernels.COMPARISON_KERNELS`
+        (`"diff"`, `"absdiff"`, `"ratio"`, `"log_ratio"`, `"pct_diff"` or
+        `"rel_diff"`, or any kernel added with
+        `comparison_kernels.register_comparison_kernel`). Named kernels
+        operate directly on the aligned NumPy arrays of the reference and the
+        data, without copying them. A callable should take
         two `pyam.IamDataFrame` objects as positional arguments and return a
         `pandas.Series` with comparison values (like differences, ratios or
         other difference measures). The first `IamDataFrame` should be one being
@@ -201,7 +459,7 @@ class TimeseriesRefCriterion(Criterion):
         that is equal to one of the enum values. See the docstring of
         `self.get_values` for valid options. Defaults to `"none"`
         (i.e., no aggregation over time or regions).
-    region_agg : AggFuncTuple, tuple, callable or str
+    region_agg : AggFuncTuple, WeightedRegionAgg, tuple, callable or str
         The function to use to aggregate the timeseries over regions when
         calling `self.get_values` if either its `agg_dims` parameter or the
         `default_agg_dims` parameter of `self.__init__` includes `"region"`. If
@@ -210,7 +468,12 @@ class TimeseriesRefCriterion(Criterion):
         that is a method name of the pandas `SeriesGroupBy` class. If it takes
         arguments, it should be a 2- or 3-tuple of the form `(func, args,
         kwargs)`, where `func` is a callable or string, or an `AggFuncTuple`
-        object (defined in this module). Optional, by default `"mean"`.
+        object (defined in this module). For weighted aggregation (e.g., a
+        population-weighted mean), pass a `WeightedRegionAgg` object (defined
+        in this module), which is much faster than a callable that computes
+        weighted values for each group. If values are aggregated for a region
+        that has no weight, a `MissingRegionWeightsError` is raised. Optional,
+        by default `"mean"`.
     time_agg : AggFuncTuple, tuple, callable or str
         The function to use to aggregate the timeseries over time if required
         when calling `self.get_values`. Must fulfill the same requirements as
@@ -236,6 +499,43 @@ class TimeseriesRefCriterion(Criterion):
     dim_names : dim.IamDimNames, optional
         The dimension names of the reference `IamDataFrame`s used for reference
         and to be vetted. Optional, defaults to `dims.DIM`
+    engine : CompareEngine or str, optional
+        Which implementation to use in `self.compare`. `"dense"` requires
+        `comparison_function` to be given as a string. See the docstring of
+        `CompareEngine` for details. Optional, defaults to `"pyam"`.
+    reference_cache_nbytes : int, optional
+        If given, cache the broadcast and filtered reference data prepared by
+        `self.compare` with the `"pyam"` engine, in a least-recently-used
+        cache with this size limit in bytes. Entries are keyed by the
+        coordinates of the input data in each dimension that the reference is
+        filtered or broadcast on, and the `filter` and `joint_only`
+        arguments, so repeated comparisons of data with the same coordinates
+        (such as corrected resubmissions of the same dataset) skip the
+        filtering and broadcasting of the reference. The cache and its
+        statistics are available as `self.reference_cache`. Optional, by
+        default None (no caching).
+    zero_division : comparison_kernels.ZeroDivisionPolicy, optional
+        How to handle division by a zero reference value, if
+        `comparison_function` is the name of a kernel that divides by the
+        reference. Optional, by default the default policy of the kernel (see
+        `comparison_kernels.COMPARISON_KERNELS`).
+    results_store : caching.BlockResultStore, optional
+        If given, `self.get_values` stores its results for each block of
+        `broadcast_dims` coordinates (i.e., each model/scenario combination by
+        default) in this store, together with a hash of the content of the
+        block (see `pyam_helpers.block_hashes`). Later calls with the same
+        arguments only compute values for blocks that are new or have
+        changed, and take the values for the other blocks from the store.
+        This makes re-vetting a resubmission in which only some scenarios
+        have changed much faster, also through classes that call
+        `self.get_values`, such as `CriterionTargetRange` and the output
+        classes. Results are stored under a key made from
+        `self.fingerprint()` (which identifies the name, reference data and
+        full configuration of the criterion) and the arguments to
+        `get_values`, so a store can be shared between different criteria.
+        The store is not used if the fingerprint can not be computed (see
+        `self.fingerprint`). The store is available as `self.results_store`.
+        Optional, by default None (no store).
     *args, **kwargs
         Additional arguments to be passed to the superclass `__init__` method.
         See the documentation of `pathways-ensemble-analysis.Criterion` for
@@ -274,24 +574,55 @@ class TimeseriesRefCriterion(Criterion):
             reference: pyam.IamDataFrame,
             comparison_function: tp.Callable[
                 [pyam.IamDataFrame, pyam.IamDataFrame], pd.Series
-            ] | tp.Literal['ratio', 'diff', 'absdiff'],
+            ] | str,
             default_agg_dims: AggDims | str = AggDims.NO_AGGREGATION,
-            region_agg: AggFuncArg = 'mean',
+            region_agg: AggFuncArg | WeightedRegionAgg = 'mean',
             time_agg: AggFuncArg = 'mean',
             agg_dim_order: AggDimOrder | str = AggDimOrder.REGION_FIRST,
             broadcast_dims: Iterable[str] = (DIM.MODEL, DIM.SCENARIO),
-            rating_function: Callable[[float], float] = lambda x: x,
+            rating_function: Callable[[float], float] = _identity_rating,
             dim_names: IamDimNames = DIM,
+            engine: CompareEngine | str = CompareEngine.PYAM,
+            reference_cache_nbytes: tp.Optional[int] = None,
+            zero_division: tp.Optional[
+                comparison_kernels.ZeroDivisionPolicy
+            ] = None,
+            results_store: tp.Optional[caching.BlockResultStore] = None,
             *args,
             **kwargs,
     ):
-        self.reference: pyam.IamDataFrame = reference
+        self._reference_index: ReferenceIndex | None = None
+        self.reference_cache: caching.ByteSizeLRUCache[pd.Series] | None = \
+            caching.ByteSizeLRUCache(reference_cache_nbytes) \
+                if reference_cache_nbytes is not None else None
+        self.results_store: caching.BlockResultStore | None = results_store
+        self.reference = reference
+        self.engine: CompareEngine = CompareEngine(engine)
+        if self.engine == CompareEngine.DENSE \
+                and comparison_function not in \
+                    dense_comparison.DENSE_COMPARISON_FUNCS:
+            raise ValueError(
+                'The dense engine requires `comparison_function` to be one of '
+                f'{list(dense_comparison.DENSE_COMPARISON_FUNCS)}.'
+            )
+        self.comparison_function_name: str | None = \
+            comparison_function if isinstance(comparison_function, str) \
+                else None
+        self.zero_division: comparison_kernels.ZeroDivisionPolicy | None = \
+            zero_division
+        self.comparison_kernel: comparison_kernels.ArrayComparisonFunc | None \
+            = comparison_kernels.get_comparison_kernel(
+                comparison_function
+            ).bind(zero_division) if isinstance(comparison_function, str) \
+                else None
         self.comparison_function: Callable[
             [pyam.IamDataFrame, pyam.IamDataFrame], pd.Series
         ] = comparison_function if callable(comparison_function) \
             else self._get_comparison_func_from_str(comparison_function)
         self._time_agg: AggFuncTuple = self._make_agg_func_tuple(time_agg)
-        self._region_agg: AggFuncTuple = self._make_agg_func_tuple(region_agg)
+        self._region_agg: AggFuncTuple | WeightedRegionAgg = region_agg \
+            if isinstance(region_agg, WeightedRegionAgg) \
+                else self._make_agg_func_tuple(region_agg)
         self.agg_dim_order: AggDimOrder = AggDimOrder(agg_dim_order)
         self.default_agg_dims: AggDims = AggDims(default_agg_dims)
         # Raise ValueError if `broadcast_dims` is not a subset of `reference.dimensions`
@@ -309,28 +640,154 @@ class TimeseriesRefCriterion(Criterion):
             *args,
             **kwargs
         )
+        self._reference_index = ReferenceIndex.from_reference(
+            reference,
+            broadcast_dims=self.broadcast_dims,
+            unit_dim=self.dim_names.UNIT,
+        )
     ###END def TimeseriesRefCriterion.__init__
 
+    def __getstate__(self) -> dict[str, tp.Any]:
+        state: dict[str, tp.Any] = self.__dict__.copy()
+        # Comparison functions given by name are closures, which can not be
+        # pickled. They are rebuilt from the name by `__setstate__`.
+        if self.comparison_function_name is not None:
+            state['comparison_function'] = None
+        return state
+    ###END def TimeseriesRefCriterion.__getstate__
+
+    def __setstate__(self, state: dict[str, tp.Any]) -> None:
+        self.__dict__.update(state)
+        if self.comparison_function_name is not None:
+            self.comparison_function = self._get_comparison_func_from_str(
+                self.comparison_function_name
+            )
+    ###END def TimeseriesRefCriterion.__setstate__
+
+    @property
+    def reference(self) -> pyam.IamDataFrame:
+        """The reference timeseries to compare against.
+
+        Setting a new reference invalidates the cached `reference_index`.
+        """
+        return self._reference
+    @reference.setter
+    def reference(self, value: pyam.IamDataFrame):
+        self._reference: pyam.IamDataFrame = value
+        self._reference_index = None
+        if self.reference_cache is not None:
+            self.reference_cache.clear()
+    ###END def TimeseriesRefCriterion.reference
+
+    @property
+    def reference_index(self) -> ReferenceIndex:
+        """Precomputed index data for `self.reference`.
+
+        The index is built when the criterion is constructed, and rebuilt on
+        access if the reference object, its underlying data or
+        `self.broadcast_dims` have been replaced since.
+        """
+        if self._reference_index is None \
+                or not self._reference_index.is_valid_for(
+                    self._reference,
+                    self.broadcast_dims,
+                ):
+            self._reference_index = ReferenceIndex.from_reference(
+                self._reference,
+                broadcast_dims=self.broadcast_dims,
+                unit_dim=self.dim_names.UNIT,
+            )
+            if self.reference_cache is not None:
+                self.reference_cache.clear()
+        return self._reference_index
+    ###END def TimeseriesRefCriterion.reference_index
+
+    def fingerprint(self) -> str:
+        """Get a fingerprint that identifies the configuration of the criterion.
+
+        The fingerprint is a hex digest of the class, `criterion_name`, a hash
+        of the content of the reference data, the comparison function,
+        zero-division policy, aggregation functions and their arguments, and
+        the aggregation and dimension settings. It is deterministic between
+        Python sessions, and can be combined with a hash of the input data to
+        identify the results of `self.get_values` (see
+        `result_cache.ResultCache`).
+
+        Comparison functions returned by `get_kernel_comparison` (such as
+        those from `get_diff_comparison` and `get_ratio_comparison`) are
+        identified by their kernel, zero-division policy and unit matching
+        setting. Other custom comparison and aggregation functions are
+        identified by their module and qualified name (see
+        `caching.callable_name`).
+
+        Raises
+        ------
+        caching.UnidentifiableCallableError
+            If a custom comparison or aggregation function is a lambda or a
+            local function that can not be identified by its name. Results
+            stores and result caches are not used for such criteria.
+        """
+        comparison_function_part: tp.Any
+        if self.comparison_function_name is not None:
+            comparison_function_part = self.comparison_function_name
+        elif hasattr(self.comparison_function, 'comparison_kernel'):
+            _kernel: comparison_kernels.ComparisonKernel = \
+                getattr(self.comparison_function, 'comparison_kernel')
+            comparison_function_part = (
+                'kernel',
+                _kernel.name,
+                caching.callable_name(_kernel.func),
+                getattr(self.comparison_function, 'zero_division'),
+                getattr(self.comparison_function, 'match_units'),
+            )
+        else:
+            comparison_function_part = \
+                caching.callable_name(self.comparison_function)
+        return caching.fingerprint(
+            (
+                caching.callable_name(type(self)),
+                self.criterion_name,
+                self.reference_index.content_hash,
+                comparison_function_part,
+                self.zero_division,
+                *(
+                    (
+                        'weighted',
+                        _agg.func,
+                        caching.criterion_fingerprint(_agg),
+                    ) if isinstance(_agg, WeightedRegionAgg) else (
+                        _agg.func if isinstance(_agg.func, str)
+                            else caching.callable_name(_agg.func),
+                        tuple(_agg.args),
+                        sorted(_agg.kwargs.items()),
+                    )
+                    for _agg in (self._time_agg, self._region_agg)
+                ),
+                str(self.agg_dim_order),
+                str(self.default_agg_dims),
+                tuple(self.broadcast_dims),
+                (
+                    self.dim_names.MODEL,
+                    self.dim_names.SCENARIO,
+                    self.dim_names.REGION,
+                    self.dim_names.VARIABLE,
+                    self.dim_names.UNIT,
+                    self.dim_names.TIME,
+                ),
+                str(self.engine),
+            )
+        )
+    ###END def TimeseriesRefCriterion.fingerprint
+
     def _get_comparison_func_from_str(
             self, 
-            comparison_function: tp.Literal['ratio', 'diff', 'absdiff'],
+            comparison_function: str,
     ) -> Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]:
         """Get a comparison function if specified as a string value."""
-        if comparison_function == 'ratio':
-            return get_ratio_comparison(
-                zero_by_zero_value=1.0,
-                div_by_zero_value=np.inf,
-            )
-        if comparison_function == 'diff':
-            return get_diff_comparison(
-                absolute=False,
-            )
-        if comparison_function == 'absdiff':
-            return get_diff_comparison(
-                absolute=True,
-            )
-        raise ValueError('`comparison_function` must be either "ratio" or '
-                         '"diff" or a callable.')
+        return get_kernel_comparison(
+            comparison_function,
+            zero_division=self.zero_division,
+        )
     ###END def TimeSeriesRefCriterion._get_comparison_func_from_str
 
     def _make_agg_func_tuple(self, agg_func: AggFuncArg) -> AggFuncTuple:
@@ -345,9 +802,45 @@ class TimeseriesRefCriterion(Criterion):
         raise TypeError(f'`agg_func` must be a string, tuple, or callable.')
     ###END def _make_agg_func_tuple
 
+    @staticmethod
+    def _segment_reduction_name(
+            agg_func_tuple: AggFuncTuple | WeightedRegionAgg,
+            s: pd.Series,
+    ) -> str | None:
+        """Get the name of the segment reduction to use for an aggregation.
+
+        Returns None if the aggregation can not use the fast path of
+        `pdhelpers.LevelGrouping`, i.e., unless `agg_func_tuple` is one of the
+        named functions in `pdhelpers.SEGMENT_REDUCTIONS` without arguments,
+        and `s` is a float Series with a MultiIndex. Also returns None for
+        weighted aggregations, which are handled by `_aggregate_region`.
+        """
+        if isinstance(agg_func_tuple, AggFuncTuple) \
+                and isinstance(agg_func_tuple.func, str) \
+                and agg_func_tuple.func in pdhelpers.SEGMENT_REDUCTIONS \
+                and len(tuple(agg_func_tuple.args)) == 0 \
+                and len(agg_func_tuple.kwargs) == 0 \
+                and isinstance(s.index, pd.MultiIndex) \
+                and s.index.nlevels > 1 \
+                and s.dtype == np.float64:
+            return agg_func_tuple.func
+        return None
+    ###END def TimeseriesRefCriterion._segment_reduction_name
+
     def _aggregate_time(self, s: pd.Series) -> pd.Series:
         """Aggregate Series returned by `self.compare` over time."""
         agg_func_tuple: AggFuncTuple = self._time_agg
+        reduction: str | None = self._segment_reduction_name(agg_func_tuple, s)
+        if reduction is not None:
+            grouping = pdhelpers.LevelGrouping.from_index(
+                tp.cast(pd.MultiIndex, s.index),
+                [self.dim_names.TIME],
+            )
+            return pd.Series(
+                grouping.reduce(s.to_numpy(), reduction),
+                index=grouping.result_index,
+                name=s.name,
+            )
         return s.groupby(
             tp.cast(FrozenList, s.index.names) \
                 .difference([self.dim_names.TIME]),
@@ -360,7 +853,20 @@ class TimeseriesRefCriterion(Criterion):
 
     def _aggregate_region(self, s: pd.Series) -> pd.Series:
         """Aggregate Series returned by `self.compare` over regions."""
+        if isinstance(self._region_agg, WeightedRegionAgg):
+            return self._aggregate_region_weighted(s, self._region_agg)
         agg_func_tuple: AggFuncTuple = self._region_agg
+        reduction: str | None = self._segment_reduction_name(agg_func_tuple, s)
+        if reduction is not None:
+            grouping = pdhelpers.LevelGrouping.from_index(
+                tp.cast(pd.MultiIndex, s.index),
+                [self.dim_names.REGION],
+            )
+            return pd.Series(
+                grouping.reduce(s.to_numpy(), reduction),
+                index=grouping.result_index,
+                name=s.name,
+            )
         return s.groupby(
             tp.cast(FrozenList, s.index.names) \
                 .difference([self.dim_names.REGION]),
@@ -371,6 +877,45 @@ class TimeseriesRefCriterion(Criterion):
         )
     ###END def TimeseriesRefCriterion._aggregate_region
 
+    def _aggregate_region_weighted(
+            self,
+            s: pd.Series,
+            weighted_agg: WeightedRegionAgg,
+    ) -> pd.Series:
+        """Aggregate over regions with weights, with a single segment sum."""
+        index: pd.MultiIndex = tp.cast(pd.MultiIndex, s.index)
+        if self.dim_names.TIME in weighted_agg.weights.index.names \
+                and self.dim_names.TIME not in index.names:
+            raise ValueError(
+                'Region weights indexed by time can not be used after the '
+                'values have been aggregated over time. Use '
+                '`agg_dim_order="region_first"` to aggregate over regions '
+                'first.'
+            )
+        values: np.ndarray = s.to_numpy(dtype=float)
+        weights: np.ndarray = pdhelpers.row_weights(index, weighted_agg.weights)
+        is_missing: np.ndarray = np.isnan(weights) & ~np.isnan(values)
+        if is_missing.any():
+            raise MissingRegionWeightsError(
+                'No weights were given for the following coordinates: '
+                + str(
+                    index[is_missing].droplevel([
+                        _name for _name in index.names
+                        if _name not in weighted_agg.weights.index.names
+                    ]).unique().to_list()[:10]
+                )
+            )
+        grouping = pdhelpers.LevelGrouping.from_index(
+            index,
+            [self.dim_names.REGION],
+        )
+        return pd.Series(
+            grouping.weighted_reduce(values, weights, weighted_agg.func),
+            index=grouping.result_index,
+            name=s.name,
+        )
+    ###END def TimeseriesRefCriterion._aggregate_region_weighted
+
     def aggregate_time_and_region(self, s: pd.Series) -> pd.Series:
         """Aggregate Series returned by `self.compare` over time and regions,
         
@@ -378,7 +923,36 @@ class TimeseriesRefCriterion(Criterion):
         passing it to `self.get_values`. Aggregation over time and regions is
         done in the order specified by the `agg_dim_order` parameter passed to
         the `__init__` method.
+
+        If both aggregation functions are named functions supported by
+        `pdhelpers.LevelGrouping`, the grouping for the first aggregation is
+        reused to derive the grouping for the second one.
         """
+        first_dim, first_agg, second_dim, second_agg = \
+            (self.dim_names.REGION, self._region_agg,
+             self.dim_names.TIME, self._time_agg) \
+                if self.agg_dim_order == AggDimOrder.REGION_FIRST else \
+            (self.dim_names.TIME, self._time_agg,
+             self.dim_names.REGION, self._region_agg)
+        first_reduction: str | None = \
+            self._segment_reduction_name(first_agg, s)
+        second_reduction: str | None = \
+            self._segment_reduction_name(second_agg, s)
+        if first_reduction is not None and second_reduction is not None \
+                and s.index.nlevels > 2:
+            first_grouping = pdhelpers.LevelGrouping.from_index(
+                tp.cast(pd.MultiIndex, s.index),
+                [first_dim],
+            )
+            second_grouping = first_grouping.drop_levels([second_dim])
+            return pd.Series(
+                second_grouping.reduce(
+                    first_grouping.reduce(s.to_numpy(), first_reduction),
+                    second_reduction,
+                ),
+                index=second_grouping.result_index,
+                name=s.name,
+            )
         if self.agg_dim_order == AggDimOrder.REGION_FIRST:
             return self._aggregate_time(self._aggregate_region(s))
         if self.agg_dim_order == AggDimOrder.TIME_FIRST:
@@ -393,6 +967,8 @@ class TimeseriesRefCriterion(Criterion):
             filter: tp.Optional[Mapping[str, tp.Any]] = None,
             join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
                 = 'inner',
+            compact: bool = False,
+            float32: bool = False,
     ) -> pd.Series:
         """Return comparison values for the given `IamDataFrame`.
 
@@ -452,49 +1028,147 @@ class TimeseriesRefCriterion(Criterion):
             of `self.reference` after broadcasting and filtering is meant. For
             `outer` and `inner`, the resulting index will usually be ordered in
             the same way as `iamdf`, though the internal sorting of
-            `pyam.IamDataFrame` may change this. Optional, by default `"inner"`,
+            `pyam.IamDataFrame` may change this. With the dense engine (see
+            `CompareEngine`), the result is always sorted by its index, so the
+            two engines give identical results whenever the pyam engine result
+            is sorted, and otherwise differ only in row order. Optional, by
+            default `"inner"`,
             which means that comparisons will only be made where non-broadcast
             index values are present in both `iamdf` and `self.reference`. To
             get no joining at all (keep both reference and input data indexes
             as they are), use `join=None`.
+        compact : bool, optional
+            Whether to return the result in a compact form, with a MultiIndex
+            rebuilt from its level codes only, without the cached object
+            arrays and hash tables left over from joining and without unused
+            level values (see `pdhelpers.compact_series`). Recommended for
+            large datasets when the result is kept in memory or passed on to
+            output classes, such as `output.TimeseriesRefFullComparisonOutput`.
+            Optional, by default False.
+        float32 : bool, optional
+            Whether to return the values as float32. Implies `compact=True`.
+            Optional, by default False.
 
         Returns
         -------
         pd.Series
             The comparison values for the given `IamDataFrame`.
         """
-        reference: pyam.IamDataFrame
-        if filter is not None:
-            reference = self.reference.filter(**filter)  # pyright: ignore[reportAssignmentType]
-        else:
-            reference = self.reference
+        if self.engine == CompareEngine.DENSE:
+            return self._finalize_result(
+                self._compare_dense(
+                    iamdf,
+                    joint_only=joint_only,
+                    filter=filter,
+                    join=join,
+                ),
+                compact=compact,
+                float32=float32,
+            )
+        ref, joined = self._join_reference(
+            iamdf,
+            joint_only=joint_only,
+            filter=filter,
+            join=join,
+        )
+        return self._finalize_result(
+            self.comparison_function(ref, joined),
+            compact=compact,
+            float32=float32,
+        )
+    ###END def TimeseriesRefCriterion.get_values
+
+    def _join_reference(
+            self,
+            iamdf: pyam.IamDataFrame,
+            joint_only: tp.Optional[bool] = None,
+            filter: tp.Optional[Mapping[str, tp.Any]] = None,
+            join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+                = 'inner',
+    ) -> tuple[pyam.IamDataFrame, pyam.IamDataFrame]:
+        """Broadcast and join the reference with `iamdf` for the pyam engine.
+
+        Implements the steps of `self.compare` before the comparison function
+        is applied, and returns the reference and the data to pass to it, in
+        that order. The arguments are as for `self.compare`.
+        """
         if joint_only is None:
             joint_only = True
+        # Check the validity of the reference index (which also clears the
+        # reference cache if it is no longer valid) before using the cache.
+        reference_index: ReferenceIndex = self.reference_index
+        _ref_data: pd.Series | None = None
+        reference: pyam.IamDataFrame | None = None
+        joint_coordinates: dict[str, list[str|int]] | None = None
+        # Work on the underlying Series of `iamdf` from here on, and only
+        # wrap it in an `IamDataFrame` again for the comparison function.
+        _input_data: pd.Series = \
+            pyam_helpers.as_pandas_series(iamdf, copy=False)
+        _iamdf_data: pd.Series = _input_data
         if joint_only:
-            joint_coordinates: dict[str, list[str|int]] = \
-                {
-                    _dim: list(set(getattr(iamdf, _dim))
-                               & set(getattr(reference, _dim)))
-                    for _dim in set(reference.dimensions) \
-                        - set(self.broadcast_dims) - {DIM.UNIT}
-                }
-            reference = not_none(reference.filter(
-                **joint_coordinates,
-                keep=True,
-                inplace=False,
-            ))
-            iamdf = not_none(iamdf.filter(
-                **joint_coordinates,
-                keep=True,
-                inplace=False,
-            ))
-        ref = pyam_helpers.broadcast_dims(reference, iamdf, self.broadcast_dims)
-        if join is not None:
-            _ref_data: pd.Series = \
-                pyam_helpers.as_pandas_series(ref, copy=False)
+            if filter is None:
+                joint_coordinates = reference_index.joint_coordinates(iamdf)
+            else:
+                reference = not_none(self.reference.filter(**filter))
+                joint_coordinates = ReferenceIndex.from_reference(
+                    reference,
+                    broadcast_dims=self.broadcast_dims,
+                    unit_dim=self.dim_names.UNIT,
+                ).joint_coordinates(iamdf)
+            # The joint coordinates are exact values, so filter on the level
+            # codes of the underlying Series rather than through
+            # `IamDataFrame.filter`, which does pattern matching on every
+            # value.
+            _iamdf_data = pyam_helpers.filter_series(
+                _input_data,
+                joint_coordinates,
+            )
+        broadcast_coords: dict[str, list[tp.Any]] = {
+            _dim: pyam_helpers.used_level_values(
+                tp.cast(pd.MultiIndex, _iamdf_data.index),
+                _dim,
+            ).tolist()
+            for _dim in self.broadcast_dims
+        }
+        cache_key: str | None = None
+        if self.reference_cache is not None:
+            cache_key = caching.fingerprint(
+                (
+                    sorted((filter or {}).items()),
+                    joint_only,
+                    sorted(joint_coordinates.items()) \
+                        if joint_coordinates is not None else None,
+                    sorted(broadcast_coords.items()),
+                )
+            )
+            _ref_data = self.reference_cache.get(cache_key)
+        if _ref_data is None:
+            if reference is None:
+                reference = self.reference if filter is None \
+                    else not_none(self.reference.filter(**filter))
+            _ref_series: pd.Series = \
+                pyam_helpers.as_pandas_series(reference, copy=False)
+            if joint_coordinates is not None:
+                _ref_series = pyam_helpers.filter_series(
+                    _ref_series,
+                    joint_coordinates,
+                )
+            # Broadcast the underlying Series directly, to avoid constructing
+            # an intermediate `IamDataFrame` that would be discarded after the
+            # join.
+            _ref_data = pyam_helpers.broadcast_series(
+                _ref_series,
+                broadcast_coords,
+            )
+            if self.reference_cache is not None:
+                self.reference_cache.put(not_none(cache_key), _ref_data)
+        ref: pyam.IamDataFrame
+        if join is None:
+            ref = pyam.IamDataFrame(_ref_data)
+            if _iamdf_data is not _input_data:
+                iamdf = pyam.IamDataFrame(_iamdf_data)
+        else:
             _ref_data_df: pd.DataFrame = _ref_data.reset_index(DIM.UNIT)
-            _iamdf_data: pd.Series = \
-                pyam_helpers.as_pandas_series(iamdf, copy=False)
             _iamdf_data_df: pd.DataFrame = _iamdf_data.reset_index(DIM.UNIT)
             _join_index: pd.Index
             if join == 'inner':
@@ -520,8 +1194,61 @@ class TimeseriesRefCriterion(Criterion):
                     .set_index(DIM.UNIT, append=True) \
                         .reorder_levels(_iamdf_data.index.names),
             )
-        return self.comparison_function(ref, iamdf)
-    ###END def TimeseriesRefCriterion.get_values
+        return ref, iamdf
+    ###END def TimeseriesRefCriterion._join_reference
+
+    @staticmethod
+    def _finalize_result(
+            result: pd.Series,
+            compact: bool,
+            float32: bool,
+    ) -> pd.Series:
+        """Compact `result` if requested by `compact` or `float32`."""
+        if compact or float32:
+            return pdhelpers.compact_series(result, float32=float32)
+        return result
+    ###END def TimeseriesRefCriterion._finalize_result
+
+    def _compare_dense(
+            self,
+            iamdf: pyam.IamDataFrame,
+            joint_only: tp.Optional[bool] = None,
+            filter: tp.Optional[Mapping[str, tp.Any]] = None,
+            join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+                = 'inner',
+    ) -> pd.Series:
+        """Implementation of `self.compare` for the dense engine.
+
+        With `joint_only` True (the default), only rows of `iamdf` with
+        matching reference values are kept, which gives the same result as
+        `join="inner"`. Otherwise, `join` must be `"inner"` or `"input"`. The
+        result is sorted by its index rather than following the row order of
+        `iamdf`, so that it does not depend on how `iamdf` was constructed.
+        """
+        if joint_only is None or joint_only:
+            join = 'inner'
+        if join not in ('inner', 'input'):
+            raise ValueError(
+                f'`join={join!r}` is not supported by the dense engine. Use '
+                '"inner" or "input", or the "pyam" engine.'
+            )
+        dense_ref: dense_comparison.DenseReference = \
+            self.reference_index.dense if filter is None \
+                else dense_comparison.DenseReference(
+                    pyam_helpers.as_pandas_series(
+                        not_none(self.reference.filter(**filter)),
+                        copy=False,
+                    ),
+                    broadcast_dims=self.broadcast_dims,
+                    unit_dim=self.dim_names.UNIT,
+                )
+        return dense_comparison.dense_compare(
+            dense_ref,
+            pyam_helpers.as_pandas_series(iamdf, copy=False),
+            comparison_func=not_none(self.comparison_kernel),
+            join=tp.cast(tp.Literal['inner', 'input'], join),
+        ).sort_index()
+    ###END def TimeseriesRefCriterion._compare_dense
 
     def get_values(
             self,
@@ -531,6 +1258,13 @@ class TimeseriesRefCriterion(Criterion):
             joint_only: tp.Optional[bool] = None,
             join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
                 = 'inner',
+            n_jobs: tp.Optional[int] = None,
+            executor: tp.Optional[concurrent.futures.Executor] = None,
+            mp_context: tp.Optional[multiprocessing.context.BaseContext] \
+                = None,
+            compact: bool = False,
+            float32: bool = False,
+            use_results_store: bool = True,
     ) -> pd.Series:
         """Return comparison values aggregated over region and time. This
         function calls `self.compare` but adds the option to aggregate over time
@@ -564,6 +1298,48 @@ class TimeseriesRefCriterion(Criterion):
         join : {'inner', 'outer', 'reference', 'input', None}, optional
             How to join the `reference` and `iamdf` timeseries. See the
             documentation of the `.compare` method for details.
+        n_jobs : int, optional
+            Number of worker processes to compute the values in parallel, or
+            -1 to use one process per CPU. `file` is split into partitions of
+            complete blocks of `self.broadcast_dims` coordinates (see
+            `pyam_helpers.iter_partitions`), which can be processed
+            independently since the reference is broadcast over those
+            dimensions and aggregation is only done over time and regions.
+            The criterion is sent to each worker process once when it starts,
+            rather than with each partition. The workers are started with
+            `mp_context`. The criterion must be picklable (which, e.g.,
+            requires `rating_function` to be a module-level function rather
+            than a lambda), unless a `"fork"` context is used. The results are
+            concatenated in the order of the partitions, which gives the same
+            values in the same order as without `n_jobs`. Ignored with
+            `join="outer"` or `join="reference"`, since the reference
+            coordinates that are joined with each partition then depend on the
+            coordinates of the other partitions. Optional, by default None
+            (compute the values in the current process).
+        executor : concurrent.futures.Executor, optional
+            Executor to process the partitions with instead of starting a new
+            process pool. Each task is sent together with the criterion, so
+            for a `ProcessPoolExecutor` the criterion is pickled for each
+            partition. If given, `n_jobs` is only used to determine the number
+            of partitions (by default one per CPU). Optional, by default None.
+        mp_context : multiprocessing.context.BaseContext, optional
+            Context to start the worker processes of `n_jobs` with. Optional,
+            by default the `"forkserver"` context where it is available, and
+            the platform default otherwise. The `"fork"` context is not used
+            by default, since forking a process that runs other threads
+            (e.g., for BLAS) can deadlock the workers.
+        compact, float32 : bool, optional
+            Whether to return the values in a compact form, see `self.compare`.
+            Aggregation is done before converting the values to float32.
+            Optional, by default False.
+        use_results_store : bool, optional
+            Whether to use `self.results_store` (if set) to only compute values
+            for blocks of `file` that have changed since they were last
+            evaluated. Set to False to compute all values and leave the store
+            unchanged. The store is never used with `join="outer"` or
+            `join="reference"`, since the reference coordinates that are
+            joined with each block then depend on the coordinates of the other
+            blocks. Optional, by default True.
 
         Returns
         -------
@@ -572,21 +1348,214 @@ class TimeseriesRefCriterion(Criterion):
         """
         if agg_dims is None:
             agg_dims = self.default_agg_dims
+        if use_results_store and self.results_store is not None \
+                and join not in ('outer', 'reference'):
+            return self._finalize_result(
+                self._get_values_incremental(
+                    file,
+                    store=self.results_store,
+                    n_jobs=n_jobs,
+                    executor=executor,
+                    mp_context=mp_context,
+                    kwargs=dict(
+                        agg_dims=agg_dims,
+                        filter=filter,
+                        joint_only=joint_only,
+                        join=join,
+                    ),
+                ),
+                compact=compact,
+                float32=float32,
+            )
+        # With outer and reference joins, the values for each partition
+        # depend on the coordinates of the other partitions, so those are
+        # always computed in the current process.
+        if (executor is not None or (n_jobs is not None and n_jobs != 1)) \
+                and join not in ('outer', 'reference'):
+            return self._get_values_parallel(
+                file,
+                n_jobs=n_jobs,
+                executor=executor,
+                mp_context=mp_context,
+                kwargs=dict(
+                    agg_dims=agg_dims,
+                    filter=filter,
+                    joint_only=joint_only,
+                    join=join,
+                    compact=compact,
+                    float32=float32,
+                    use_results_store=False,
+                ),
+            )
         compared_data: pd.Series = \
             self.compare(file, filter=filter, joint_only=joint_only, join=join)
+        values: pd.Series
         match agg_dims:
             case AggDims.TIME_AND_REGION:
-                return self.aggregate_time_and_region(compared_data)
+                values = self.aggregate_time_and_region(compared_data)
             case AggDims.TIME:
-                return self._aggregate_time(compared_data)
+                values = self._aggregate_time(compared_data)
             case AggDims.REGION:
-                return self._aggregate_region(compared_data)
+                values = self._aggregate_region(compared_data)
             case AggDims.NO_AGGREGATION:
-                return compared_data
+                values = compared_data
             case _:
                 raise ValueError(f'Unknown agg_dims value {agg_dims}.')
+        return self._finalize_result(values, compact=compact, float32=float32)
     ###END def TimeseriesRefCriterion.get_values
 
+    def _get_values_incremental(
+            self,
+            file: pyam.IamDataFrame,
+            store: caching.BlockResultStore,
+            n_jobs: tp.Optional[int],
+            executor: tp.Optional[concurrent.futures.Executor],
+            mp_context: tp.Optional[multiprocessing.context.BaseContext],
+            kwargs: Mapping[str, tp.Any],
+    ) -> pd.Series:
+        """Implementation of `self.get_values` with a results store."""
+        hashes: pd.Series = pyam_helpers.block_hashes(
+            file,
+            dims=self.broadcast_dims,
+        )
+        if len(hashes) == 0:
+            return self.get_values(file, use_results_store=False, **kwargs)
+        # The key must identify the full configuration of the criterion, so
+        # that differently configured criteria can share a store.
+        try:
+            criterion_fingerprint: str = self.fingerprint()
+        except caching.UnidentifiableCallableError:
+            return self.get_values(
+                file,
+                n_jobs=n_jobs,
+                executor=executor,
+                mp_context=mp_context,
+                use_results_store=False,
+                **kwargs,
+            )
+        store_key: str = caching.fingerprint(
+            (
+                criterion_fingerprint,
+                str(kwargs['agg_dims']),
+                sorted((kwargs['filter'] or {}).items()),
+                kwargs['joint_only'],
+                kwargs['join'],
+            )
+        )
+        block_values: list[pd.Series | None] = [
+            store.get(store_key, _block, _hash)
+            for _block, _hash in hashes.items()
+        ]
+        changed: np.ndarray = np.flatnonzero(
+            [_values is None for _values in block_values]
+        )
+        if len(changed) > 0:
+            block_numbers, _ = pyam_helpers.block_codes(
+                file,
+                dims=self.broadcast_dims,
+            )
+            data: pd.Series = pyam_helpers.as_pandas_series(file, copy=False)
+            new_values: pd.Series = self.get_values(
+                pyam.IamDataFrame(
+                    data.iloc[np.flatnonzero(np.isin(block_numbers, changed))]
+                ),
+                n_jobs=n_jobs,
+                executor=executor,
+                mp_context=mp_context,
+                use_results_store=False,
+                **kwargs,
+            )
+            # The blocks in `hashes.index` are always tuples, while `groupby`
+            # gives scalar keys when grouping on a single level.
+            group_levels: str | list[str] = self.broadcast_dims[0] \
+                if len(self.broadcast_dims) == 1 else self.broadcast_dims
+            new_block_values: dict[tuple[tp.Any, ...], pd.Series] = {
+                _key if isinstance(_key, tuple) else (_key,): _group
+                for _key, _group in new_values.groupby(
+                    level=group_levels,
+                    sort=False,
+                )
+            }
+            unmatched_blocks: set[tuple[tp.Any, ...]] = \
+                set(new_block_values) - set(hashes.index[changed])
+            if len(unmatched_blocks) > 0:
+                raise ValueError(
+                    'The values computed for changed blocks could not be '
+                    'matched to the blocks of the input data. Unmatched '
+                    f'blocks: {sorted(unmatched_blocks)}'
+                )
+            for _num in changed:
+                _block: tuple[tp.Any, ...] = hashes.index[_num]
+                # Blocks with no values in the result (e.g., no joint
+                # coordinates with the reference) are stored as empty.
+                _values: pd.Series = new_block_values.get(
+                    _block,
+                    new_values.iloc[:0],
+                )
+                store.put(store_key, _block, hashes.iloc[_num], _values)
+                block_values[_num] = _values
+        return pd.concat([not_none(_values) for _values in block_values])
+    ###END def TimeseriesRefCriterion._get_values_incremental
+
+    # Number of partitions per worker in `_get_values_parallel`. More than one
+    # partition per worker evens out the load when blocks differ in size.
+    _partitions_per_worker: tp.ClassVar[int] = 4
+
+    def _get_values_parallel(
+            self,
+            file: pyam.IamDataFrame,
+            n_jobs: tp.Optional[int],
+            executor: tp.Optional[concurrent.futures.Executor],
+            mp_context: tp.Optional[multiprocessing.context.BaseContext],
+            kwargs: Mapping[str, tp.Any],
+    ) -> pd.Series:
+        """Implementation of `self.get_values` with `n_jobs` or `executor`."""
+        if n_jobs is None or n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        elif n_jobs < 1:
+            raise ValueError('`n_jobs` must be a positive integer or -1.')
+        num_rows: int = len(pyam_helpers.as_pandas_series(file, copy=False))
+        partitions: list[pd.Series] = [
+            pyam_helpers.as_pandas_series(_partition, copy=False)
+            for _partition in pyam_helpers.iter_partitions(
+                file,
+                dims=self.broadcast_dims,
+                max_rows=max(
+                    1,
+                    math.ceil(
+                        num_rows / (n_jobs * self._partitions_per_worker)
+                    ),
+                ),
+            )
+        ]
+        if len(partitions) <= 1:
+            return self.get_values(file, **kwargs)
+        results: list[pd.Series]
+        if executor is not None:
+            results = list(executor.map(
+                _get_values_for_partition,
+                [self] * len(partitions),
+                partitions,
+                [kwargs] * len(partitions),
+            ))
+        else:
+            if mp_context is None \
+                    and 'forkserver' in multiprocessing.get_all_start_methods():
+                mp_context = multiprocessing.get_context('forkserver')
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(n_jobs, len(partitions)),
+                    mp_context=mp_context,
+                    initializer=_init_values_worker,
+                    initargs=(self,),
+            ) as _pool:
+                results = list(_pool.map(
+                    _get_values_in_worker,
+                    partitions,
+                    [kwargs] * len(partitions),
+                ))
+        return pd.concat(results)
+    ###END def TimeseriesRefCriterion._get_values_parallel
+
 ###END class TimeseriesRefCriterion
 
 
@@ -594,13 +1563,15 @@ class TimeseriesRefCriterion(Criterion):
 def pyam_series_comparison(
         func: Callable[[pd.Series, pd.Series], pd.Series],
         *,
-        match_units: bool = True
+        match_units: bool = True,
+        copy: bool = True,
 ) -> Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]:
     ...
 @tp.overload
 def pyam_series_comparison(
         *,
-        match_units: bool = True
+        match_units: bool = True,
+        copy: bool = True,
 ) -> Callable[
         [Callable[[pd.Series, pd.Series], pd.Series]],
         Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]
@@ -609,7 +1580,8 @@ def pyam_series_comparison(
 def pyam_series_comparison(
         func: tp.Optional[Callable[[pd.Series, pd.Series], pd.Series]] = None,
         *,
-        match_units: bool = True
+        match_units: bool = True,
+        copy: bool = True,
 ) -> Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series] | \
     Callable[
         [Callable[[pd.Series, pd.Series], pd.Series]],
@@ -624,7 +1596,10 @@ def pyam_series_comparison(
     made, using the `pyam_helpers.match_units` function. If you are sure that
     the units are already consistent, you can pass `match_units=False` to the
     decorator (an optional keyword argument) to skip this step and improve
-    performance.
+    performance. By default, the decorated function receives copies of the
+    data of the `IamDataFrame`s. If it is guaranteed not to modify its
+    arguments, you can pass `copy=False` to pass the underlying data directly
+    and avoid the copies (see `pyam_helpers.as_pandas_series`).
     """
     def decorator(
             _func: Callable[[pd.Series, pd.Series], pd.Series]
@@ -638,8 +1613,8 @@ def pyam_series_comparison(
                     match_df=iamdf2
                 )
             return _func(
-                pyam_helpers.as_pandas_series(iamdf1),
-                pyam_helpers.as_pandas_series(iamdf2)
+                pyam_helpers.as_pandas_series(iamdf1, copy=copy),
+                pyam_helpers.as_pandas_series(iamdf2, copy=copy)
             )
         return wrapper
     if func is None:
@@ -648,6 +1623,74 @@ def pyam_series_comparison(
 ###END def pyam_series_comparison
 
 
+def get_kernel_comparison(
+        kernel: comparison_kernels.ComparisonKernel | str,
+        zero_division: tp.Optional[comparison_kernels.ZeroDivisionPolicy] \
+            = None,
+        match_units: tp.Optional[bool] = None,
+) -> Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]:
+    """Get comparison function that applies a comparison kernel.
+
+    The returned function passes the underlying data of the `IamDataFrame`s
+    to the kernel as NumPy arrays without copying them. If the two
+    `IamDataFrame`s do not have the same index, the data are first aligned
+    the same way as by `pandas` arithmetic operations (i.e., an outer join).
+
+    Parameters
+    ----------
+    kernel : comparison_kernels.ComparisonKernel or str
+        The kernel, or the name of a kernel in
+        `comparison_kernels.COMPARISON_KERNELS`.
+    zero_division : comparison_kernels.ZeroDivisionPolicy, optional
+        How to handle division by zero. Optional, by default the default
+        policy of the kernel.
+    match_units : bool or None, optional
+        Whether to ensure that the units of the reference and data are
+        consistent. If None, the default of the `pyam_series_comparison`
+        function decorator will be used. Optional, by default None.
+
+    Returns
+    -------
+    Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]
+        The comparison function. It has the attributes `comparison_kernel`
+        (the `ComparisonKernel`), `zero_division` (the zero-division policy
+        that is applied) and `match_units` (the `match_units` argument),
+        which identify it in `TimeseriesRefCriterion.fingerprint`.
+    """
+    _kernel: comparison_kernels.ComparisonKernel = \
+        comparison_kernels.get_comparison_kernel(kernel) \
+            if isinstance(kernel, str) else kernel
+    kernel_func: comparison_kernels.ArrayComparisonFunc = \
+        _kernel.bind(zero_division)
+    def _kernel_series_func(_ref: pd.Series, _data: pd.Series) -> pd.Series:
+        if not _ref.index.equals(_data.index):
+            _data, _ref = _data.align(_ref)
+        return pd.Series(
+            kernel_func(_ref.to_numpy(), _data.to_numpy()),
+            index=_data.index,
+            name=_data.name if _data.name == _ref.name else None,
+        )
+    comparison_func: Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]
+    if match_units is None:
+        comparison_func = pyam_series_comparison(_kernel_series_func, copy=False)
+    else:
+        comparison_func = pyam_series_comparison(
+            _kernel_series_func,
+            match_units=match_units,
+            copy=False,
+        )
+    # The function is a closure, so it can not be identified by its name.
+    setattr(comparison_func, 'comparison_kernel', _kernel)
+    setattr(
+        comparison_func,
+        'zero_division',
+        zero_division if zero_division is not None else _kernel.zero_division,
+    )
+    setattr(comparison_func, 'match_units', match_units)
+    return comparison_func
+###END def get_kernel_comparison
+
+
 def get_diff_comparison(
         absolute: bool = False,
         match_units: tp.Optional[bool] = None,
@@ -670,13 +1713,10 @@ def get_diff_comparison(
     Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]
         The comparison function.
     """
-    diff_func: Callable[[pd.Series, pd.Series], pd.Series] = \
-        (lambda _ref, _data: _data - _ref) if not absolute \
-            else (lambda _ref, _data: (_data - _ref).abs())
-    if match_units is None:
-        return pyam_series_comparison(diff_func)
-    else:
-        return pyam_series_comparison(diff_func, match_units=match_units)
+    return get_kernel_comparison(
+        'absdiff' if absolute else 'diff',
+        match_units=match_units,
+    )
 ###END def get_diff_comparison
 
 def get_ratio_comparison(
@@ -721,21 +1761,12 @@ def get_ratio_comparison(
     Callable[[pyam.IamDataFrame, pyam.IamDataFrame], pd.Series]
         The comparison function.
     """
-    def _division_func(_ref: pd.Series, _data: pd.Series) -> pd.Series:
-        _div_series: pd.Series = _data / _ref
-        if div_by_zero_value is not None:
-            _div_series = _div_series.mask(
-                (_ref == 0.0) & (_data != 0.0),
-                other=div_by_zero_value,
-            )
-        if zero_by_zero_value is not None:
-            _div_series = _div_series.mask(
-                (_ref == 0.0) & (_data == 0.0),
-                other=zero_by_zero_value,
-            )
-        return _div_series
-    if match_units is None:
-        return pyam_series_comparison(_division_func)
-    else:
-        return pyam_series_comparison(_division_func, match_units=match_units)
+    return get_kernel_comparison(
+        'ratio',
+        zero_division=comparison_kernels.ZeroDivisionPolicy(
+            div_by_zero_value=div_by_zero_value,
+            zero_by_zero_value=zero_by_zero_value,
+        ),
+        match_units=match_units,
+    )
 ###END def get_ratio_comparison
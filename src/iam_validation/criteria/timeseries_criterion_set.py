@@ -0,0 +1,237 @@
+"""Evaluation of multiple timeseries criteria with shared data alignment.
+
+When several `TimeseriesRefCriterion` instances are evaluated on the same
+data, each of them separately filters, broadcasts and joins the reference
+data with the data to be vetted, and harmonizes units. Criteria that use the
+same reference data only differ in the comparison function and aggregation
+applied after those steps. The `TimeseriesCriterionSet` class in this module
+groups criteria by reference data and comparison engine, aligns the reference
+and the data once per group in the same way as the engine of the criteria
+(see `CompareEngine`), and then applies the comparison functions of all
+criteria in the group to the shared aligned data.
+
+Classes
+-------
+TimeseriesCriterionSet
+    A set of `TimeseriesRefCriterion` instances that are evaluated together.
+"""
+import typing as tp
+from collections.abc import Iterable, Mapping
+
+import pandas as pd
+import pyam
+
+from .. import pyam_helpers
+from ..type_helpers import not_none
+from . import dense_comparison
+from .timeseries_criteria_core import (
+    AggDims,
+    CompareEngine,
+    TimeseriesRefCriterion,
+)
+
+
+
+class TimeseriesCriterionSet:
+    """A set of `TimeseriesRefCriterion` instances that are evaluated together.
+
+    Criteria are grouped by their reference (the content of the reference
+    data, broadcast dimensions and unit dimension name) and their comparison
+    engine. For each group, the data to be vetted is aligned with the
+    reference once, in the same way as by the engine of the criteria, and the
+    comparison function of each criterion in the group is applied to the
+    shared aligned data. The results are therefore the same as from the
+    `compare` method of each criterion.
+
+    Only criteria with comparison kernels are grouped, i.e., comparison
+    functions specified by name (see `comparison_kernels.COMPARISON_KERNELS`),
+    or for the pyam engine also those returned by
+    `timeseries_criteria_core.get_kernel_comparison`, which do not modify
+    their input. Other criteria, and criteria with the dense engine when a
+    `join` value not supported by it is used, are evaluated separately by
+    calling their own `compare` method.
+
+    Init parameters
+    ---------------
+    criteria : iterable of TimeseriesRefCriterion
+        The criteria to evaluate. Must have unique `criterion_name` values.
+
+    Attributes
+    ----------
+    criteria : tuple of TimeseriesRefCriterion
+        The criteria in the set, in the order given.
+    """
+
+    def __init__(self, criteria: Iterable[TimeseriesRefCriterion]):
+        self.criteria: tuple[TimeseriesRefCriterion, ...] = tuple(criteria)
+        names: list[str] = [
+            _criterion.criterion_name for _criterion in self.criteria
+        ]
+        if len(set(names)) != len(names):
+            raise ValueError('The criteria must have unique names.')
+    ###END def TimeseriesCriterionSet.__init__
+
+    def __len__(self) -> int:
+        return len(self.criteria)
+    ###END def TimeseriesCriterionSet.__len__
+
+    def _reference_groups(
+            self,
+            engine: CompareEngine,
+    ) -> list[list[TimeseriesRefCriterion]]:
+        """Group the criteria with `engine` that can share alignment."""
+        groups: dict[tuple[str, tuple[str, ...], str],
+                     list[TimeseriesRefCriterion]] = {}
+        for _criterion in self.criteria:
+            if _criterion.engine != engine:
+                continue
+            if _criterion.comparison_kernel is None and (
+                    engine == CompareEngine.DENSE
+                    or not hasattr(_criterion.comparison_function,
+                                   'comparison_kernel')
+            ):
+                continue
+            groups.setdefault(
+                (
+                    _criterion.reference_index.content_hash,
+                    tuple(_criterion.broadcast_dims),
+                    _criterion.dim_names.UNIT,
+                ),
+                [],
+            ).append(_criterion)
+        return list(groups.values())
+    ###END def TimeseriesCriterionSet._reference_groups
+
+    def compare(
+            self,
+            iamdf: pyam.IamDataFrame,
+            joint_only: tp.Optional[bool] = None,
+            filter: tp.Optional[Mapping[str, tp.Any]] = None,
+            join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+                = 'inner',
+    ) -> dict[str, pd.Series]:
+        """Compare `iamdf` to the references of all criteria in the set.
+
+        Parameters
+        ----------
+        iamdf : pyam.IamDataFrame
+            The data to compare.
+        joint_only, filter, join
+            Passed to or interpreted as in `TimeseriesRefCriterion.compare`.
+
+        Returns
+        -------
+        dict[str, pandas.Series]
+            The comparison values for each criterion, keyed by criterion name
+            and in the order of `self.criteria`.
+        """
+        results: dict[str, pd.Series] = {}
+        for _group in self._reference_groups(CompareEngine.PYAM):
+            _ref, _joined = _group[0]._join_reference(
+                iamdf,
+                joint_only=joint_only,
+                filter=filter,
+                join=join,
+            )
+            for _criterion in _group:
+                results[_criterion.criterion_name] = \
+                    _criterion.comparison_function(_ref, _joined)
+        # As for the dense engine, `joint_only` True (the default) gives the
+        # same result as `join="inner"`.
+        shared_join: tp.Literal['inner', 'input'] | None = 'inner' \
+            if joint_only is None or joint_only \
+                else join if join in ('inner', 'input') else None
+        if shared_join is not None:
+            data: pd.Series = pyam_helpers.as_pandas_series(iamdf, copy=False)
+            for _group in self._reference_groups(CompareEngine.DENSE):
+                _first: TimeseriesRefCriterion = _group[0]
+                _dense_ref: dense_comparison.DenseReference = \
+                    _first.reference_index.dense if filter is None \
+                        else dense_comparison.DenseReference(
+                            pyam_helpers.as_pandas_series(
+                                not_none(_first.reference.filter(**filter)),
+                                copy=False,
+                            ),
+                            broadcast_dims=_first.broadcast_dims,
+                            unit_dim=_first.dim_names.UNIT,
+                        )
+                _aligned: dense_comparison.AlignedArrays = \
+                    _dense_ref.align(data, join=shared_join)
+                for _criterion in _group:
+                    results[_criterion.criterion_name] = pd.Series(
+                        not_none(_criterion.comparison_kernel)(
+                            _aligned.reference,
+                            _aligned.data,
+                        ),
+                        index=_aligned.index,
+                        name=data.name,
+                    ).sort_index()
+        for _criterion in self.criteria:
+            if _criterion.criterion_name not in results:
+                results[_criterion.criterion_name] = _criterion.compare(
+                    iamdf,
+                    joint_only=joint_only,
+                    filter=filter,
+                    join=join,
+                )
+        return {
+            _criterion.criterion_name: results[_criterion.criterion_name]
+            for _criterion in self.criteria
+        }
+    ###END def TimeseriesCriterionSet.compare
+
+    def get_values(
+            self,
+            file: pyam.IamDataFrame,
+            agg_dims: tp.Optional[AggDims] = None,
+            filter: tp.Optional[Mapping[str, tp.Any]] = None,
+            joint_only: tp.Optional[bool] = None,
+            join: tp.Literal['inner', 'outer', 'reference', 'input', None] \
+                = 'inner',
+    ) -> dict[str, pd.Series]:
+        """Get comparison values aggregated over region and time.
+
+        Calls `self.compare`, and aggregates the result for each criterion with
+        the aggregation settings of that criterion, in the same way as
+        `TimeseriesRefCriterion.get_values`.
+
+        Parameters
+        ----------
+        file : pyam.IamDataFrame
+            The data to get comparison values for.
+        agg_dims : AggDims, optional
+            Which dimensions to aggregate over. If None, the
+            `default_agg_dims` of each criterion is used. See
+            `TimeseriesRefCriterion.get_values`.
+        filter, joint_only, join
+            See `self.compare`.
+
+        Returns
+        -------
+        dict[str, pandas.Series]
+            The values for each criterion, keyed by criterion name.
+        """
+        compared: dict[str, pd.Series] = self.compare(
+            file,
+            joint_only=joint_only,
+            filter=filter,
+            join=join,
+        )
+        results: dict[str, pd.Series] = {}
+        for _criterion in self.criteria:
+            _compared: pd.Series = compared[_criterion.criterion_name]
+            match AggDims(agg_dims if agg_dims is not None
+                          else _criterion.default_agg_dims):
+                case AggDims.TIME_AND_REGION:
+                    _values = _criterion.aggregate_time_and_region(_compared)
+                case AggDims.TIME:
+                    _values = _criterion._aggregate_time(_compared)
+                case AggDims.REGION:
+                    _values = _criterion._aggregate_region(_compared)
+                case AggDims.NO_AGGREGATION:
+                    _values = _compared
+            results[_criterion.criterion_name] = _values
+        return results
+    ###END def TimeseriesCriterionSet.get_values
+
+###END class TimeseriesCriterionSet
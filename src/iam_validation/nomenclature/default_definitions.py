@@ -1,10 +1,25 @@
-"""Defaults for definitions to use."""
+"""Defaults for definitions to use.
+
+The definitions and region mappings are parsed on the first call to `get_dsd`
+and `get_region_processor` in each process. If the environment variable named
+by `definitions_cache.CACHE_DIR_ENV_VAR` is set, the parsed objects are also
+stored in that directory, and loaded from there in later processes as long as
+none of the definition or mapping files have changed (see the
+`definitions_cache` module).
+
+The definition directories are loaded sequentially by default. Set the
+environment variable named by `N_JOBS_ENV_VAR` to a number of processes (or
+-1 for one per directory) to load them in parallel (see
+`multi_load.read_multi_definitions`).
+"""
 from collections.abc import Sequence
+import os
 from pathlib import Path
 from typing import Final, Optional
 
 import nomenclature
 
+from . import definitions_cache
 from .multi_load import (
     MergedDataStructureDefinition,
     read_multi_definitions,
@@ -36,11 +51,30 @@ code, and may be useful for internal use again in the future.
 """
 
 
+N_JOBS_ENV_VAR: Final[str] = 'IAM_VALIDATION_DEFINITIONS_N_JOBS'
+"""Name of the environment variable that sets the number of processes to load
+the definitions with."""
+
+
 _dsd: MergedDataStructureDefinition | None = None
 _individual_dsds: list[nomenclature.DataStructureDefinition] | None = None
 _region_processor: nomenclature.RegionProcessor | None = None
 
 
+def _get_n_jobs() -> int | None:
+    """Get the number of processes set by `N_JOBS_ENV_VAR`, if any."""
+    value: str | None = os.environ.get(N_JOBS_ENV_VAR)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(
+            f'The environment variable {N_JOBS_ENV_VAR} must be an integer, '
+            f'not {value!r}.'
+        ) from None
+###END def _get_n_jobs
+
 def _load_definitions(
         dimensions: Optional[Sequence[str]] = None,
 ) -> tuple[MergedDataStructureDefinition,
@@ -50,14 +84,30 @@ def _load_definitions(
         definitions_paths,
         dimensions=dimensions,
         return_individual_dsds=True,
+        cache_dir=definitions_cache.default_cache_dir(),
+        n_jobs=_get_n_jobs(),
     )
 ###END def _load_definitions
 
 def _load_region_processor() -> nomenclature.RegionProcessor:
     """Load and return RegionProcessor from mappings_path."""
-    return nomenclature.RegionProcessor.from_directory(
-        path=mappings_path,
-        dsd=get_dsd()
+    dsd: MergedDataStructureDefinition = get_dsd()
+    cache_dir: Path | None = definitions_cache.default_cache_dir()
+    if cache_dir is None:
+        return nomenclature.RegionProcessor.from_directory(
+            path=mappings_path,
+            dsd=dsd,
+        )
+    return definitions_cache.get_or_build(
+        cache_dir,
+        definitions_cache.directory_fingerprint(
+            [mappings_path, *definitions_paths],
+            extra=('region_processor', sorted(dsd.dimensions)),
+        ),
+        lambda: nomenclature.RegionProcessor.from_directory(
+            path=mappings_path,
+            dsd=dsd,
+        ),
     )
 
 
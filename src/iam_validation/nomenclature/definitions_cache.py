@@ -0,0 +1,194 @@
+"""On-disk cache of parsed definitions and region mappings.
+
+Parsing the YAML codelist files of large definition repositories through
+`nomenclature` takes many seconds, and is repeated in every new process. The
+functions in this module store the parsed objects (such as the
+`MergedDataStructureDefinition` returned by
+`multi_load.read_multi_definitions`, and `nomenclature.RegionProcessor`
+objects) in a cache directory as pickle files, keyed by a fingerprint of the
+content of all the files they were parsed from, the `nomenclature` version
+and the Python version. A cached object is therefore only used if none of its
+source files have changed, and changed files give a new key rather than
+overwriting old entries.
+
+The cache is used by `read_multi_definitions` when it is passed a
+`cache_dir`, and by `default_definitions.get_dsd` and
+`default_definitions.get_region_processor` if the environment variable named
+by `CACHE_DIR_ENV_VAR` is set. Since unpickling can execute arbitrary code,
+only use cache directories that are not writable by untrusted users.
+
+Functions
+---------
+default_cache_dir() -> Path | None
+    Get the cache directory set by the environment, if any.
+directory_fingerprint(paths, extra=()) -> str
+    Get a fingerprint of the content of definition or mapping directories.
+load_cached(cache_dir, key) -> object | None
+    Load an object from the cache.
+store_cached(cache_dir, key, value) -> None
+    Store an object in the cache.
+get_or_build(cache_dir, key, build) -> object
+    Load an object from the cache, or build and store it.
+"""
+from collections.abc import Callable, Iterable, Sequence
+import hashlib
+import logging
+import os
+from pathlib import Path
+import pickle
+import sys
+import typing as tp
+
+import nomenclature
+
+from .. import caching
+
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR: tp.Final[str] = 'IAM_VALIDATION_DEFINITIONS_CACHE_DIR'
+"""Name of the environment variable that sets the default cache directory."""
+
+CACHE_FORMAT_VERSION: tp.Final[int] = 3
+"""Version of the format of cached objects. Included in all fingerprints, and
+should be increased when changes to the cached classes make old cache entries
+unusable."""
+
+_T = tp.TypeVar('_T')
+
+
+def default_cache_dir() -> Path | None:
+    """Get the cache directory set by the environment, if any.
+
+    Returns the value of the environment variable named by
+    `CACHE_DIR_ENV_VAR` as a Path, or None if it is not set or empty.
+    """
+    value: str | None = os.environ.get(CACHE_DIR_ENV_VAR)
+    return Path(value) if value else None
+###END def default_cache_dir
+
+
+def directory_fingerprint(
+        paths: Sequence[Path],
+        extra: Iterable[tp.Any] = (),
+) -> str:
+    """Get a fingerprint of the content of definition or mapping directories.
+
+    The fingerprint is computed from the resolved path and the content of
+    every file in each directory in `paths` (recursively, in sorted order),
+    and of the `nomenclature.yaml` config file in the parent directory of
+    each path, if present. It also includes `CACHE_FORMAT_VERSION`, the
+    version of `nomenclature` and the Python version, so that objects pickled
+    by other versions are not used.
+
+    Parameters
+    ----------
+    paths : sequence of Path
+        The directories, in the order they are loaded.
+    extra : iterable, optional
+        Other values that the cached object depends on, such as the
+        dimensions that are loaded. Included through their `repr`.
+
+    Returns
+    -------
+    str
+        Hex digest of the content of the directories and `extra`.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        caching.fingerprint(
+            (
+                CACHE_FORMAT_VERSION,
+                nomenclature.__version__,
+                sys.version_info[:2],
+                tuple(extra),
+            )
+        ).encode()
+    )
+    for _path in paths:
+        _path = Path(_path).resolve()
+        digest.update(str(_path).encode() + b'\0')
+        _files: list[Path] = sorted(
+            _file for _file in _path.rglob('*') if _file.is_file()
+        )
+        _config_file: Path = _path.parent / 'nomenclature.yaml'
+        if _config_file.is_file():
+            _files.append(_config_file)
+        for _file in _files:
+            digest.update(_file.relative_to(_path.parent).as_posix().encode())
+            digest.update(b'\0')
+            digest.update(hashlib.blake2b(_file.read_bytes()).digest())
+    return digest.hexdigest()
+###END def directory_fingerprint
+
+
+def _cache_file(cache_dir: Path, key: str) -> Path:
+    return Path(cache_dir) / f'{key}.pkl'
+###END def _cache_file
+
+
+def load_cached(cache_dir: Path, key: str) -> tp.Any | None:
+    """Load an object from the cache.
+
+    Returns None if there is no object for `key`, or if it could not be
+    loaded (e.g., because the cache file is corrupt or was written by an
+    incompatible version of a package). In the latter case, a warning is
+    logged, and the object should be rebuilt and stored again.
+    """
+    path: Path = _cache_file(cache_dir, key)
+    if not path.is_file():
+        return None
+    try:
+        with path.open('rb') as _file:
+            return pickle.load(_file)
+    except Exception as _err:
+        logger.warning(
+            f'Could not load cached definitions from {path}, they will be '
+            f'reloaded from the source files: {_err!r}'
+        )
+        return None
+###END def load_cached
+
+
+def store_cached(cache_dir: Path, key: str, value: tp.Any) -> None:
+    """Store an object in the cache.
+
+    The cache directory is created if it does not exist. The file is written
+    atomically (see `caching.write_atomic`), so that processes that load
+    definitions concurrently never see a partially written file.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    def _write(_path: str) -> None:
+        with open(_path, 'wb') as _file:
+            pickle.dump(value, _file, protocol=pickle.HIGHEST_PROTOCOL)
+    caching.write_atomic(_cache_file(cache_dir, key), _write)
+###END def store_cached
+
+
+def get_or_build(
+        cache_dir: Path | None,
+        key: str,
+        build: Callable[[], _T],
+) -> _T:
+    """Load an object from the cache, or build and store it.
+
+    Parameters
+    ----------
+    cache_dir : Path or None
+        The cache directory. If None, `build` is called without caching.
+    key : str
+        The cache key, usually from `directory_fingerprint`.
+    build : callable
+        Function without arguments that builds the object if it is not in
+        the cache.
+    """
+    if cache_dir is None:
+        return build()
+    cached: tp.Any | None = load_cached(cache_dir, key)
+    if cached is not None:
+        return tp.cast(_T, cached)
+    value: _T = build()
+    store_cached(cache_dir, key, value)
+    return value
+###END def get_or_build
@@ -18,8 +18,10 @@ from ..dims import (
     DsdDim,
 )
 
+from . import definitions_cache
 from . import multi_load
 from . import validation
+from .repo_cache import RepoMirrorCache
 
 
 
@@ -105,9 +107,20 @@ class NomenclatureDefs:
             region_mappings: bool = True,
             git_revision: tp.Optional[str] = None,
             git_hash: tp.Optional[str] = None,
+            cache_dir: tp.Optional[Path] = None,
+            offline: bool = False,
     ) -> tp.Self:
         """Create an instance by loading from an external repository URL.
 
+        If a cache directory is given (through `cache_dir` or the environment
+        variable named by `definitions_cache.CACHE_DIR_ENV_VAR`), the
+        repository is kept as a bare mirror in the cache directory (see
+        `repo_cache.RepoMirrorCache`), so it is not cloned again on later
+        calls, and the parsed definitions are cached by the resolved commit
+        hash, so they are only parsed again when the commit changes. Without a
+        cache directory, the repository is cloned into a temporary directory
+        that is deleted after loading.
+
         Parameters
         ----------
         url : str
@@ -131,12 +144,94 @@ class NomenclatureDefs:
             no `/mappings` directory in the repository. If the repository does
             not have one, you *must* set this parameter to False, or an error
             will be raised.
+        cache_dir : pathlib.Path, optional
+            Directory to keep repository mirrors and parsed definitions in.
+            Optional, by default the directory given by the environment
+            variable named by `definitions_cache.CACHE_DIR_ENV_VAR`, or no
+            caching if it is not set.
+        offline : bool, optional
+            Whether to only use the repository mirror in the cache directory,
+            without accessing `url`. Requires a cache directory, and that the
+            repository (and the commit given by `git_hash` or the revision
+            given by `git_revision`) has been cached by an earlier call.
+            Note that a pinned `git_hash` that is already in the mirror is
+            always loaded without accessing `url`, also if `offline` is False.
+            Optional, by default False.
 
         Returns
         -------
         NomenclatureDefs
             The loaded instance. If `load_mappings` is True, it will have a
             `region_processor` attribute, but not if `load_mappings` is False.
+
+        Raises
+        ------
+        repo_cache.RepositoryNotCachedError
+            If `offline` is True and the repository or revision has not been
+            cached.
+        """
+        if cache_dir is None:
+            cache_dir = definitions_cache.default_cache_dir()
+        if cache_dir is None:
+            if offline:
+                raise ValueError(
+                    '`offline=True` requires a cache directory, through '
+                    '`cache_dir` or the environment variable '
+                    f'{definitions_cache.CACHE_DIR_ENV_VAR}.'
+                )
+            dsd, region_processor = cls._load_from_url(
+                url,
+                dimensions=dimensions,
+                region_mappings=region_mappings,
+                git_revision=git_revision,
+                git_hash=git_hash,
+            )
+            return cls(dsd=dsd, region_processor=region_processor)
+        mirror_cache = RepoMirrorCache(cache_dir)
+        commit: str = mirror_cache.resolve_commit(
+            url,
+            git_revision=git_revision,
+            git_hash=git_hash,
+            offline=offline,
+        )
+        dsd, region_processor = definitions_cache.get_or_build(
+            cache_dir,
+            definitions_cache.directory_fingerprint(
+                [],
+                extra=(
+                    'from_url',
+                    url,
+                    commit,
+                    [str(_dim) for _dim in dimensions],
+                    region_mappings,
+                ),
+            ),
+            lambda: cls._load_from_url(
+                str(mirror_cache.mirror_path(url)),
+                dimensions=dimensions,
+                region_mappings=region_mappings,
+                git_hash=commit,
+            ),
+        )
+        # The objects are freshly unpickled or loaded, no need to copy them.
+        return cls(dsd=dsd, region_processor=region_processor, deep_copy=False)
+    ###END NomnomenclatureDefs.from_url
+
+    @classmethod
+    def _load_from_url(
+            cls,
+            url: str,
+            *,
+            dimensions: Sequence[DsdDim|str],
+            region_mappings: bool = True,
+            git_revision: tp.Optional[str] = None,
+            git_hash: tp.Optional[str] = None,
+    ) -> tuple[DataStructureDefinition, RegionProcessor | None]:
+        """Load definitions and region mappings through nomenclature.
+
+        See `from_url` for the parameters. Returns the
+        `DataStructureDefinition`, and the `RegionProcessor` or None if
+        `region_mappings` is False.
         """
         # Create config data that can be dumped to a temporary nomenclature.yaml
         # file, which `nomenclature.DataStructureDefinition` can then use to
@@ -163,10 +258,10 @@ class NomenclatureDefs:
                     path=local_path / _MAPPINGS_SUBDIR_NAME,
                     dsd=dsd
                 )
-                return cls(dsd=dsd, region_processor=region_processor)
+                return dsd, region_processor
             else:
-                return cls(dsd=dsd)
-    ###END NomnomenclatureDefs.from_url
+                return dsd, None
+    ###END NomnomenclatureDefs._load_from_url
 
 
     @staticmethod
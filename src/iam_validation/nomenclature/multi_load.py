@@ -5,12 +5,15 @@ Functions
 read_multi_definitions(
         paths: Sequence[Path],
         dimensions: Sequence[str] | Sequence[Sequence[str]],
+        cache_dir: Path | None = None,
+        n_jobs: int | None = None,
 ) -> DataStructureDefinition
     Read datstructure definitions from multiple directories, and merge them in
-    prioritized order
+    prioritized order, optionally through an on-disk cache
 read_multi_region_processors(
         paths: Sequence[Path],
         dsds: DataStructureDefinition | Sequence[DataStructureDefinition],
+        n_jobs: int | None = None,
 ) -> RegionProcessor
     Read region mappings from multiple directories, and merge them in
     prioritized order into a joint RegionProcessor
@@ -20,11 +23,22 @@ merge_dsds(dsds: Sequence[DataStructureDefinition]) \
 merge_region_processors(regionmaps: Sequence[RegionProcessor]) \
         -> RegionProcessor
     Merge multiple RegionProcessors, in prioritized order
+
+The directories passed to `read_multi_definitions` and
+`read_multi_region_processors` can be parsed concurrently in separate
+processes by passing `n_jobs`. The time taken to load each directory is
+logged at the INFO level through `logger`.
 """
-from collections.abc import Sequence
+from collections.abc import Callable, Mapping, Sequence
+import concurrent.futures
 import git
 import itertools
+import logging
+import multiprocessing
+import os
 from pathlib import Path
+import threading
+import time
 import typing as tp
 
 from nomenclature import (
@@ -40,9 +54,14 @@ from nomenclature.codelist import (
 )
 from nomenclature.config import NomenclatureConfig
 
+from . import definitions_cache
+
+
 
+logger: logging.Logger = logging.getLogger(__name__)
 
 CodeListTypeVar = tp.TypeVar('CodeListTypeVar', bound=CodeList)
+_T = tp.TypeVar('_T')
 
 class MergedDataStructureDefinition(DataStructureDefinition):
     """Merged data structure definition from multiple definitions.
@@ -56,11 +75,28 @@ class MergedDataStructureDefinition(DataStructureDefinition):
     attributes from the source `DataStructureDefinition` objects, in the order
     of priority in which they were merged (i.e., earlier ones take precedence
     over definitions made in later ones).
+
+    The codelist for each dimension is merged lazily, on the first access to
+    the corresponding attribute (e.g., `region` or `variable`), and the merged
+    codelist is then stored on the instance and reused. Code that only uses
+    some dimensions (e.g., only `model` and `scenario`) therefore does not pay
+    for merging the codelists of the others. Assigning to a dimension
+    attribute replaces the merged codelist as for an ordinary attribute. Use
+    `merge_pending_codelists` to merge all codelists up front, e.g., before
+    storing the object in a cache.
     """
 
     region: RegionCodeList
     variable: VariableCodeList
 
+    _source_codelists: dict[str, list[CodeList]]
+    """Codelists of the source definitions for each dimension that has not
+    been merged yet, in order of priority."""
+
+    _merge_lock: tp.ClassVar[threading.Lock] = threading.Lock()
+    """Lock that serializes lazy merges, so that concurrent first accesses to
+    a dimension merge its codelist only once."""
+
     def __init__(
             self,
             definitions: Sequence[DataStructureDefinition],
@@ -81,18 +117,14 @@ class MergedDataStructureDefinition(DataStructureDefinition):
         all_dimensions: list[str] = \
             list(set(itertools.chain.from_iterable(dimensions)))
         self.dimensions: list[str] = all_dimensions
-        dim_codelists_mapping: dict[str, list[CodeList]] = {
+        # Only collect the source codelists here. They are merged by
+        # `__getattr__` on first access.
+        self._source_codelists = {
             _dim: [
                 getattr(_dsd, _dim) for _dsd, _dsd_dims in zip(definitions, dimensions)
                 if _dim in _dsd_dims
             ] for _dim in all_dimensions
         }
-        codelists: dict[str, CodeList] = {
-            _dim: self.merge_codelists(_codelists)
-            for _dim, _codelists in dim_codelists_mapping.items()
-        }
-        for _dim, _codelist in codelists.items():
-            setattr(self, _dim, _codelist)
         self.configs: list[NomenclatureConfig|None] \
             = [dsd.config for dsd in definitions]
         self.projects: list[str] = [dsd.project for dsd in definitions]
@@ -102,6 +134,37 @@ class MergedDataStructureDefinition(DataStructureDefinition):
         self.config = self.merge_configs([_dsd.config for _dsd in definitions])
     ###END def MergedDataStructureDefinition.__init__
 
+    def __getattr__(self, name: str) -> tp.Any:
+        """Merge the codelist for dimension `name` on first access."""
+        # Only called if normal attribute lookup fails. Private and special
+        # names are excluded, so that copying and unpickling (which look up
+        # e.g. `__setstate__` before the instance dict is restored) do not
+        # recurse into `_source_codelists`.
+        if not name.startswith('_'):
+            pending: dict[str, list[CodeList]] = \
+                self.__dict__.get('_source_codelists', {})
+            if name in pending:
+                with self._merge_lock:
+                    # Another thread may have merged the codelist while this
+                    # one was waiting for the lock.
+                    if name in self.__dict__:
+                        return self.__dict__[name]
+                    merged_codelist: CodeList = \
+                        self.merge_codelists(pending[name])
+                    setattr(self, name, merged_codelist)
+                    pending.pop(name, None)
+                    return merged_codelist
+        raise AttributeError(
+            f'{type(self).__name__!r} object has no attribute {name!r}'
+        )
+    ###END def MergedDataStructureDefinition.__getattr__
+
+    def merge_pending_codelists(self) -> None:
+        """Merge the codelists of all dimensions that have not been merged."""
+        for _dim in list(self._source_codelists):
+            getattr(self, _dim)
+    ###END def MergedDataStructureDefinition.merge_pending_codelists
+
     def to_excel(self, *args, **kwargs):
         raise NotImplementedError(
             'MergedDataStructureDefinition has not added support for '
@@ -194,6 +257,8 @@ def read_multi_definitions(
         dimensions: tp.Optional[Sequence[str] | Sequence[Sequence[str]]] = None,
         *,
         return_individual_dsds: tp.Literal[True],
+        cache_dir: tp.Optional[Path] = None,
+        n_jobs: tp.Optional[int] = None,
 ) -> tuple[MergedDataStructureDefinition, list[DataStructureDefinition]]:
     ...
 @tp.overload
@@ -202,6 +267,8 @@ def read_multi_definitions(
         dimensions: tp.Optional[Sequence[str] | Sequence[Sequence[str]]] = None,
         *,
         return_individual_dsds: bool = False,
+        cache_dir: tp.Optional[Path] = None,
+        n_jobs: tp.Optional[int] = None,
 ) -> MergedDataStructureDefinition:
     ...
 def read_multi_definitions(
@@ -209,6 +276,8 @@ def read_multi_definitions(
         dimensions: tp.Optional[Sequence[str] | Sequence[Sequence[str]]] = None,
         *,
         return_individual_dsds: bool = False,
+        cache_dir: tp.Optional[Path] = None,
+        n_jobs: tp.Optional[int] = None,
 ) -> MergedDataStructureDefinition \
         | tuple[MergedDataStructureDefinition, list[DataStructureDefinition]]:
     """Read and merge DataStructureDefinitions from multiple directories.
@@ -248,6 +317,25 @@ def read_multi_definitions(
     return_individual_dsds : bool, optional
         Whether to return the individual definitions as well as the merged
         definition. Defaults to `False`.
+    cache_dir : pathlib.Path, optional
+        Directory of an on-disk cache of parsed definitions (see the
+        `definitions_cache` module). If given, the merged and individual
+        definitions are loaded from the cache if none of the files in `paths`
+        (or the `nomenclature.yaml` files in their parent directories) have
+        changed since they were stored, and are parsed and stored in the cache
+        otherwise. Note that the objects returned from the cache are new
+        objects, not shared with earlier calls. Optional, by default no
+        caching.
+    n_jobs : int, optional
+        Number of processes to load the definitions from `paths` in
+        concurrently, or -1 to use one process per path (up to the number of
+        CPUs). The definitions are merged only once, in the calling process,
+        after all paths have been loaded. Note that each loaded definition is
+        pickled to send it back to the calling process, which takes part of
+        the time saved, so this is mainly useful for several large
+        directories. Optional, by default all paths are loaded sequentially
+        in the calling process. Has no effect if the definitions are loaded
+        from the cache.
 
     Returns
     -------
@@ -282,13 +370,28 @@ def read_multi_definitions(
             '`dimensions` must have the same length as `paths` '
             f'({len(paths)}), not {len(use_dimensions)}.'
         )
-    # Traverse the paths and load each `DataStructureDefinition`.
-    definitions: list[DataStructureDefinition] = [
-        _load_single_path_definitions(path=_path, dimensions=_dims)
-        for _path, _dims in zip(paths, use_dimensions)
-    ]
-    # Merge the definitions
-    dsd: MergedDataStructureDefinition = MergedDataStructureDefinition(definitions)
+    dsd: MergedDataStructureDefinition
+    definitions: list[DataStructureDefinition]
+    if cache_dir is None:
+        dsd, definitions = _load_and_merge_definitions(
+            paths,
+            use_dimensions,
+            n_jobs=n_jobs,
+        )
+    else:
+        dsd, definitions = definitions_cache.get_or_build(
+            cache_dir,
+            definitions_cache.directory_fingerprint(
+                paths,
+                extra=('definitions', use_dimensions),
+            ),
+            lambda: _load_and_merge_definitions(
+                paths,
+                use_dimensions,
+                n_jobs=n_jobs,
+                merge_all=True,
+            ),
+        )
     if return_individual_dsds:
         return dsd, definitions
     return dsd
@@ -299,6 +402,7 @@ def read_multi_region_processors(
         paths: Sequence[Path],
         dsds: DataStructureDefinition | Sequence[DataStructureDefinition],
         merged_dsd: MergedDataStructureDefinition | None = None,
+        n_jobs: int | None = None,
 ) -> RegionProcessor:
     """Read and merge RegionProcessors from multiple directories.
 
@@ -338,6 +442,12 @@ def read_multi_region_processors(
         This must be equal to the result of merging dsds. It is provided only
         for increaased performance. If not provided, dsds will be merged using
         the `MergedDataStructureDefinition` constructor, and the result is used.
+    n_jobs : int, optional
+        Number of processes to load the region maps from `paths` in
+        concurrently, or -1 to use one process per path (up to the number of
+        CPUs). See `read_multi_definitions`. If `dsds` is a single object, it
+        is sent to each worker process only once. Optional, by default all
+        paths are loaded sequentially in the calling process.
 
     Returns
     -------
@@ -357,11 +467,24 @@ def read_multi_region_processors(
             f'`dsds` and `paths` must have the same length, not {len(dsds)} and '
             f'{len(paths)}'
         )
-    # Load the region maps
-    region_processors: list[RegionProcessor] = [
-        _load_single_path_regionmaps(path=_path, dsd=_dsd)
-        for _path, _dsd in zip(paths, dsds)
-    ]
+    # Load the region maps. If all paths use the same definitions, pass them
+    # to worker processes once rather than with each path.
+    region_processors: list[RegionProcessor]
+    if all(_dsd is dsds[0] for _dsd in dsds):
+        region_processors = _load_paths(
+            _load_single_path_regionmaps,
+            [{'path': _path} for _path in paths],
+            n_jobs=n_jobs,
+            description='region mappings',
+            shared_kwargs={'dsd': dsds[0]},
+        )
+    else:
+        region_processors = _load_paths(
+            _load_single_path_regionmaps,
+            [{'path': _path, 'dsd': _dsd} for _path, _dsd in zip(paths, dsds)],
+            n_jobs=n_jobs,
+            description='region mappings',
+        )
     # Merge the region maps
     joined_region_processor: RegionProcessor
     if merged_dsd is not None:
@@ -374,12 +497,149 @@ def read_multi_region_processors(
             region_processors=region_processors,
             dsds=dsds
         )
-    # Return the merged region map
-    merge_region_processors(region_processors, dsds=dsds)
     return joined_region_processor
 ###END def read_multi_regionmaps
 
 
+def _load_and_merge_definitions(
+        paths: Sequence[Path],
+        dimensions: Sequence[Sequence[str] | None],
+        n_jobs: tp.Optional[int] = None,
+        merge_all: bool = False,
+) -> tuple[MergedDataStructureDefinition, list[DataStructureDefinition]]:
+    """Load the definitions from each path, and merge them.
+
+    If `merge_all` is True, the codelists of all dimensions are merged right
+    away rather than on first access. This is used when the result is stored
+    in the definitions cache, so that the merged codelists are stored as
+    well.
+    """
+    # Load each `DataStructureDefinition`, possibly in parallel.
+    definitions: list[DataStructureDefinition] = _load_paths(
+        _load_single_path_definitions,
+        [
+            {'path': _path, 'dimensions': _dims}
+            for _path, _dims in zip(paths, dimensions)
+        ],
+        n_jobs=n_jobs,
+        description='definitions',
+    )
+    # Merge the definitions
+    start_time: float = time.perf_counter()
+    merged_dsd = MergedDataStructureDefinition(definitions)
+    if merge_all:
+        merged_dsd.merge_pending_codelists()
+    logger.info(
+        f'Merged definitions from {len(definitions)} paths in '
+        f'{time.perf_counter() - start_time:.2f} s.'
+    )
+    return merged_dsd, definitions
+###END def _load_and_merge_definitions
+
+
+def _timed_call(
+        func: Callable[..., _T],
+        kwargs: Mapping[str, tp.Any],
+) -> tuple[_T, float]:
+    """Call `func(**kwargs)`, and return the result and the time taken."""
+    start_time: float = time.perf_counter()
+    result: _T = func(**kwargs)
+    return result, time.perf_counter() - start_time
+###END def _timed_call
+
+
+# Keyword arguments shared by all calls in worker processes of `_load_paths`.
+# Set once per worker by `_init_load_worker`, so that large shared objects
+# (such as a DataStructureDefinition) are not sent along with each task.
+_WORKER_SHARED_KWARGS: Mapping[str, tp.Any] = {}
+
+
+def _init_load_worker(shared_kwargs: Mapping[str, tp.Any]) -> None:
+    """Initializer for worker processes of `_load_paths`."""
+    global _WORKER_SHARED_KWARGS
+    _WORKER_SHARED_KWARGS = shared_kwargs
+###END def _init_load_worker
+
+
+def _timed_call_in_worker(
+        func: Callable[..., _T],
+        kwargs: Mapping[str, tp.Any],
+) -> tuple[_T, float]:
+    """Call `_timed_call` with the worker's shared keyword arguments."""
+    return _timed_call(func, {**_WORKER_SHARED_KWARGS, **kwargs})
+###END def _timed_call_in_worker
+
+
+def _load_paths(
+        load_func: Callable[..., _T],
+        kwargs_list: Sequence[Mapping[str, tp.Any]],
+        n_jobs: tp.Optional[int],
+        description: str,
+        shared_kwargs: Mapping[str, tp.Any] | None = None,
+) -> list[_T]:
+    """Call a loading function for each path, possibly in separate processes.
+
+    Parameters
+    ----------
+    load_func : callable
+        Module-level function that loads from a single path.
+    kwargs_list : sequence of mappings
+        Keyword arguments for each call to `load_func`. Each must have a
+        `path` item, which is used in the logged timings.
+    n_jobs : int or None
+        Number of processes, or -1 for one per path (up to the number of
+        CPUs). If None or 1, or if there is only one path, `load_func` is
+        called sequentially in the calling process.
+    description : str
+        What is loaded, for the logged timings.
+    shared_kwargs : mapping, optional
+        Keyword arguments that are the same for all calls. They are sent to
+        each worker process once, when it starts. Optional, by default none.
+
+    Returns
+    -------
+    list
+        The return values of `load_func`, in the same order as `kwargs_list`.
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    elif n_jobs is not None and n_jobs < 1:
+        raise ValueError('`n_jobs` must be a positive integer or -1.')
+    num_workers: int = min(n_jobs or 1, len(kwargs_list))
+    if shared_kwargs is None:
+        shared_kwargs = {}
+    results: list[tuple[_T, float]]
+    if num_workers <= 1:
+        results = [
+            _timed_call(load_func, {**shared_kwargs, **_kwargs})
+            for _kwargs in kwargs_list
+        ]
+    else:
+        # Never fork, since forking a process that runs other threads can
+        # deadlock the workers (as in `TimeseriesRefCriterion.get_values`).
+        mp_context: multiprocessing.context.BaseContext | None = \
+            multiprocessing.get_context('forkserver') \
+                if 'forkserver' in multiprocessing.get_all_start_methods() \
+                else None
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=mp_context,
+                initializer=_init_load_worker,
+                initargs=(shared_kwargs,),
+        ) as _pool:
+            results = list(_pool.map(
+                _timed_call_in_worker,
+                [load_func] * len(kwargs_list),
+                kwargs_list,
+            ))
+    for _kwargs, (_, _seconds) in zip(kwargs_list, results):
+        logger.info(
+            f'Loaded {description} from {_kwargs["path"]} in {_seconds:.2f} s.'
+        )
+    return [_result for _result, _ in results]
+###END def _load_paths
+
+
 def _load_single_path_definitions(
         path: Path,
         dimensions: Sequence[str]|None,
@@ -0,0 +1,209 @@
+"""Local mirrors of external definition repositories.
+
+`NomenclatureDefs.from_url` loads definitions from an external git
+repository (such as `common-definitions`). Without a cache, `nomenclature`
+clones the full repository into a temporary directory on every call. The
+`RepoMirrorCache` class in this module instead keeps a bare mirror of each
+repository in a cache directory, which is reused across calls and processes,
+and only fetched from the remote when needed. Definitions are then loaded
+through the local mirror, and the parsed objects are cached by the resolved
+commit hash (see `definitions_cache`), so they are not parsed again as long
+as the commit is unchanged.
+
+Pinning a commit with `git_hash` makes loading fully offline once the commit
+is in the mirror. A local bare repository can also be used directly as the
+URL, e.g., as a stand-in for a remote repository on machines without network
+access.
+
+Classes
+-------
+RepoMirrorCache
+    Cache directory with bare mirrors of git repositories.
+RepositoryNotCachedError
+    Raised when a repository or revision is needed offline but not cached.
+"""
+import hashlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import typing as tp
+
+import git
+
+
+
+class RepositoryNotCachedError(ValueError):
+    """Raised when a repository or revision is needed offline but not cached."""
+    ...
+###END class RepositoryNotCachedError
+
+
+class RepoMirrorCache:
+    """Cache directory with bare mirrors of git repositories.
+
+    Mirrors are stored in the `mirrors` subdirectory of `directory`, with one
+    bare repository per URL (created with `git clone --mirror`).
+
+    Init parameters
+    ---------------
+    directory : str or Path
+        The cache directory. Created if it does not exist.
+
+    Attributes
+    ----------
+    directory : Path
+        The cache directory.
+    """
+
+    MIRRORS_SUBDIR_NAME: tp.ClassVar[str] = 'mirrors'
+
+    DEFAULT_REVISION: tp.ClassVar[str] = 'main'
+    """Revision used if neither a revision nor a hash is given. The same
+    default as used by `nomenclature` for external repositories."""
+
+    def __init__(self, directory: str | Path):
+        self.directory: Path = Path(directory)
+        (self.directory / self.MIRRORS_SUBDIR_NAME).mkdir(
+            parents=True,
+            exist_ok=True,
+        )
+    ###END def RepoMirrorCache.__init__
+
+    def mirror_path(self, url: str) -> Path:
+        """Get the path of the mirror of the repository at `url`."""
+        url_key: str = hashlib.blake2b(url.encode(), digest_size=10).hexdigest()
+        return self.directory / self.MIRRORS_SUBDIR_NAME / f'{url_key}.git'
+    ###END def RepoMirrorCache.mirror_path
+
+    def get_mirror(
+            self,
+            url: str,
+            *,
+            fetch: bool = True,
+            offline: bool = False,
+    ) -> git.Repo:
+        """Get the mirror of a repository, creating or updating it if needed.
+
+        Parameters
+        ----------
+        url : str
+            The URL (or local path) of the repository.
+        fetch : bool, optional
+            Whether to fetch new commits into an existing mirror. Optional, by
+            default True. Ignored if `offline` is True.
+        offline : bool, optional
+            If True, never access `url`, and raise a
+            `RepositoryNotCachedError` if there is no mirror yet. Optional, by
+            default False.
+
+        Returns
+        -------
+        git.Repo
+            The bare mirror repository.
+        """
+        path: Path = self.mirror_path(url)
+        if path.is_dir():
+            repo = git.Repo(path)
+            if fetch and not offline:
+                repo.git.remote('update', '--prune')
+            return repo
+        if offline:
+            raise RepositoryNotCachedError(
+                f'The repository {url} has not been cached in '
+                f'{self.directory}, and can not be cloned offline.'
+            )
+        # Clone into a temporary directory and move it into place, so that
+        # concurrent processes never see a partial mirror.
+        tmp_path: Path = Path(tempfile.mkdtemp(dir=path.parent, suffix='.tmp'))
+        try:
+            git.Repo.clone_from(url, tmp_path, mirror=True)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another process created the mirror first.
+            if not path.is_dir():
+                raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        return git.Repo(path)
+    ###END def RepoMirrorCache.get_mirror
+
+    def resolve_commit(
+            self,
+            url: str,
+            *,
+            git_revision: tp.Optional[str] = None,
+            git_hash: tp.Optional[str] = None,
+            offline: bool = False,
+    ) -> str:
+        """Resolve a revision of a repository to a full commit hash.
+
+        If `git_hash` is given and the commit is already in the mirror, the
+        remote is not accessed. Otherwise the mirror is created or fetched
+        first, unless `offline` is True.
+
+        Parameters
+        ----------
+        url : str
+            The URL (or local path) of the repository.
+        git_revision : str, optional
+            A branch or tag name. Ignored if `git_hash` is given. Optional, by
+            default `DEFAULT_REVISION`.
+        git_hash : str, optional
+            A (possibly abbreviated) commit hash.
+        offline : bool, optional
+            If True, only use the existing mirror. Optional, by default False.
+
+        Returns
+        -------
+        str
+            The full hash of the commit.
+
+        Raises
+        ------
+        RepositoryNotCachedError
+            If `offline` is True and the repository or revision is not in the
+            mirror.
+        ValueError
+            If the revision does not exist in the repository.
+        """
+        revision: str = git_hash if git_hash is not None \
+            else git_revision if git_revision is not None \
+                else self.DEFAULT_REVISION
+        if git_hash is not None and self.mirror_path(url).is_dir():
+            commit: str | None = self._rev_parse(
+                self.get_mirror(url, fetch=False),
+                revision,
+            )
+            if commit is not None:
+                return commit
+        repo: git.Repo = self.get_mirror(url, offline=offline)
+        commit = self._rev_parse(repo, revision)
+        if commit is None:
+            if offline:
+                raise RepositoryNotCachedError(
+                    f'The revision {revision!r} of {url} is not in the cached '
+                    'mirror, and can not be fetched offline.'
+                )
+            raise ValueError(
+                f'The revision {revision!r} does not exist in {url}.'
+            )
+        return commit
+    ###END def RepoMirrorCache.resolve_commit
+
+    @staticmethod
+    def _rev_parse(repo: git.Repo, revision: str) -> str | None:
+        """Get the full commit hash of a revision, or None if not found."""
+        # `repo.commit` accepts any full-length hex string without checking
+        # that the object exists, so ask git to verify it.
+        try:
+            return repo.git.rev_parse(
+                '--verify',
+                '--quiet',
+                f'{revision}^{{commit}}',
+            )
+        except git.GitCommandError:
+            return None
+    ###END def RepoMirrorCache._rev_parse
+
+###END class RepoMirrorCache
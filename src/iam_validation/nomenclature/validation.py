@@ -1,12 +1,15 @@
 """Functions for validating names and variable/unit combinations."""
-from collections.abc import Sequence
+from collections.abc import Iterable, Mapping, Sequence
+import re
 from typing import (
     Literal,
     Optional,
     TypeVar,
     overload,
 )
+import weakref
 
+import numpy as np
 import pyam
 from nomenclature import (
     CodeList,
@@ -22,6 +25,130 @@ not_none = type_helpers.not_none
 
 
 
+class CodeListValidator:
+    """Precompiled validator of names against the codes in a codelist.
+
+    `nomenclature.CodeList.validate_items` matches every item against every
+    code through `pyam`'s pattern matching, i.e., one regular expression
+    per code. This class instead stores the names of all codes without
+    wildcards in a frozenset, and combines all codes with wildcards (`*`) into
+    a single compiled regular expression, which is only used for names that
+    are not found in the set. Input values are factorized first, so that
+    each distinct name is only checked once. The results are the same as for
+    `validate_items`.
+
+    Use `get_codelist_validator` to get a validator for a `CodeList` that is
+    reused across calls.
+
+    Init parameters
+    ---------------
+    names : iterable of str
+        The names of the codes, e.g., the keys of `CodeList.mapping`. Names
+        that contain `*` match any sequence of characters in its place.
+
+    Attributes
+    ----------
+    names : frozenset of str
+        The names without wildcards.
+    wildcard_pattern : re.Pattern or None
+        Compiled pattern that matches all names with wildcards, or None if
+        there are none.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        exact_names: list[str] = []
+        wildcard_names: list[str] = []
+        for _name in names:
+            (wildcard_names if '*' in _name else exact_names).append(_name)
+        self.names: frozenset[str] = frozenset(exact_names)
+        self.wildcard_pattern: re.Pattern[str] | None = re.compile(
+            '|'.join(
+                '(?:' + re.escape(_name).replace(r'\*', '.*') + ')'
+                for _name in wildcard_names
+            )
+        ) if wildcard_names else None
+    ###END def CodeListValidator.__init__
+
+    def valid_mask(self, values: Iterable[str]) -> np.ndarray:
+        """Get a boolean array of whether each value is a valid name.
+
+        Parameters
+        ----------
+        values : iterable of str
+            The values to check, e.g., the values of a dimension of a data
+            table with one element per row. Missing values are invalid.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array with the same length as `values`.
+        """
+        codes: np.ndarray
+        uniques: pd.Index
+        codes, uniques = pd.factorize(pd.Index(values))
+        valid_uniques: np.ndarray = uniques.isin(self.names)
+        if self.wildcard_pattern is not None:
+            for _pos in np.flatnonzero(~valid_uniques):
+                _value = uniques[_pos]
+                valid_uniques[_pos] = isinstance(_value, str) and \
+                    self.wildcard_pattern.fullmatch(_value) is not None
+        # Missing values have code -1, which picks the appended False.
+        return np.append(valid_uniques, False)[codes]
+    ###END def CodeListValidator.valid_mask
+
+    def invalid_items(self, items: Iterable[str]) -> list[str]:
+        """Get the invalid names in `items`.
+
+        Returns
+        -------
+        list of str
+            The distinct invalid names, in order of first occurrence in
+            `items`.
+        """
+        values: pd.Index = pd.Index(items)
+        return pd.unique(values[~self.valid_mask(values)]).tolist()
+    ###END def CodeListValidator.invalid_items
+
+###END class CodeListValidator
+
+
+# Validators for codelists, by `id` of the codelist. Each entry holds a weak
+# reference to the codelist, and the `mapping` object and number of codes it
+# was built from, so that it is rebuilt if the codes are replaced or added.
+# Entries are removed when the codelist is garbage collected.
+_codelist_validators: dict[
+    int,
+    tuple[weakref.ref[CodeList], Mapping, int, CodeListValidator]
+] = {}
+
+
+def get_codelist_validator(codelist: CodeList) -> CodeListValidator:
+    """Get a `CodeListValidator` for a codelist.
+
+    The validator is built on the first call for each codelist, and reused in
+    later calls as long as the `mapping` of the codelist has not been
+    replaced and the number of codes has not changed.
+    """
+    key: int = id(codelist)
+    entry = _codelist_validators.get(key)
+    if entry is not None:
+        _ref, _mapping, _num_codes, _validator = entry
+        if _ref() is codelist and _mapping is codelist.mapping \
+                and _num_codes == len(codelist.mapping):
+            return _validator
+    validator = CodeListValidator(codelist.mapping.keys())
+    if entry is None or entry[0]() is not codelist:
+        weakref.finalize(codelist, _codelist_validators.pop, key, None)
+    _codelist_validators[key] = (
+        weakref.ref(codelist),
+        codelist.mapping,
+        len(codelist.mapping),
+        validator,
+    )
+    return validator
+###END def get_codelist_validator
+
+
 def get_invalid_names(
         iamdf: pyam.IamDataFrame,
         dsd: DataStructureDefinition,
@@ -51,7 +178,9 @@ def get_invalid_names(
     # For each dimension, get the corresponding CodeList from `dsd` and validate
     # the names in `iamdf` against it
     invalid_names: dict[str, list[str]] = {
-        _dim: getattr(dsd, _dim).validate_items(getattr(iamdf, _dim))
+        _dim: get_codelist_validator(getattr(dsd, _dim)).invalid_items(
+            getattr(iamdf, _dim)
+        )
         for _dim in dimensions
     }
     return invalid_names
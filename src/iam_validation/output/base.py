@@ -49,7 +49,10 @@ from .styling.base import (
     InRangeStyles,
     PassFailStyles,
 )
-from ..targets.target_classes import CriterionTargetRange
+from ..targets.target_classes import (
+    CriterionTargetRange,
+    CriterionTargetRangeResult,
+)
 
 CritTypeVar = tp.TypeVar('CritTypeVar')
 """TypeVar for the type of `Criterion` or `CriterionTargetRange` expected by a
@@ -644,22 +647,19 @@ class CriterionTargetRangeOutput(
             column_titles = self._default_column_titles
         if criteria is None:
             criteria = self.criteria
+        for _col in columns:
+            if _col not in (CTCol.INRANGE, CTCol.DISTANCE, CTCol.VALUE):
+                raise ValueError(f'Unrecognized column: {_col!r}')
+        # Evaluate the criterion only once, and get all columns from the result
+        result: CriterionTargetRangeResult = criteria.evaluate(data)
         result_columns: list[pd.Series] = []
         for _col in columns:
             if _col == CTCol.INRANGE:
-                result_columns.append(
-                    criteria.get_in_range(data).rename(_col)
-                )
+                result_columns.append(result.in_range.rename(_col))
             elif _col == CTCol.DISTANCE:
-                result_columns.append(
-                    criteria.get_distances(data).rename(_col)
-                )
+                result_columns.append(result.distances.rename(_col))
             elif _col == CTCol.VALUE:
-                result_columns.append(
-                    criteria.get_values(data).rename(_col)
-                )
-            else:
-                raise ValueError(f'Unrecognized column: {_col!r}')
+                result_columns.append(result.values.rename(_col))
         results_df: pd.DataFrame = pd.concat(result_columns, axis=1)
         if column_titles is not None:
             results_df = results_df.rename(columns=column_titles)
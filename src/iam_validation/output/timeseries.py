@@ -16,6 +16,7 @@ from ..targets.target_classes import (
     RelativeRange,
 )
 from ..criteria.timeseries_criteria_core import (
+    AggDims,
     TimeseriesRefCriterion,
 )
 from ..criteria.timeseries_criteria_core import DIM
@@ -36,6 +37,7 @@ from .excel import (
     ExcelWriterBase,
 )
 from ..type_helpers import not_none
+from .. import pdhelpers
 
 
 TimeseriesRefCriterionTypeVar = tp.TypeVar(
@@ -72,11 +74,49 @@ class TimeseriesRefFullComparisonOutput(
     method of the `TimeseriesRefCriterion` instance, or by creating a
     `pyam.IamDataFrame` from that Serie` and calling its `.timeseries()` method.
     Subclasses may implement more case-specific behavior and processing.
+
+    For large datasets, the comparison can be done in the compact form
+    returned by `TimeseriesRefCriterion.compare` with `compact=True` (see the
+    `compact` and `float32` init parameters). The years are unstacked
+    directly from the level codes of the index (see
+    `pdhelpers.unstack_level`), without expanding the index to object arrays,
+    and float32 values are kept as float32. A comparison result that has already been computed
+    (compact or not) can also be passed to `prepare_output` instead of the
+    data, to avoid computing it again.
     """
 
+    def __init__(
+            self,
+            *,
+            criteria: TimeseriesRefCriterionTypeVar,
+            writer: WriterTypeVar,
+            compact: bool = False,
+            float32: bool = False,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        criteria : TimeseriesRefCriterion
+            The criterion to use to compare the data.
+        writer : ResultsWriter
+            The writer to be used to write the output.
+        compact : bool, optional
+            Whether to get the comparison result from the criterion in compact
+            form. See `TimeseriesRefCriterion.compare`. Optional, by default
+            False.
+        float32 : bool, optional
+            Whether to get the comparison values as float32, which halves the
+            memory used by the values in the output DataFrame. Implies
+            `compact=True`. Optional, by default False.
+        """
+        super().__init__(criteria=criteria, writer=writer)
+        self.compact: bool = compact
+        self.float32: bool = float32
+    ###END def TimeseriesRefFullComparisonOutput.__init__
+
     def prepare_output(
         self,
-        data: pyam.IamDataFrame,
+        data: pyam.IamDataFrame | pd.Series,
         /,
         criteria: tp.Optional[TimeseriesRefCriterionTypeVar] = None,
     ) -> pd.DataFrame:
@@ -84,6 +124,10 @@ class TimeseriesRefFullComparisonOutput(
 
         Parameters
         ----------
+        data : pyam.IamDataFrame or pandas.Series
+            The data to compare, or a comparison result already returned by
+            `TimeseriesRefCriterion.compare` (with or without `compact=True`),
+            which is used as it is.
         criterion : TimeseriesRefCriterion
             The criterion to be used to prepare the output data.
 
@@ -94,9 +138,17 @@ class TimeseriesRefFullComparisonOutput(
         """
         if criteria is None:
            criteria = self.criteria
-        comparison_result: pd.Series = criteria.compare(data)
+        # `get_values` without aggregation gives the same result as `compare`,
+        # but can use the results store of the criterion if it has one.
+        comparison_result: pd.Series = data if isinstance(data, pd.Series) \
+            else criteria.get_values(
+                data,
+                agg_dims=AggDims.NO_AGGREGATION,
+                compact=self.compact,
+                float32=self.float32,
+            )
         timeseries_df: pd.DataFrame = \
-            comparison_result.unstack(level=DIM.TIME)
+            pdhelpers.unstack_level(comparison_result, DIM.TIME)
         return timeseries_df
     ###END def TimeseriesComparisonFullDataOutput.prepare_output
 
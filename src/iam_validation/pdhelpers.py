@@ -4,10 +4,25 @@ Functions
 ---------
 replace_level_values(df, level, mapping)
     Replace values in a levels of a MultiIndex performantly.
+compact_series(s, float32=False)
+    Get a copy of a Series with a MultiIndex in a compact form.
+unstack_level(s, level)
+    Unstack one level of a Series with a MultiIndex, using the level codes.
+row_weights(index, weights)
+    Get the weight of each row of a MultiIndex from weights indexed by a
+    subset of its levels.
+
+Classes
+-------
+LevelGrouping
+    Grouping of the rows of a MultiIndex by a subset of its levels, for fast
+    segment reductions.
 """
+import dataclasses
 import typing as tp
 from collections.abc import Mapping, Sequence, Hashable
 
+import numpy as np
 import pandas as pd
 
 
@@ -91,3 +106,522 @@ def replace_level_values(
     return df
 
 ###END def replace_level_values
+
+
+def compact_series(s: pd.Series, float32: bool = False) -> pd.Series:
+    """Get a copy of a Series with a MultiIndex in a compact form.
+
+    A MultiIndex stores each distinct value of a level once, and refers to it
+    from each row through an integer code, so the index itself is already
+    categorical-coded. But a MultiIndex that has been used for set operations
+    or lookups (such as joins or `reindex`) usually caches an object array
+    with one tuple per row and a hash table, which can take up several times
+    as much memory as the codes and values together, and levels may contain
+    values that are no longer used after filtering. This function builds a new
+    MultiIndex from the levels and codes only, with unused level values
+    removed and no caches, and optionally converts the values to float32.
+
+    The returned Series has the same index values, in the same order, as `s`.
+    Operations that need row labels (like `unstack` or grouping by levels)
+    work directly on the codes, while operations that need an object
+    representation (like `reset_index` or `to_frame().to_records()`) will
+    expand the index again.
+
+    Parameters
+    ----------
+    s : pd.Series
+        Series with a MultiIndex. If the index is not a MultiIndex, `s` is
+        only converted to float32 if requested.
+    float32 : bool, optional
+        Whether to convert the values to float32. This halves the memory used
+        by the values, but only keeps about 7 significant digits. Optional, by
+        default False.
+
+    Returns
+    -------
+    pd.Series
+        The compacted Series.
+    """
+    index: pd.Index = s.index
+    if isinstance(index, pd.MultiIndex):
+        index = index.remove_unused_levels()
+        index = pd.MultiIndex(
+            levels=index.levels,
+            codes=index.codes,
+            names=index.names,
+            verify_integrity=False,
+        )
+    return pd.Series(
+        s.to_numpy(dtype=np.float32) if float32 else s.to_numpy(copy=True),
+        index=index,
+        name=s.name,
+    )
+###END def compact_series
+
+
+def unstack_level(s: pd.Series, level: Hashable) -> pd.DataFrame:
+    """Unstack one level of a Series with a MultiIndex, using the level codes.
+
+    Gives the same result as `s.unstack(level)`, but computes the rows and
+    columns of the result from the integer codes of the MultiIndex only, and
+    builds the row index of the result from the codes and levels of `s`. It
+    therefore never creates object arrays of index values or tuples, and
+    keeps the value dtype of `s` where possible (float32 values stay
+    float32, while integer values are converted to float to make room for
+    NaN in missing cells).
+
+    Parameters
+    ----------
+    s : pd.Series
+        Series with a MultiIndex without duplicate or missing values. If the
+        index is not a MultiIndex, or `s` is empty, `s.unstack(level)` is
+        returned.
+    level : hashable
+        Name of the level to unstack into columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame with the values of `level` as columns, in sorted order, and
+        the remaining levels as the row index, sorted by their codes.
+
+    Raises
+    ------
+    ValueError
+        If the index of `s` has duplicate values.
+    """
+    index: pd.Index = s.index
+    if not isinstance(index, pd.MultiIndex) or len(s) == 0 \
+            or any(np.any(np.asarray(_codes) < 0) for _codes in index.codes):
+        return s.unstack(level)
+    level_num: int = index.names.index(level)
+    other_nums: list[int] = [
+        _num for _num in range(index.nlevels) if _num != level_num
+    ]
+    row_codes: np.ndarray
+    row_positions: np.ndarray
+    row_codes, row_positions = np.unique(
+        np.column_stack([np.asarray(index.codes[_num]) for _num in other_nums]),
+        axis=0,
+        return_inverse=True,
+    )
+    row_positions = row_positions.reshape(-1)
+    column_codes: np.ndarray
+    column_positions: np.ndarray
+    column_codes, column_positions = np.unique(
+        np.asarray(index.codes[level_num]),
+        return_inverse=True,
+    )
+    num_columns: int = len(column_codes)
+    if len(np.unique(row_positions * num_columns + column_positions)) \
+            < len(s):
+        raise ValueError('Index contains duplicate entries, cannot reshape')
+    dtype: np.dtype = s.dtype if s.dtype.kind in 'fc' \
+        else np.dtype(float) if s.dtype.kind in 'iu' \
+        else np.dtype(object)
+    values: np.ndarray = np.full(
+        (len(row_codes), num_columns),
+        np.nan,
+        dtype=dtype,
+    )
+    values[row_positions, column_positions] = s.to_numpy()
+    row_index: pd.Index = pd.MultiIndex(
+        levels=[index.levels[_num] for _num in other_nums],
+        codes=[row_codes[:, _pos] for _pos in range(len(other_nums))],
+        names=[index.names[_num] for _num in other_nums],
+        verify_integrity=False,
+    ) if len(other_nums) > 1 else \
+        index.levels[other_nums[0]][row_codes[:, 0]] \
+            .rename(index.names[other_nums[0]])
+    columns: pd.Index = \
+        index.levels[level_num][column_codes].rename(level)
+    return pd.DataFrame(values, index=row_index, columns=columns)
+###END def unstack_level
+
+
+SEGMENT_REDUCTIONS: frozenset[str] = frozenset(
+    ('mean', 'max', 'min', 'sum', 'first', 'median')
+)
+"""Names of the reductions supported by `LevelGrouping.reduce`."""
+
+WEIGHTED_REDUCTIONS: frozenset[str] = frozenset(('mean', 'sum'))
+"""Names of the reductions supported by `LevelGrouping.weighted_reduce`."""
+
+
+def row_weights(index: pd.MultiIndex, weights: pd.Series) -> np.ndarray:
+    """Get the weight of each row of a MultiIndex.
+
+    The weights are looked up once for each combination of level values in
+    a table with one entry per combination, and then taken for each row by
+    its level codes, so the cost per row does not depend on the number of
+    weights.
+
+    Parameters
+    ----------
+    index : pandas.MultiIndex
+        The index to get weights for.
+    weights : pandas.Series
+        The weights, with an index whose level names are a subset of the
+        level names of `index` (e.g., a flat Index named `"region"`, or a
+        MultiIndex with the levels `"region"` and `"year"`). Must not have
+        duplicate index values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Float array with the weight of each row of `index`. The weight is NaN
+        for rows with level values that are not in `weights`, or with missing
+        values in any of the levels of `weights`.
+    """
+    weight_names: list[Hashable] = list(weights.index.names)
+    missing_names: list[Hashable] = [
+        _name for _name in weight_names if _name not in index.names
+    ]
+    if len(missing_names) > 0:
+        raise ValueError(
+            f'The weights are indexed by the levels {missing_names}, which are '
+            f'not in the index to get weights for (levels {list(index.names)}).'
+        )
+    level_nums: list[int] = [index.names.index(_name) for _name in weight_names]
+    levels: list[pd.Index] = [index.levels[_num] for _num in level_nums]
+    codes: list[np.ndarray] = [
+        np.asarray(index.codes[_num]) for _num in level_nums
+    ]
+    table_index: pd.Index = levels[0] if len(levels) == 1 \
+        else pd.MultiIndex.from_product(levels, names=weight_names)
+    table: np.ndarray = weights.reindex(table_index).to_numpy(dtype=float)
+    is_valid: np.ndarray = np.logical_and.reduce([_codes >= 0 for _codes in codes])
+    result: np.ndarray = np.full(len(index), np.nan)
+    result[is_valid] = table[
+        np.ravel_multi_index(
+            tuple(_codes[is_valid] for _codes in codes),
+            tuple(len(_level) for _level in levels),
+        )
+    ]
+    return result
+###END def row_weights
+
+
+@dataclasses.dataclass(frozen=True)
+class LevelGrouping:
+    """Grouping of the rows of a MultiIndex by a subset of its levels.
+
+    The grouping sorts the rows once by the values of the grouping levels
+    (with a stable sort, so rows keep their original order within each
+    group), and records where each group starts. Reductions over the groups
+    can then be computed with numpy segment reductions, and give the same
+    results as `pandas.Series.groupby(levels).agg(func)` with the default
+    `sort=True` and `dropna=True` (up to floating point rounding) for the
+    functions in `SEGMENT_REDUCTIONS`.
+
+    Use `LevelGrouping.from_index` to create instances. The grouping of the
+    aggregated result by fewer levels can be obtained with `drop_levels`,
+    without going through a MultiIndex again.
+
+    Fields
+    ------
+    names : tuple
+        Names of the grouping levels.
+    levels : tuple of pandas.Index
+        The values of each grouping level.
+    codes : tuple of numpy.ndarray
+        The codes in `levels` of the grouping levels for each row included
+        in the grouping (rows with missing values in any grouping level are
+        excluded).
+    ranks : tuple of numpy.ndarray
+        For each grouping level, the rank of each value in `levels` in sorted
+        order.
+    rows : numpy.ndarray
+        Positions in the original index of the rows included in the grouping.
+    order : numpy.ndarray
+        Permutation of the included rows (as positions in `rows`) that sorts
+        them by group.
+    starts : numpy.ndarray
+        Start positions of each group in the sorted rows.
+    """
+    names: tuple[Hashable, ...]
+    levels: tuple[pd.Index, ...]
+    codes: tuple[np.ndarray, ...]
+    ranks: tuple[np.ndarray, ...]
+    rows: np.ndarray
+    order: np.ndarray
+    starts: np.ndarray
+
+    @classmethod
+    def from_index(
+            cls,
+            index: pd.MultiIndex,
+            drop_levels: Sequence[Hashable],
+    ) -> 'LevelGrouping':
+        """Group the rows of `index` by all levels except `drop_levels`."""
+        level_nums: list[int] = [
+            _num for _num, _name in enumerate(index.names)
+            if _name not in drop_levels
+        ]
+        levels: tuple[pd.Index, ...] = tuple(
+            index.levels[_num] for _num in level_nums
+        )
+        return cls._from_codes(
+            names=tuple(index.names[_num] for _num in level_nums),
+            levels=levels,
+            codes=tuple(np.asarray(index.codes[_num]) for _num in level_nums),
+            ranks=tuple(
+                np.argsort(_level.argsort(kind='stable'), kind='stable')
+                for _level in levels
+            ),
+        )
+    ###END def LevelGrouping.from_index
+
+    @classmethod
+    def _from_codes(
+            cls,
+            names: tuple[Hashable, ...],
+            levels: tuple[pd.Index, ...],
+            codes: tuple[np.ndarray, ...],
+            ranks: tuple[np.ndarray, ...],
+    ) -> 'LevelGrouping':
+        """Create a grouping from the codes of each row in each level."""
+        num_rows: int = len(codes[0]) if len(codes) > 0 else 0
+        valid: np.ndarray = np.logical_and.reduce(
+            [_codes >= 0 for _codes in codes] + [np.ones(num_rows, dtype=bool)]
+        )
+        rows: np.ndarray = np.flatnonzero(valid)
+        if len(rows) < num_rows:
+            codes = tuple(_codes[rows] for _codes in codes)
+        row_ranks: list[np.ndarray] = [
+            _ranks[_codes] for _ranks, _codes in zip(ranks, codes)
+        ]
+        # `np.lexsort` is stable and uses the last key as the primary one.
+        order: np.ndarray = np.lexsort(row_ranks[::-1]) if len(row_ranks) > 0 \
+            else np.arange(len(rows))
+        if len(rows) == 0:
+            starts: np.ndarray = np.zeros(0, dtype=np.intp)
+        else:
+            changed: np.ndarray = np.zeros(len(rows) - 1, dtype=bool)
+            for _row_ranks in row_ranks:
+                _sorted: np.ndarray = _row_ranks[order]
+                changed |= _sorted[1:] != _sorted[:-1]
+            starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+        return cls(
+            names=names,
+            levels=levels,
+            codes=codes,
+            ranks=ranks,
+            rows=rows,
+            order=order,
+            starts=starts,
+        )
+    ###END def LevelGrouping._from_codes
+
+    @property
+    def num_groups(self) -> int:
+        """The number of groups."""
+        return len(self.starts)
+    ###END def LevelGrouping.num_groups
+
+    @property
+    def group_codes(self) -> tuple[np.ndarray, ...]:
+        """The codes in each grouping level of each group, in group order."""
+        first_rows: np.ndarray = self.order[self.starts]
+        return tuple(_codes[first_rows] for _codes in self.codes)
+    ###END def LevelGrouping.group_codes
+
+    @property
+    def result_index(self) -> pd.Index:
+        """Index of the groups, as in the result of a pandas groupby.
+
+        A MultiIndex if there is more than one grouping level, otherwise a
+        flat Index.
+        """
+        group_codes: tuple[np.ndarray, ...] = self.group_codes
+        if len(self.levels) == 1:
+            return self.levels[0].take(group_codes[0]).rename(self.names[0])
+        return pd.MultiIndex(
+            levels=self.levels,
+            codes=group_codes,
+            names=self.names,
+            verify_integrity=False,
+        )
+    ###END def LevelGrouping.result_index
+
+    def drop_levels(self, drop_levels: Sequence[Hashable]) -> 'LevelGrouping':
+        """Get the grouping of the groups of `self` by fewer levels.
+
+        The returned grouping groups the rows of `self.result_index` (i.e.,
+        the result of a reduction with `self.reduce`) by all levels of `self`
+        except `drop_levels`.
+        """
+        keep: list[int] = [
+            _num for _num, _name in enumerate(self.names)
+            if _name not in drop_levels
+        ]
+        group_codes: tuple[np.ndarray, ...] = self.group_codes
+        return LevelGrouping._from_codes(
+            names=tuple(self.names[_num] for _num in keep),
+            levels=tuple(self.levels[_num] for _num in keep),
+            codes=tuple(group_codes[_num] for _num in keep),
+            ranks=tuple(self.ranks[_num] for _num in keep),
+        )
+    ###END def LevelGrouping.drop_levels
+
+    def reduce(self, values: np.ndarray, func: str) -> np.ndarray:
+        """Reduce values over each group.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            Float array with one value for each row of the grouped index.
+        func : str
+            The reduction to compute, one of `SEGMENT_REDUCTIONS`. NaN values
+            are skipped, as by the pandas groupby methods of the same name
+            (i.e., `"sum"` gives 0.0 for groups with only NaN values, and the
+            other functions give NaN).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with one value per group, in the order of
+            `self.result_index`.
+        """
+        if func not in SEGMENT_REDUCTIONS:
+            raise ValueError(
+                f'Unsupported reduction {func!r}. Must be one of '
+                f'{sorted(SEGMENT_REDUCTIONS)}.'
+            )
+        if self.num_groups == 0:
+            return np.zeros(0, dtype=float)
+        sorted_values: np.ndarray = np.asarray(
+            values,
+            dtype=float,
+        )[self.rows][self.order]
+        is_valid: np.ndarray = ~np.isnan(sorted_values)
+        counts: np.ndarray = np.add.reduceat(is_valid.astype(np.intp), self.starts)
+        result: np.ndarray
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if func == 'sum' or func == 'mean':
+                result = self._compensated_sums(sorted_values, is_valid)
+                if func == 'mean':
+                    result = result / counts
+            elif func == 'max':
+                result = np.fmax.reduceat(sorted_values, self.starts)
+            elif func == 'min':
+                result = np.fmin.reduceat(sorted_values, self.starts)
+            elif func == 'first':
+                valid_positions: np.ndarray = np.flatnonzero(is_valid)
+                first: np.ndarray = np.searchsorted(valid_positions, self.starts)
+                result = np.full(self.num_groups, np.nan)
+                has_valid: np.ndarray = counts > 0
+                result[has_valid] = sorted_values[
+                    valid_positions[first[has_valid]]
+                ]
+            else:
+                # Sort the values within each group (NaN last), and take the
+                # middle of the non-NaN values.
+                group_ids: np.ndarray = np.repeat(
+                    np.arange(self.num_groups),
+                    np.diff(np.append(self.starts, len(sorted_values))),
+                )
+                within_sorted: np.ndarray = sorted_values[
+                    np.lexsort((sorted_values, group_ids))
+                ]
+                has_valid = counts > 0
+                _starts: np.ndarray = self.starts[has_valid]
+                _counts: np.ndarray = counts[has_valid]
+                result = np.full(self.num_groups, np.nan)
+                result[has_valid] = 0.5 * (
+                    within_sorted[_starts + (_counts - 1) // 2]
+                    + within_sorted[_starts + _counts // 2]
+                )
+        return result
+    ###END def LevelGrouping.reduce
+
+    def weighted_reduce(
+            self,
+            values: np.ndarray,
+            weights: np.ndarray,
+            func: str = 'mean',
+    ) -> np.ndarray:
+        """Compute weighted reductions over each group.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            Float array with one value for each row of the grouped index.
+        weights : numpy.ndarray
+            Float array with one weight for each row of the grouped index,
+            e.g., from `row_weights`.
+        func : str, optional
+            The reduction to compute, one of `WEIGHTED_REDUCTIONS`. `"mean"`
+            gives the sum of the weighted values divided by the sum of the
+            weights in each group, and `"sum"` gives the sum of the weighted
+            values. Rows where the value or the weight is NaN are skipped, so
+            groups without any such rows get NaN for `"mean"` and 0.0 for
+            `"sum"`, as for `reduce`. `"mean"` also gives NaN for groups where
+            the weights sum to zero. Optional, by default `"mean"`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array with one value per group, in the order of
+            `self.result_index`.
+        """
+        if func not in WEIGHTED_REDUCTIONS:
+            raise ValueError(
+                f'Unsupported weighted reduction {func!r}. Must be one of '
+                f'{sorted(WEIGHTED_REDUCTIONS)}.'
+            )
+        if self.num_groups == 0:
+            return np.zeros(0, dtype=float)
+        positions: np.ndarray = self.rows[self.order]
+        sorted_values: np.ndarray = np.asarray(values, dtype=float)[positions]
+        sorted_weights: np.ndarray = np.asarray(weights, dtype=float)[positions]
+        is_valid: np.ndarray = ~(np.isnan(sorted_values) | np.isnan(sorted_weights))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted_sums: np.ndarray = np.add.reduceat(
+                np.where(is_valid, sorted_values * sorted_weights, 0.0),
+                self.starts,
+            )
+            if func == 'sum':
+                return weighted_sums
+            weight_sums: np.ndarray = np.add.reduceat(
+                np.where(is_valid, sorted_weights, 0.0),
+                self.starts,
+            )
+            result: np.ndarray = weighted_sums / weight_sums
+        result[weight_sums == 0.0] = np.nan
+        return result
+    ###END def LevelGrouping.weighted_reduce
+
+    def _compensated_sums(
+            self,
+            sorted_values: np.ndarray,
+            is_valid: np.ndarray,
+    ) -> np.ndarray:
+        """Sum the non-NaN values of each group with Kahan summation.
+
+        This uses the same compensated summation as the pandas groupby `sum`
+        and `mean` methods, so that results are identical and not just equal
+        up to rounding. The loop runs over positions within the groups, so
+        the number of Python-level iterations is the size of the largest
+        group, while each iteration is vectorized over all groups.
+        """
+        lengths: np.ndarray = np.diff(np.append(self.starts, len(sorted_values)))
+        sums: np.ndarray = np.zeros(self.num_groups)
+        compensation: np.ndarray = np.zeros(self.num_groups)
+        for _pos in range(int(lengths.max(initial=0))):
+            _groups: np.ndarray = np.flatnonzero(lengths > _pos)
+            _rows: np.ndarray = self.starts[_groups] + _pos
+            _valid: np.ndarray = is_valid[_rows]
+            _groups = _groups[_valid]
+            _y: np.ndarray = sorted_values[_rows[_valid]] - compensation[_groups]
+            _t: np.ndarray = sums[_groups] + _y
+            _compensation: np.ndarray = _t - sums[_groups] - _y
+            # As in pandas, reset the compensation if it is NaN (which happens
+            # for infinite values), so that results are infinite, not NaN.
+            _compensation[np.isnan(_compensation)] = 0.0
+            compensation[_groups] = _compensation
+            sums[_groups] = _t
+        return sums
+    ###END def LevelGrouping._compensated_sums
+
+###END class LevelGrouping
@@ -10,11 +10,47 @@ make_consistent_units(df, match_df, unit_col='unit', match_dims=('variable',)) \
     `pyam.IamDataFrame.convert_unit` does. Only converts units for variables
     present in both IamDataFrames, and does not require both IamDataFrames to
     have the same regions, models, or scenarios, unless specified.
+get_unit_conversion_factor(source_unit, target_unit, context=None) -> float
+    Get the multiplicative factor for converting values from one unit to
+    another, using the same unit registry and conventions as
+    `pyam.IamDataFrame.convert_unit`. Factors are cached process-wide, see
+    `unit_conversion_cache_info` and `clear_unit_conversion_cache`.
+convert_units_to(df, unit, context=None) -> pyam.IamDataFrame
+    Convert all values of an IamDataFrame to a single unit.
+broadcast_series(s, target_coords) -> pandas.Series
+    Broadcast a Series to new coordinates for index levels that have a single
+    coordinate value, by repeating the codes of its MultiIndex.
+used_level_values(index, level) -> pandas.Index
+    Get the values of a MultiIndex level that are used by at least one row.
+exact_match_mask(index, coords) -> numpy.ndarray
+    Get a mask of the rows of a MultiIndex whose values are in given lists of
+    coordinates, by exact matching on level codes.
+filter_series(s, coords) -> pandas.Series
+    Filter a Series with MultiIndex to rows with given coordinate values,
+    without pattern matching.
+iter_partitions(df, dims=('model', 'scenario'), max_rows=None) \
+        -> Iterator[pyam.IamDataFrame]
+    Split an IamDataFrame into partitions that each hold complete blocks of
+    data for a set of coordinate combinations of the given dimensions.
+block_codes(df, dims=('model', 'scenario')) -> tuple[numpy.ndarray, \
+        pandas.MultiIndex]
+    Get the block number of each row of an IamDataFrame, and the coordinates
+    of each block.
+block_hashes(df, dims=('model', 'scenario')) -> pandas.Series
+    Get a hash of the content of each block of an IamDataFrame.
+content_hash(df) -> str
+    Get a hash of the content of an IamDataFrame.
 """
 import typing as tp
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+import functools
+import hashlib
 
+import iam_units
+import numpy as np
+import pint
 import pyam
+from pyam.units import convert_gwp
 import pandas as pd
 
 
@@ -67,78 +103,124 @@ def make_consistent_units(
     -------
     pyam.IamDataFrame
         IamDataFrame with units consisetent with `match_df`.
+
+    Notes
+    -----
+    The conversion is done by looking up a conversion factor for each distinct
+    pair of source and target units (see `get_unit_conversion_factor`), and
+    multiplying all values in `df` by the factor for their row in a single
+    operation. Conversions that are not purely multiplicative (e.g., between
+    temperature scales with different zero points) are therefore not
+    supported, and will raise a `NonMultiplicativeUnitError`.
     """
     # First use the `pyam.IamDataFrame.unit_mapping` property to get a list of
     # all variables in `df` that have different units from `match_df`.
     df_unit_mapping: dict[str, str|list[str]] = df.unit_mapping
-    match_unit_mapping: dict[str, list[str]] = match_df.unit_mapping
+    match_unit_mapping: dict[str, str|list[str]] = match_df.unit_mapping
     differing_vars: list[str] = [
         _var for _var, _unit in df_unit_mapping.items()
         if _unit != match_unit_mapping.get(_var, _unit)
     ]
-    matching_df: pyam.IamDataFrame = notnone(
-        df.filter(variable=differing_vars, keep=False)
-    )
-    converted_dfs: list[pyam.IamDataFrame] = []
+    data: pd.Series = as_pandas_series(df, copy=False)
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, data.index)
+    var_level_num: int = index.names.index('variable')
+    unit_level_num: int = index.names.index(unit_col)
+    # All units in `df` and the target units, so that source and target units
+    # can be represented by codes into the same Index.
+    units: pd.Index = index.levels[unit_level_num].append(
+        pd.Index(
+            [_unit for _var in differing_vars
+             for _unit in np.atleast_1d(match_unit_mapping[_var])]
+        )
+    ).unique()
+    source_codes: np.ndarray = units.get_indexer(
+        index.levels[unit_level_num]
+    )[index.codes[unit_level_num]]
+    target_codes: np.ndarray = source_codes.copy()
+
+    # Variables with a single unit in `match_df`: look up the target unit by
+    # variable code.
+    var_level: pd.Index = index.levels[var_level_num]
+    var_codes: np.ndarray = np.asarray(index.codes[var_level_num])
+    var_target_codes: np.ndarray = np.full(len(var_level) + 1, -1)
+    multi_unit_vars: list[str] = []
     for _var in differing_vars:
-        # If _var has a single unit in `match_df`, convert it to that unit using
-        # `pyam.IamDataFrame.convert_unit`.
-        target_unit: str|list[str] = match_unit_mapping[_var]
-        source_units: str|list[str] = df_unit_mapping[_var]
-        if isinstance(source_units, str):
-            source_units = [source_units]
-        for _source_unit in source_units:
-            if isinstance(target_unit, str):
-                converted_dfs.append(
-                    notnone(
-                        notnone(df.filter(variable=_var, unit=_source_unit)) \
-                            .convert_unit(_source_unit, to=target_unit)
-                    )
-                )
-            else:
-                _source_unit_converted_dfs: list[pyam.IamDataFrame] = []
-                for _target_unit in target_unit:
-                    target_unit_df: pyam.IamDataFrame = notnone(
-                        match_df.filter(variable=_var, unit=_target_unit)
-                    )
-                    _df_filter: dict[str, str] = {
-                        _dim: getattr(target_unit_df, _dim)
-                        for _dim in match_dims
-                    }
-                    _source_df: pyam.IamDataFrame = notnone(
-                        df.filter(
-                            variable=_var,
-                            unit=_source_unit,
-                            keep=True,
-                            inplace=False,
-                            **_df_filter
-                        )
-                    )
-                    _source_unit_converted_dfs.append(
-                        notnone(
-                            _source_df.convert_unit(_source_unit,
-                                                    to=_target_unit)
-                        )
-                    )
-                # Need to check that the result has the same length as the
-                # source df for the variable and unit
-                _source_unit_converted_df_joined = pyam.concat(
-                    _source_unit_converted_dfs
-                )
-                if len(_source_unit_converted_df_joined) != \
-                        len(notnone(df.filter(variable=_var, unit=_source_unit))):
-                    raise ValueError(
-                        f'The lenght of the converted IamDataFrame for '
-                        f'variable {_var} and unit {_source_unit} does not '
-                        f'match the length of the source IamDataFrame for the '
-                        f'same variable and unit. Probably this is because the '
-                        f'unit in the target IamDataFrame is not unique for '
-                        f'the combination of dimensions given in the '
-                        f'match_dims parameter ({match_dims}).'
-                    )
-                converted_dfs.extend(_source_unit_converted_dfs)
-    converted_data_series: pd.Series = pd.concat(
-        [matching_df._data, *[_df._data for _df in converted_dfs]]
+        _target_unit: str|list[str] = match_unit_mapping[_var]
+        if isinstance(_target_unit, str):
+            var_target_codes[var_level.get_loc(_var)] = \
+                units.get_loc(_target_unit)
+        else:
+            multi_unit_vars.append(_var)
+    _row_target_codes: np.ndarray = var_target_codes[var_codes]
+    _has_target: np.ndarray = _row_target_codes >= 0
+    target_codes[_has_target] = _row_target_codes[_has_target]
+
+    # Variables with more than one unit in `match_df`: look up the target unit
+    # by the combination of variable and `match_dims`, which must be unique.
+    if multi_unit_vars:
+        key_dims: list[str] = ['variable', *match_dims]
+        match_index: pd.MultiIndex = tp.cast(
+            pd.MultiIndex,
+            as_pandas_series(match_df, copy=False).index
+        )
+        match_keys: pd.DataFrame = match_index[
+            match_index.get_level_values('variable').isin(multi_unit_vars)
+        ].to_frame(index=False)[key_dims + [unit_col]].drop_duplicates()
+        key_index: pd.MultiIndex = pd.MultiIndex.from_frame(
+            match_keys[key_dims]
+        )
+        if key_index.has_duplicates:
+            raise ValueError(
+                f'The unit in `match_df` is not unique for the combination of '
+                f'variable and the dimensions given in the match_dims '
+                f'parameter ({match_dims}), for the variables '
+                f'{sorted(set(key_index[key_index.duplicated()].get_level_values("variable")))}.'
+            )
+        multi_rows: np.ndarray = np.flatnonzero(
+            np.isin(var_codes, var_level.get_indexer(multi_unit_vars))
+        )
+        key_positions: np.ndarray = key_index.get_indexer(
+            index[multi_rows].droplevel(
+                [_name for _name in index.names if _name not in key_dims]
+            ).reorder_levels(key_dims)
+        )
+        if (key_positions < 0).any():
+            raise ValueError(
+                f'Some rows of `df` for the variables {multi_unit_vars} have '
+                f'no matching unit in `match_df` for the combination of '
+                f'dimensions given in the match_dims parameter '
+                f'({match_dims}).'
+            )
+        target_codes[multi_rows] = units.get_indexer(
+            match_keys[unit_col].to_numpy()[key_positions]
+        )
+
+    # Get a conversion factor for each distinct pair of source and target
+    # unit, and multiply all values by the factor for their row at once.
+    pair_codes: np.ndarray = source_codes * len(units) + target_codes
+    unique_pairs, pair_inverse = np.unique(pair_codes, return_inverse=True)
+    pair_factors: np.ndarray = np.array([
+        get_unit_conversion_factor(
+            units[_pair // len(units)],
+            units[_pair % len(units)],
+        )
+        for _pair in unique_pairs
+    ])
+    converted_data_series: pd.Series = pd.Series(
+        data.to_numpy() * pair_factors[pair_inverse],
+        index=pd.MultiIndex(
+            levels=[
+                _level if _num != unit_level_num else units
+                for _num, _level in enumerate(index.levels)
+            ],
+            codes=[
+                _codes if _num != unit_level_num else target_codes
+                for _num, _codes in enumerate(index.codes)
+            ],
+            names=index.names,
+            verify_integrity=False,
+        ),
+        name=data.name,
     )
     converted_df: pyam.IamDataFrame = pyam.IamDataFrame(converted_data_series) \
         if not keep_meta else \
@@ -187,6 +269,172 @@ def as_pandas_series(
 ###END def as_pandas_series
 
 
+class NonMultiplicativeUnitError(ValueError):
+    """Raised if a unit conversion cannot be expressed as a single factor,
+    e.g., for temperature units with an offset."""
+    ...
+###END class NonMultiplicativeUnitError
+
+
+UNIT_CONVERSION_CACHE_SIZE: int = 4096
+"""Maximum number of unit conversion factors kept by the process-wide cache
+used by `get_unit_conversion_factor`."""
+
+
+@functools.lru_cache(maxsize=UNIT_CONVERSION_CACHE_SIZE)
+def get_unit_conversion_factor(
+        source_unit: str,
+        target_unit: str,
+        context: tp.Optional[str] = None,
+) -> float:
+    """Get the factor for converting values from one unit to another.
+
+    The conversion uses the `iam_units` registry and the same string
+    conventions as `pyam.IamDataFrame.convert_unit` (i.e., `-equiv` suffixes
+    are ignored and GWP conversions are attempted for emissions species if
+    `context` is given), but only computes a single factor rather than
+    converting an entire `IamDataFrame`. This makes it possible to convert
+    arrays of values with many different unit pairs by simple multiplication.
+
+    The factors are memoized in a process-wide least-recently-used cache keyed
+    by `(source_unit, target_unit, context)`, so that each unit pair is only
+    parsed and converted by `pint` once. Use `unit_conversion_cache_info` to
+    get hit/miss statistics, and `clear_unit_conversion_cache` to empty the
+    cache (e.g., after adding definitions to the `iam_units` registry).
+    Conversions that raise an exception are not cached.
+
+    Parameters
+    ----------
+    source_unit : str
+        Unit to convert from.
+    target_unit : str
+        Unit to convert to.
+    context : str, optional
+        Context (GWP metric) to use for the conversion, passed on the same way
+        as the `context` parameter of `pyam.IamDataFrame.convert_unit`.
+        Optional, by default None.
+
+    Returns
+    -------
+    float
+        The number that values in `source_unit` must be multiplied by to get
+        values in `target_unit`.
+
+    Raises
+    ------
+    NonMultiplicativeUnitError
+        If the conversion is not purely multiplicative (e.g., between
+        temperature units with different zero points).
+    pint.DimensionalityError, pint.UndefinedUnitError
+        If the units are not compatible or not defined, as for
+        `pyam.IamDataFrame.convert_unit`.
+    """
+    if source_unit == target_unit:
+        return 1.0
+    _source, _target = (
+        _unit.replace('-equiv', '')
+        .replace('HFC43-10', 'HFC4310')
+        .replace('HFC4310', 'HFC4310mee')
+        for _unit in (source_unit, target_unit)
+    )
+    qty: list[tp.Any] = [np.array([0.0, 1.0]), _source]
+    try:
+        converted: np.ndarray = np.asarray(
+            iam_units.registry.Quantity(*qty).to(
+                _target,
+                context if context is not None else pint.Context()
+            ).magnitude,
+            dtype=float,
+        )
+    except pint.UndefinedUnitError:
+        converted = np.asarray(
+            convert_gwp(context, qty, _target)[0].magnitude,
+            dtype=float,
+        )
+    if converted[0] != 0.0:
+        raise NonMultiplicativeUnitError(
+            f'Conversion from {source_unit} to {target_unit} is not a pure '
+            'multiplication and cannot be expressed as a single factor.'
+        )
+    return float(converted[1])
+###END def get_unit_conversion_factor
+
+
+def unit_conversion_cache_info() -> functools._CacheInfo:
+    """Get statistics for the cache used by `get_unit_conversion_factor`.
+
+    Returns
+    -------
+    functools._CacheInfo
+        Named tuple with the fields `hits`, `misses`, `maxsize` and `currsize`.
+    """
+    return get_unit_conversion_factor.cache_info()
+###END def unit_conversion_cache_info
+
+
+def clear_unit_conversion_cache() -> None:
+    """Clear the cache and statistics of `get_unit_conversion_factor`."""
+    get_unit_conversion_factor.cache_clear()
+###END def clear_unit_conversion_cache
+
+
+def convert_units_to(
+        df: pyam.IamDataFrame,
+        unit: str,
+        context: tp.Optional[str] = None,
+        unit_col: str = 'unit',
+) -> pyam.IamDataFrame:
+    """Convert all values of an IamDataFrame to a single unit.
+
+    Unlike `pyam.IamDataFrame.convert_unit`, which converts one given unit,
+    this function converts every unit present in `df` to `unit`, using one
+    cached conversion factor per unit (see `get_unit_conversion_factor`).
+
+    Parameters
+    ----------
+    df : pyam.IamDataFrame
+        IamDataFrame to convert.
+    unit : str
+        Unit to convert to. Must be compatible with all units in `df`.
+    context : str, optional
+        Context to use for the conversion, see `get_unit_conversion_factor`.
+    unit_col : str, optional
+        Name of the dimension that contains the units. Optional, defaults to
+        `'unit'`.
+
+    Returns
+    -------
+    pyam.IamDataFrame
+        IamDataFrame with all values in `unit`, and the `meta` table of `df`.
+    """
+    data: pd.Series = as_pandas_series(df, copy=False)
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, data.index)
+    unit_level_num: int = index.names.index(unit_col)
+    unit_factors: np.ndarray = np.array([
+        get_unit_conversion_factor(_unit, unit, context)
+        for _unit in index.levels[unit_level_num]
+    ])
+    converted_data: pd.Series = pd.Series(
+        data.to_numpy() * unit_factors[index.codes[unit_level_num]],
+        index=pd.MultiIndex(
+            levels=[
+                _level if _num != unit_level_num else pd.Index([unit])
+                for _num, _level in enumerate(index.levels)
+            ],
+            codes=[
+                _codes if _num != unit_level_num
+                else np.zeros(len(index), dtype=np.int8)
+                for _num, _codes in enumerate(index.codes)
+            ],
+            names=index.names,
+            verify_integrity=False,
+        ),
+        name=data.name,
+    )
+    return pyam.IamDataFrame(converted_data, meta=df.meta)
+###END def convert_units_to
+
+
 class MultipleCoordinateValuesError(ValueError):
     """Raised if an IamDataFrame has mulltiple coordinate values for given
     dimensions when only a single value is expected."""
@@ -197,7 +445,8 @@ class MultipleCoordinateValuesError(ValueError):
 def broadcast_dims(
         df: pyam.IamDataFrame,
         target: pyam.IamDataFrame,
-        dims: Sequence[str]
+        dims: Sequence[str],
+        method: tp.Literal['codes', 'rename'] = 'codes',
 ) -> pyam.IamDataFrame:
     """Make an IamDataFrame match coordinates of a target for given dimensions.
 
@@ -231,6 +480,15 @@ def broadcast_dims(
         IamDataFrame to match the coordinates to.
     dims : sequence of str
         Dimensions to match the coordinates for.
+    method : `"codes"` or `"rename"`, optional
+        How to construct the broadcast data. `"codes"` builds the MultiIndex
+        of the result directly by repeating the level codes of `df` (see
+        `broadcast_series`), so that the cost is proportional to the size of
+        the result. `"rename"` renames and concatenates one copy of `df` for
+        each target coordinate value, which is much slower for many target
+        values, but also carries over the `meta` table of `df` to the
+        renamed models and scenarios (with `"codes"`, the result gets an
+        empty `meta` table). Optional, by default `"codes"`.
     """
     for _dim in dims:
         if len(getattr(df, _dim)) > 1:
@@ -239,6 +497,15 @@ def broadcast_dims(
                 f'dimension {_dim}. Can only broadcast on dimensions where '
                 f'`df` only has a single coordinate value.'
             )
+    if method == 'codes':
+        return pyam.IamDataFrame(
+            broadcast_series(
+                as_pandas_series(df, copy=False),
+                {_dim: getattr(target, _dim) for _dim in dims},
+            )
+        )
+    if method != 'rename':
+        raise ValueError(f'Unknown broadcast method {method!r}.')
     broadcast_dim_original_values: dict[str, tp.Any] = {
         _dim: getattr(df, _dim)[0] for _dim in dims
     }
@@ -263,4 +530,330 @@ def broadcast_dims(
 ###END def broadcast_dims
 
 
+def broadcast_series(
+        s: pd.Series,
+        target_coords: tp.Mapping[str, Sequence[tp.Any]],
+) -> pd.Series:
+    """Broadcast a Series with MultiIndex to new coordinates for given levels.
+
+    Each of the index levels named in `target_coords` must have a single
+    coordinate value in `s`, or a `MultipleCoordinateValuesError` will be
+    raised. The returned Series contains one copy of the
+    values of `s` for each combination of the target coordinates, with the
+    coordinate values of those levels replaced. The index of the result is
+    constructed directly from repeated level codes, without creating
+    intermediate Series or concatenating, so the cost is proportional to the
+    size of the result.
+
+    Parameters
+    ----------
+    s : pandas.Series
+        Series to broadcast. Must have a MultiIndex.
+    target_coords : mapping of str to sequence
+        The coordinate values to broadcast to, by index level name.
+
+    Returns
+    -------
+    pandas.Series
+        The broadcast Series. The data for each combination of target
+        coordinates are placed in consecutive blocks, in the same row order as
+        in `s`.
+    """
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, s.index)
+    target_levels: dict[str, pd.Index] = {
+        _dim: pd.Index(_coords, name=_dim)
+        for _dim, _coords in target_coords.items()
+    }
+    block_shape: tuple[int, ...] = tuple(
+        len(_level) for _level in target_levels.values()
+    )
+    num_blocks: int = int(np.prod(block_shape))
+    block_codes: dict[str, np.ndarray] = dict(zip(
+        target_levels.keys(),
+        np.unravel_index(np.arange(num_blocks), block_shape),
+    ))
+    num_rows: int = len(index)
+    new_levels: list[pd.Index] = []
+    new_codes: list[np.ndarray] = []
+    for _name, _level, _codes in zip(index.names, index.levels, index.codes):
+        if _name in target_levels:
+            if len(np.unique(_codes)) > 1:
+                raise MultipleCoordinateValuesError(
+                    f'The Series has multiple coordinate values for the index '
+                    f'level {_name}. Can only broadcast on levels with a single '
+                    'coordinate value.'
+                )
+            new_levels.append(target_levels[_name])
+            new_codes.append(np.repeat(block_codes[_name], num_rows))
+        else:
+            new_levels.append(_level)
+            new_codes.append(np.tile(np.asarray(_codes), num_blocks))
+    return pd.Series(
+        np.tile(s.to_numpy(), num_blocks),
+        index=pd.MultiIndex(
+            levels=new_levels,
+            codes=new_codes,
+            names=index.names,
+            verify_integrity=False,
+        ),
+        name=s.name,
+    )
+###END def broadcast_series
+
+
+def used_level_values(index: pd.MultiIndex, level: str) -> pd.Index:
+    """Get the values of a MultiIndex level that are used by at least one row.
+
+    Unlike `index.get_level_values(level).unique()`, this only looks at the
+    integer codes of the level, and does not materialize the values of all
+    rows. The values are returned in the order of `index.levels`.
+    """
+    level_num: int = index.names.index(level)
+    codes: np.ndarray = np.asarray(index.codes[level_num])
+    level_values: pd.Index = index.levels[level_num]
+    is_used: np.ndarray = np.bincount(
+        codes[codes >= 0],
+        minlength=len(level_values),
+    ) > 0
+    return level_values[is_used]
+###END def used_level_values
+
+
+def exact_match_mask(
+        index: pd.MultiIndex,
+        coords: tp.Mapping[str, tp.Iterable[tp.Any]],
+) -> np.ndarray:
+    """Get a mask of the rows of a MultiIndex with given coordinate values.
+
+    The values in `coords` are matched exactly against the level values (no
+    wildcards or other pattern matching as in `pyam.IamDataFrame.filter`),
+    and only once per distinct level value. The mask for the rows is then
+    obtained by indexing with the level codes, so the cost per row is a single
+    array lookup per level in `coords`.
+
+    Parameters
+    ----------
+    index : pandas.MultiIndex
+        The index to get a mask for.
+    coords : mapping of str to iterable
+        The coordinate values to keep, by level name. Levels not in `coords`
+        are not filtered on.
+
+    Returns
+    -------
+    numpy.ndarray
+        Boolean array with one element per row of `index`, True for the rows
+        whose values are in `coords` for all the given levels. Rows with
+        missing values in any of the given levels are False.
+    """
+    mask: np.ndarray = np.ones(len(index), dtype=bool)
+    for _dim, _values in coords.items():
+        _level_num: int = index.names.index(_dim)
+        # Append False for the code -1, which marks missing values.
+        _level_mask: np.ndarray = np.append(
+            index.levels[_level_num].isin(list(_values)),
+            False,
+        )
+        mask &= _level_mask[np.asarray(index.codes[_level_num])]
+    return mask
+###END def exact_match_mask
+
+
+def filter_series(
+        s: pd.Series,
+        coords: tp.Mapping[str, tp.Iterable[tp.Any]],
+) -> pd.Series:
+    """Filter a Series with MultiIndex to rows with given coordinate values.
+
+    Equivalent to `pyam.IamDataFrame.filter` with lists of exact coordinate
+    values (and without the `meta` or time-related filters), but does not do
+    any pattern matching, and operates directly on the level codes of the
+    index (see `exact_match_mask`). Returns `s` itself, not a copy, if all
+    rows are kept.
+    """
+    mask: np.ndarray = exact_match_mask(tp.cast(pd.MultiIndex, s.index), coords)
+    if mask.all():
+        return s
+    return s.iloc[np.flatnonzero(mask)]
+###END def filter_series
+
+
+def iter_partitions(
+        df: pyam.IamDataFrame,
+        dims: Sequence[str] = ('model', 'scenario'),
+        max_rows: tp.Optional[int] = None,
+) -> Iterator[pyam.IamDataFrame]:
+    """Split an IamDataFrame into partitions by coordinates of given dims.
+
+    Each partition contains all the rows of `df` for one or more combinations
+    of coordinate values of `dims` (blocks), so that no block is split across
+    partitions. Blocks are yielded in sorted order of their coordinates, and
+    rows keep their original order within each partition.
+
+    Parameters
+    ----------
+    df : pyam.IamDataFrame
+        The IamDataFrame to split.
+    dims : sequence of str, optional
+        The dimensions to partition by. Optional, by default `("model",
+        "scenario")`.
+    max_rows : int, optional
+        Maximum number of rows in each partition. Consecutive blocks are
+        combined into partitions of up to `max_rows` rows. A block with more
+        than `max_rows` rows is yielded as a partition on its own. If None
+        (default), each block is yielded as a separate partition.
+
+    Yields
+    ------
+    pyam.IamDataFrame
+        The partitions. If all of `dims` are dimensions of `df.meta`, the meta
+        indicators of the models and scenarios in each partition are included.
+    """
+    s: pd.Series = as_pandas_series(df, copy=False)
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, s.index)
+    if len(index) == 0:
+        return
+    level_nums: list[int] = [index.names.index(_dim) for _dim in dims]
+    block_ids: np.ndarray = np.ravel_multi_index(
+        tuple(np.asarray(index.codes[_num]) for _num in level_nums),
+        tuple(len(index.levels[_num]) for _num in level_nums),
+    )
+    order: np.ndarray = np.argsort(block_ids, kind='stable')
+    sorted_ids: np.ndarray = block_ids[order]
+    block_starts: np.ndarray = np.concatenate(
+        ([0], np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1)
+    )
+    block_ends: np.ndarray = np.append(block_starts[1:], len(order))
+    include_meta: bool = all(_dim in df.meta.index.names for _dim in dims) \
+        and len(df.meta.columns) > 0
+    chunk_start: int = 0
+    for _block_num, _block_end in enumerate(block_ends):
+        _is_last: bool = _block_num == len(block_ends) - 1
+        if not _is_last and max_rows is not None \
+                and block_ends[_block_num + 1] - chunk_start <= max_rows:
+            continue
+        _rows: np.ndarray = np.sort(order[chunk_start:_block_end])
+        _data: pd.Series = s.iloc[_rows]
+        if include_meta:
+            _meta_index: pd.Index = _data.index.droplevel(
+                [_name for _name in index.names
+                 if _name not in df.meta.index.names]
+            ).unique().reorder_levels(df.meta.index.names)
+            yield pyam.IamDataFrame(_data, meta=df.meta.loc[_meta_index])
+        else:
+            yield pyam.IamDataFrame(_data)
+        chunk_start = int(_block_end)
+###END def iter_partitions
+
+
+def block_codes(
+        df: pyam.IamDataFrame,
+        dims: Sequence[str] = ('model', 'scenario'),
+) -> tuple[np.ndarray, pd.MultiIndex]:
+    """Get the block number of each row of an IamDataFrame.
+
+    A block is all the rows of `df` with a given combination of coordinate
+    values of `dims`.
+
+    Parameters
+    ----------
+    df : pyam.IamDataFrame
+        The IamDataFrame to get block numbers for.
+    dims : sequence of str, optional
+        The dimensions that define the blocks. Optional, by default
+        `("model", "scenario")`.
+
+    Returns
+    -------
+    block_numbers : numpy.ndarray
+        Integer array with the block number of each row of `df` (in the order
+        of `as_pandas_series(df)`), from 0 to the number of blocks minus 1.
+    blocks : pandas.MultiIndex
+        The coordinates of each block, with one level per dimension in `dims`,
+        in order of block number. The blocks are in the same sorted order as
+        the partitions yielded by `iter_partitions`.
+    """
+    s: pd.Series = as_pandas_series(df, copy=False)
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, s.index)
+    level_nums: list[int] = [index.names.index(_dim) for _dim in dims]
+    shape: tuple[int, ...] = tuple(len(index.levels[_num]) for _num in level_nums)
+    flat_ids: np.ndarray = np.ravel_multi_index(
+        tuple(np.asarray(index.codes[_num]) for _num in level_nums),
+        shape,
+    )
+    unique_ids, block_numbers = np.unique(flat_ids, return_inverse=True)
+    block_level_codes: tuple[np.ndarray, ...] = np.unravel_index(unique_ids, shape)
+    blocks: pd.MultiIndex = pd.MultiIndex(
+        levels=[index.levels[_num] for _num in level_nums],
+        codes=list(block_level_codes),
+        names=list(dims),
+    )
+    return block_numbers, blocks
+###END def block_codes
+
+
+def block_hashes(
+        df: pyam.IamDataFrame,
+        dims: Sequence[str] = ('model', 'scenario'),
+) -> pd.Series:
+    """Get a hash of the content of each block of an IamDataFrame.
+
+    The hash of a block is computed from the index values and data values of
+    all its rows, so it changes if any value, coordinate or unit in the block
+    changes, or if rows are added or removed. Hashes do not depend on the
+    other blocks in `df`, and are stable between Python sessions, so they can
+    be used to detect which blocks have changed between two versions of a
+    dataset.
+
+    Parameters
+    ----------
+    df : pyam.IamDataFrame
+        The IamDataFrame to hash.
+    dims : sequence of str, optional
+        The dimensions that define the blocks. Optional, by default
+        `("model", "scenario")`.
+
+    Returns
+    -------
+    pandas.Series
+        Series of hex digest strings, with the index returned by
+        `block_codes`.
+    """
+    s: pd.Series = as_pandas_series(df, copy=False)
+    block_numbers, blocks = block_codes(df, dims=dims)
+    row_hashes: np.ndarray = pd.util.hash_pandas_object(
+        s,
+        index=True,
+    ).to_numpy()
+    order: np.ndarray = np.argsort(block_numbers, kind='stable')
+    block_ends: np.ndarray = np.cumsum(np.bincount(block_numbers,
+                                                   minlength=len(blocks)))
+    digests: list[str] = []
+    _start: int = 0
+    for _end in block_ends:
+        digests.append(
+            hashlib.blake2b(
+                row_hashes[order[_start:_end]].tobytes(),
+                digest_size=16,
+            ).hexdigest()
+        )
+        _start = int(_end)
+    return pd.Series(digests, index=blocks, name='hash', dtype=object)
+###END def block_hashes
+
+
+def content_hash(df: pyam.IamDataFrame) -> str:
+    """Get a hash of the content of an IamDataFrame.
 
+    The hash is computed from the index values and data values of all rows
+    (meta indicators are not included), and is stable between Python
+    sessions.
+    """
+    return hashlib.blake2b(
+        pd.util.hash_pandas_object(
+            as_pandas_series(df, copy=False),
+            index=True,
+        ).to_numpy().tobytes(),
+        digest_size=16,
+    ).hexdigest()
+###END def content_hash
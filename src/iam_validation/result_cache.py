@@ -0,0 +1,229 @@
+"""Persistent on-disk cache of criterion values.
+
+Vetting runs are often repeated with the same criteria on the same or nearly
+the same data, e.g., when a pipeline is rerun after an unrelated change, or
+in a new Python session. The `ResultCache` class in this module stores the
+results of `get_values` calls of criteria and `CriterionTargetRange` objects
+in a directory, keyed by a fingerprint of the criterion configuration (see
+`caching.criterion_fingerprint`), a hash of the content of the input data
+(see `pyam_helpers.content_hash`) and the keyword arguments of the call, so
+that unchanged evaluations are read from disk instead of being recomputed.
+
+Each result is stored as a pickle file named after its key, written with
+`pandas.to_pickle`, which preserves the index levels, names and dtypes of
+the result exactly. Lookups only check for that file. An `index.json` file
+records the criterion name and creation time of each result for
+information only. It is not locked, so entries may be missing from it if
+several processes write to the same directory at the same time. Since
+unpickling can execute arbitrary code, only use directories that are not
+writable by untrusted users.
+
+Classes
+-------
+ResultCache
+    Directory cache of `get_values` results.
+"""
+import json
+import time
+import typing as tp
+from collections.abc import Mapping
+from pathlib import Path
+
+import pandas as pd
+import pyam
+from pathways_ensemble_analysis.criteria.base import Criterion
+
+from . import caching
+from . import pyam_helpers
+from .targets.target_classes import CriterionTargetRange
+
+
+
+class ResultCache:
+    """Directory cache of `get_values` results.
+
+    Results are stored under a key that is a fingerprint of the criterion
+    (or `CriterionTargetRange`), the content of the input data and the
+    keyword arguments passed to `get_values`. Any change to any of these
+    gives a different key, so stale results are never returned, but they are
+    also not removed automatically. Use `clear` to remove all stored results.
+
+    Init parameters
+    ---------------
+    directory : str or Path
+        The directory to store results in. Created if it does not exist.
+
+    Attributes
+    ----------
+    directory : Path
+        The directory results are stored in.
+    hits : int
+        Number of lookups that found a stored result.
+    misses : int
+        Number of lookups that did not.
+    """
+
+    INDEX_FILE_NAME: tp.ClassVar[str] = 'index.json'
+    """Name of the file in `directory` with information about the stored
+    results. Only informational, see the module docstring."""
+
+    RESULT_FILE_SUFFIX: tp.ClassVar[str] = '.pkl'
+    """Suffix of the file names of stored results, after the key."""
+
+    def __init__(self, directory: str | Path):
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits: int = 0
+        self.misses: int = 0
+    ###END def ResultCache.__init__
+
+    def _read_index(self) -> dict[str, dict[str, tp.Any]]:
+        """Read the index file, or return an empty index if there is none."""
+        index_path: Path = self.directory / self.INDEX_FILE_NAME
+        if not index_path.exists():
+            return {}
+        with index_path.open('r', encoding='utf-8') as _file:
+            return json.load(_file)
+    ###END def ResultCache._read_index
+
+    def _write_index(self, index: Mapping[str, Mapping[str, tp.Any]]) -> None:
+        def _write(_path: str) -> None:
+            with open(_path, 'w', encoding='utf-8') as _file:
+                json.dump(index, _file, indent=1, sort_keys=True)
+        caching.write_atomic(self.directory / self.INDEX_FILE_NAME, _write)
+    ###END def ResultCache._write_index
+
+    def _result_path(self, key: str) -> Path:
+        return self.directory / f'{key}{self.RESULT_FILE_SUFFIX}'
+    ###END def ResultCache._result_path
+
+    def _result_paths(self) -> list[Path]:
+        return list(self.directory.glob(f'*{self.RESULT_FILE_SUFFIX}'))
+    ###END def ResultCache._result_paths
+
+    def __len__(self) -> int:
+        return len(self._result_paths())
+    ###END def ResultCache.__len__
+
+    def __contains__(self, key: str) -> bool:
+        return self._result_path(key).is_file()
+    ###END def ResultCache.__contains__
+
+    @staticmethod
+    def make_key(
+            evaluator: Criterion | CriterionTargetRange,
+            data: pyam.IamDataFrame,
+            kwargs: tp.Optional[Mapping[str, tp.Any]] = None,
+    ) -> str:
+        """Get the key for the result of `evaluator.get_values(data, **kwargs)`.
+
+        Keyword argument values are included through their `repr`, so they
+        should be of types that have a deterministic `repr` (such as strings,
+        numbers, enums and lists or dicts of them).
+        """
+        return caching.fingerprint(
+            (
+                caching.criterion_fingerprint(evaluator),
+                pyam_helpers.content_hash(data),
+                sorted((kwargs or {}).items()),
+            )
+        )
+    ###END def ResultCache.make_key
+
+    def get(self, key: str) -> pd.Series | None:
+        """Get a stored result, or None if there is none for `key`."""
+        path: Path = self._result_path(key)
+        if not path.is_file():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return pd.read_pickle(path)
+    ###END def ResultCache.get
+
+    def put(self, key: str, value: pd.Series, name: str = '') -> None:
+        """Store a result.
+
+        Parameters
+        ----------
+        key : str
+            The key to store the result under, usually from `make_key`.
+        value : pandas.Series
+            The result to store.
+        name : str, optional
+            Name of the criterion, recorded in the index for information
+            only. Optional, by default an empty string.
+        """
+        path: Path = self._result_path(key)
+        caching.write_atomic(path, value.to_pickle)
+        file_name: str = path.name
+        index: dict[str, dict[str, tp.Any]] = self._read_index()
+        index[key] = {
+            'file': file_name,
+            'name': name,
+            'created': time.time(),
+        }
+        self._write_index(index)
+    ###END def ResultCache.put
+
+    def get_values(
+            self,
+            evaluator: Criterion | CriterionTargetRange,
+            data: pyam.IamDataFrame,
+            **kwargs,
+    ) -> pd.Series:
+        """Get the values of a criterion, from the cache if possible.
+
+        Returns the stored result for `evaluator.get_values(data, **kwargs)`
+        if there is one, or calls it and stores the result otherwise. If
+        `evaluator` uses functions that can not be identified in a
+        fingerprint (see `caching.UnidentifiableCallableError`), the result
+        is computed and not stored.
+
+        Parameters
+        ----------
+        evaluator : Criterion or CriterionTargetRange
+            The criterion to get values for. For a `CriterionTargetRange`,
+            `kwargs` are passed on through its `get_values_kwargs` parameter.
+        data : pyam.IamDataFrame
+            The data to get values for.
+        **kwargs
+            Keyword arguments to pass to `get_values` of the criterion. They
+            are part of the cache key, see `make_key`.
+
+        Returns
+        -------
+        pandas.Series
+            The values returned by (or stored for) `get_values`.
+        """
+        key: str | None
+        try:
+            key = self.make_key(evaluator, data, kwargs)
+        except caching.UnidentifiableCallableError:
+            # The evaluator uses functions that can not be identified, so its
+            # results can not be cached.
+            key = None
+        if key is not None:
+            cached: pd.Series | None = self.get(key)
+            if cached is not None:
+                return cached
+        values: pd.Series
+        name: str
+        if isinstance(evaluator, CriterionTargetRange):
+            values = evaluator.get_values(data, get_values_kwargs=kwargs)
+            name = evaluator.name
+        else:
+            values = evaluator.get_values(data, **kwargs)
+            name = evaluator.criterion_name
+        if key is not None:
+            self.put(key, values, name=name)
+        return values
+    ###END def ResultCache.get_values
+
+    def clear(self) -> None:
+        """Remove all stored results. Does not reset `hits` and `misses`."""
+        for _path in self._result_paths():
+            _path.unlink(missing_ok=True)
+        (self.directory / self.INDEX_FILE_NAME).unlink(missing_ok=True)
+    ###END def ResultCache.clear
+
+###END class ResultCache
@@ -2,4 +2,9 @@
 
 from .target_classes import (
     CriterionTargetRange,
+    CriterionTargetRangeResult,
+)
+from .batch_evaluation import (
+    BatchEvaluationResult,
+    evaluate_target_ranges,
 )
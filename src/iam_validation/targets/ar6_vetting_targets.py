@@ -23,6 +23,7 @@ from .target_classes import (
     CriterionTargetRange,
     RelativeRange,
 )
+from .drop_conditions import CompiledDropConditions
 
 
 
@@ -97,6 +98,7 @@ vetting_targets_historical: list[CriterionTargetRange] = [
         unit='Mt CO2 / yr',
         range=(0.0, 250.0),  # IP range: 0-100 Mt CO2 / yr
         distance_func=lambda x: x/250.0,  # Use this to avoid division by zero in the defult function.
+        vectorized_distance_func=True,
     ),
 
     CriterionTargetRange(
@@ -376,3 +378,17 @@ _pea_drop_conditions_future: dict[str, dict[str, tp.Any]] = {
     "Electricity: nuclear 2030": {"mode": ">=", "value": 20},
     "CH4 emissions 2040": {"mode": "outside", "value": [100,1000]},
 }
+
+
+# Compiled forms of the drop conditions above, for evaluating all conditions
+# against a value matrix in one pass (see `drop_conditions`).
+
+_pea_compiled_drop_conditions_historical: CompiledDropConditions = \
+    CompiledDropConditions(_pea_drop_conditions_historical)
+
+_pea_compiled_drop_conditions_future: CompiledDropConditions = \
+    CompiledDropConditions(_pea_drop_conditions_future)
+
+_pea_compiled_drop_conditions: CompiledDropConditions = \
+    _pea_compiled_drop_conditions_historical \
+        + _pea_compiled_drop_conditions_future
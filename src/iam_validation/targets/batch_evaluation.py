@@ -0,0 +1,400 @@
+"""Batched evaluation of lists of `CriterionTargetRange` objects.
+
+Each `pathways_ensemble_analysis` criterion filters the full `IamDataFrame` it
+is given independently, so evaluating a list of criteria (such as the AR6
+vetting targets in `ar6_vetting_targets`) scans the full dataset once per
+criterion. The functions in this module instead collect the (variable,
+region, year) combinations needed by all criteria in a list, select all of
+them from the data in a single pass over the index, and compute the values
+for each criterion from the (much smaller) selection.
+
+Batched evaluation is supported for targets whose criterion is a
+`SingleVariableCriterion` or `ChangeOverTimeCriterion` with a single region
+(i.e., without region aggregation), and that do not convert input units.
+Other targets are by default evaluated separately through
+`CriterionTargetRange.get_values`.
+
+Functions
+---------
+evaluate_target_ranges
+    Evaluate a list of `CriterionTargetRange` objects for all model/scenario
+    combinations in an `IamDataFrame`.
+
+Classes
+-------
+BatchEvaluationResult
+    Value, distance and in-range matrices returned by
+    `evaluate_target_ranges`.
+UnsupportedBatchCriterionError
+    Raised when a target cannot be evaluated in batch and fallback to separate
+    evaluation has been disabled.
+"""
+import dataclasses
+import typing as tp
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+import pyam
+from pathways_ensemble_analysis.criteria.base import (
+    SingleVariableCriterion,
+    ChangeOverTimeCriterion,
+)
+
+from .. import pyam_helpers
+from ..dims import DIM
+from ..type_helpers import not_none
+from .target_classes import CriterionTargetRange
+
+
+
+class UnsupportedBatchCriterionError(ValueError):
+    """Raised when a criterion is not supported by batched evaluation."""
+    ...
+###END class UnsupportedBatchCriterionError
+
+
+@dataclasses.dataclass(frozen=True)
+class _SelectionRequest:
+    """The data selection and computation needed to evaluate one criterion.
+
+    Fields
+    ------
+    variable : str
+        The variable to select.
+    region : str
+        The region to select.
+    years : tuple of int
+        The years to select. For criteria that compute changes over time, the
+        first element is the reference year and the second the target year.
+    unit : str or None
+        Unit to convert the selected values to, or None to keep the units of
+        the data.
+    change_over_time : bool
+        Whether the criterion value is the relative change from the reference
+        year to the target year.
+    """
+    variable: str
+    region: str
+    years: tuple[int, ...]
+    unit: str|None
+    change_over_time: bool
+###END class _SelectionRequest
+
+
+def _get_selection_request(
+        target: CriterionTargetRange
+) -> _SelectionRequest|None:
+    """Get the selection request for a target, or None if it is unsupported."""
+    criterion = target.criterion
+    if target.convert_input_units \
+            or not isinstance(getattr(criterion, 'region', None), str):
+        return None
+    # Check `ChangeOverTimeCriterion` first, in case any subclass relationship
+    # between the classes is introduced in the future.
+    if type(criterion) is ChangeOverTimeCriterion:
+        return _SelectionRequest(
+            variable=criterion.variable,
+            region=criterion.region,
+            years=(int(criterion.reference_year), int(criterion.year)),
+            unit=None,
+            change_over_time=True,
+        )
+    if type(criterion) is SingleVariableCriterion:
+        return _SelectionRequest(
+            variable=criterion.variable,
+            region=criterion.region,
+            years=(int(criterion.year),),
+            unit=criterion.unit,
+            change_over_time=False,
+        )
+    return None
+###END def _get_selection_request
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchEvaluationResult:
+    """Results of evaluating a list of targets with `evaluate_target_ranges`.
+
+    All fields are DataFrames with one row per model/scenario combination of
+    the evaluated data (with a `model`, `scenario` MultiIndex), and one column
+    per target, with the target names as column labels.
+
+    Fields
+    ------
+    values : pandas.DataFrame
+        The criterion values. NaN where the data needed to compute a value is
+        missing.
+    distances : pandas.DataFrame
+        The distances of the values from the target, as computed by
+        `CriterionTargetRange.distances_from_values`.
+    in_range : pandas.DataFrame
+        Whether the values are in the target range, with nullable boolean
+        dtype. NA where the value is NaN or the target has no range.
+    """
+    values: pd.DataFrame
+    distances: pd.DataFrame
+    in_range: pd.DataFrame
+###END class BatchEvaluationResult
+
+
+def _select_requests(
+        data: pd.Series,
+        requests: Sequence[_SelectionRequest],
+        model_scenarios: pd.MultiIndex,
+) -> tuple[dict[tuple[str, str, int], int], np.ndarray, np.ndarray, pd.Index]:
+    """Select the values needed by all requests in a single pass.
+
+    Returns
+    -------
+    key_numbers : dict
+        Mapping from (variable, region, year) to column number in the
+        returned arrays.
+    values : numpy.ndarray
+        Array of shape (number of model/scenario combinations, number of
+        keys) with the selected values, in the units of the data (NaN where
+        not present).
+    unit_codes : numpy.ndarray
+        Array of the same shape as `values` with the codes of the unit of each
+        value in the returned unit Index (-1 where there is no value).
+    units : pandas.Index
+        The units of the selected values.
+    """
+    keys: list[tuple[str, str, int]] = list(dict.fromkeys(
+        (_request.variable, _request.region, _year)
+        for _request in requests for _year in _request.years
+    ))
+    key_numbers: dict[tuple[str, str, int], int] = {
+        _key: _num for _num, _key in enumerate(keys)
+    }
+    index: pd.MultiIndex = tp.cast(pd.MultiIndex, data.index)
+    # Map the codes of the variable, region and year levels to positions in the
+    # lists of requested values, and combine them into a single key code for
+    # each row. This only touches the index once per level, regardless of the
+    # number of requests.
+    key_level_values: list[pd.Index] = []
+    row_positions: list[np.ndarray] = []
+    for _key_pos, _dim in enumerate((DIM.VARIABLE, DIM.REGION, DIM.TIME)):
+        _requested: pd.Index = pd.Index(
+            list(dict.fromkeys(_key[_key_pos] for _key in keys))
+        )
+        _level_num: int = index.names.index(_dim)
+        _level_map: np.ndarray = np.append(
+            _requested.get_indexer(index.levels[_level_num]),
+            -1,
+        )
+        key_level_values.append(_requested)
+        row_positions.append(_level_map[index.codes[_level_num]])
+    shape: tuple[int, ...] = tuple(len(_values) for _values in key_level_values)
+    key_lookup: np.ndarray = np.full(int(np.prod(shape)), -1, dtype=np.intp)
+    key_lookup[np.ravel_multi_index(
+        tuple(
+            _values.get_indexer([_key[_pos] for _key in keys])
+            for _pos, _values in enumerate(key_level_values)
+        ),
+        shape,
+    )] = np.arange(len(keys))
+    found: np.ndarray = np.logical_and.reduce(
+        [_positions >= 0 for _positions in row_positions]
+    )
+    # Rows can match a requested value in each level without matching any of
+    # the requested combinations, so look up the key numbers for all rows that
+    # matched in each level, and then drop the ones without a key.
+    row_keys: np.ndarray = np.full(len(index), -1, dtype=np.intp)
+    row_keys[found] = key_lookup[np.ravel_multi_index(
+        tuple(_positions[found] for _positions in row_positions),
+        shape,
+    )]
+    found = row_keys >= 0
+    row_keys = row_keys[found]
+    selected: pd.Series = data[found]
+    selected_index: pd.MultiIndex = tp.cast(pd.MultiIndex, selected.index)
+    ms_positions: np.ndarray = model_scenarios.get_indexer(
+        pd.MultiIndex.from_arrays([
+            selected_index.get_level_values(DIM.MODEL),
+            selected_index.get_level_values(DIM.SCENARIO),
+        ])
+    )
+    flat_positions: np.ndarray = ms_positions * len(keys) + row_keys
+    if len(np.unique(flat_positions)) != len(flat_positions):
+        raise ValueError(
+            'The data has more than one value for the same model, scenario, '
+            'variable, region and year, probably because a variable is '
+            'present with more than one unit.'
+        )
+    values: np.ndarray = np.full(len(model_scenarios)*len(keys), np.nan)
+    values[flat_positions] = selected.to_numpy(dtype=float)
+    _unit_level_num: int = selected_index.names.index(DIM.UNIT)
+    unit_codes: np.ndarray = np.full(values.shape, -1, dtype=np.intp)
+    unit_codes[flat_positions] = selected_index.codes[_unit_level_num]
+    return (
+        key_numbers,
+        values.reshape(len(model_scenarios), len(keys)),
+        unit_codes.reshape(len(model_scenarios), len(keys)),
+        selected_index.levels[_unit_level_num],
+    )
+###END def _select_requests
+
+
+def _convert_column(
+        values: np.ndarray,
+        unit_codes: np.ndarray,
+        units: pd.Index,
+        unit: str,
+) -> np.ndarray:
+    """Convert a column of selected values to `unit`, one factor per unit."""
+    factors: np.ndarray = np.ones(len(units) + 1)
+    for _code in np.unique(unit_codes[unit_codes >= 0]):
+        factors[_code] = pyam_helpers.get_unit_conversion_factor(
+            units[_code],
+            unit,
+        )
+    return values * factors[unit_codes]
+###END def _convert_column
+
+
+def _get_separate_values(
+        target: CriterionTargetRange,
+        data: pyam.IamDataFrame,
+        model_scenarios: pd.MultiIndex,
+) -> np.ndarray:
+    """Evaluate a single target with `get_values` and align to model/scenario."""
+    values: pd.Series = target.get_values(data)
+    values = values.droplevel(
+        [
+            _name for _name in values.index.names
+            if _name not in (DIM.MODEL, DIM.SCENARIO)
+        ]
+    )
+    if not values.index.is_unique:
+        raise ValueError(
+            f'The target {target.name!r} returned more than one value for '
+            'some model/scenario combinations.'
+        )
+    return values.reindex(model_scenarios).to_numpy(dtype=float)
+###END def _get_separate_values
+
+
+def evaluate_target_ranges(
+        targets: Sequence[CriterionTargetRange],
+        data: pyam.IamDataFrame,
+        *,
+        fallback: bool = True,
+) -> BatchEvaluationResult:
+    """Evaluate a list of targets for all model/scenario combinations.
+
+    The values needed by all supported targets are selected from `data` in a
+    single pass (see the module docstring for which targets are supported).
+    The values are computed the same way as by the `pathways_ensemble_analysis`
+    criteria: `SingleVariableCriterion` values are converted to the unit of the
+    criterion (if not None), and `ChangeOverTimeCriterion` values are the
+    relative change from the reference year. If a target has
+    `convert_value_units` set, values are then converted to the target unit.
+
+    Parameters
+    ----------
+    targets : sequence of CriterionTargetRange
+        The targets to evaluate. Must have unique names.
+    data : pyam.IamDataFrame
+        The data to evaluate.
+    fallback : bool, optional
+        Whether to evaluate targets that are not supported by batched
+        evaluation separately, by calling `CriterionTargetRange.get_values`.
+        If False, an `UnsupportedBatchCriterionError` is raised for such
+        targets. Optional, by default True.
+
+    Returns
+    -------
+    BatchEvaluationResult
+        The values, distances and in-range status for each model/scenario
+        combination in `data` (including combinations with none of the
+        variables needed, which get NaN values) and each target.
+
+    Raises
+    ------
+    ValueError
+        If the target names are not unique, or if `data` has more than one
+        value for any of the selected variable, region and year combinations.
+    UnsupportedBatchCriterionError
+        If `fallback` is False and any of the targets are not supported.
+    """
+    names: list[str] = [_target.name for _target in targets]
+    if len(set(names)) != len(names):
+        raise ValueError('The names of the targets must be unique.')
+    model_scenarios: pd.MultiIndex = tp.cast(pd.MultiIndex, data.index)
+    requests: list[_SelectionRequest|None] = [
+        _get_selection_request(_target) for _target in targets
+    ] if DIM.TIME in data.dimensions else [None]*len(targets)
+    if not fallback:
+        for _target, _request in zip(targets, requests):
+            if _request is None:
+                raise UnsupportedBatchCriterionError(
+                    f'The target {_target.name!r} with criterion of type '
+                    f'{type(_target.criterion).__name__} cannot be evaluated '
+                    'in batch.'
+                )
+    supported_requests: list[_SelectionRequest] = [
+        _request for _request in requests if _request is not None
+    ]
+    if len(supported_requests) > 0:
+        key_numbers, selected, unit_codes, units = _select_requests(
+            pyam_helpers.as_pandas_series(data, copy=False),
+            supported_requests,
+            model_scenarios,
+        )
+    value_columns: list[np.ndarray] = []
+    for _target, _request in zip(targets, requests):
+        if _request is None:
+            value_columns.append(
+                _get_separate_values(_target, data, model_scenarios)
+            )
+            continue
+        _columns: list[int] = [
+            key_numbers[(_request.variable, _request.region, _year)]
+            for _year in _request.years
+        ]
+        if _request.change_over_time:
+            _reference, _current = selected[:, _columns[0]], selected[:, _columns[1]]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                _column_values: np.ndarray = (_current - _reference) / _reference
+            _column_values[
+                unit_codes[:, _columns[0]] != unit_codes[:, _columns[1]]
+            ] = np.nan
+        elif _request.unit is not None:
+            _column_values = _convert_column(
+                selected[:, _columns[0]],
+                unit_codes[:, _columns[0]],
+                units,
+                _request.unit,
+            )
+        else:
+            _column_values = selected[:, _columns[0]].copy()
+        if _target.convert_value_units:
+            _column_values = _column_values \
+                * pyam_helpers.get_unit_conversion_factor(
+                    _target.value_unit if _target.value_unit is not None
+                        else not_none(getattr(_target.criterion, 'unit')),
+                    not_none(_target.unit),
+                )
+        value_columns.append(_column_values)
+    values: pd.DataFrame = pd.DataFrame(
+        dict(zip(names, value_columns)),
+        index=model_scenarios,
+        columns=pd.Index(names),
+    )
+    distances: dict[str, pd.Series] = {}
+    in_range: dict[str, pd.Series] = {}
+    for _target in targets:
+        _values: pd.Series = values[_target.name]
+        distances[_target.name] = _target.distances_from_values(_values)
+        in_range[_target.name] = _target.values_in_range(_values) \
+            if _target.range is not None \
+                else pd.Series(pd.NA, index=_values.index, dtype='boolean')
+    return BatchEvaluationResult(
+        values=values,
+        distances=pd.DataFrame(distances, index=model_scenarios,
+                               columns=values.columns),
+        in_range=pd.DataFrame(in_range, index=model_scenarios,
+                              columns=values.columns),
+    )
+###END def evaluate_target_ranges
@@ -0,0 +1,269 @@
+"""Vectorized evaluation of `pathways_ensemble_analysis` drop conditions.
+
+`pathways_ensemble_analysis.evaluation.filter_values` takes drop conditions
+as a dict that maps criterion names to dicts with a `"mode"` (`"<="`, `">="`,
+`"inside"` or `"outside"`) and a `"value"` (a number, or a pair of numbers
+for `"inside"` and `"outside"`), and evaluates them one criterion at a time.
+This module compiles such dicts into threshold arrays, so that all conditions
+can be evaluated against a value matrix in a single pass.
+
+Functions and classes in this module use the same semantics as
+`filter_values`: bounds are inclusive (e.g., `"outside"` drops values that are
+less than or equal to the lower bound, or greater than or equal to the upper
+bound), and NaN values never cause a scenario to be dropped.
+
+Classes
+-------
+DropMode
+    Enum of the modes of drop conditions.
+CompiledDropConditions
+    Drop conditions compiled to threshold arrays.
+DropConditionsResult
+    Drop mask and reasons returned by `CompiledDropConditions.evaluate`.
+InvalidDropConditionError
+    Raised when a drop condition has an invalid mode or value.
+"""
+import dataclasses
+import typing as tp
+from collections.abc import Mapping
+from enum import StrEnum
+
+import numpy as np
+import pandas as pd
+
+
+
+class DropMode(StrEnum):
+    """Modes of drop conditions, as used by `pathways_ensemble_analysis`."""
+    LE = '<='
+    GE = '>='
+    INSIDE = 'inside'
+    OUTSIDE = 'outside'
+###END class DropMode
+
+
+class InvalidDropConditionError(ValueError):
+    """Raised when a drop condition has an invalid mode or value."""
+    ...
+###END class InvalidDropConditionError
+
+
+@dataclasses.dataclass(frozen=True)
+class DropConditionsResult:
+    """Results of evaluating drop conditions against a value matrix.
+
+    Fields
+    ------
+    drop : pandas.Series
+        Boolean Series with the same index as the value matrix, True for the
+        rows (scenarios) that are dropped by at least one condition.
+    reason : pandas.Series
+        Series with the same index as the value matrix, with the name of the
+        first criterion (in the order of the conditions) that caused each
+        dropped row to be dropped, and NA for rows that are kept.
+    conditions : pandas.DataFrame
+        Boolean DataFrame with the same index as the value matrix and one
+        column per condition, True where the condition drops the row.
+    """
+    drop: pd.Series
+    reason: pd.Series
+    conditions: pd.DataFrame
+###END class DropConditionsResult
+
+
+class CompiledDropConditions:
+    """Drop conditions compiled to threshold arrays.
+
+    Each condition is represented by four thresholds, `le`, `ge`, `inside_lo`
+    and `inside_hi`, and a value `v` is dropped if
+    `v <= le or v >= ge or inside_lo <= v <= inside_hi`. Thresholds that are
+    not used by a condition are NaN, so that the corresponding comparison is
+    always False.
+
+    Init parameters
+    ---------------
+    drop_conditions : mapping
+        Drop conditions in the format used by
+        `pathways_ensemble_analysis.evaluation.filter_values`, i.e., a mapping
+        from criterion names to mappings with the keys `"mode"` and `"value"`.
+
+    Attributes
+    ----------
+    criteria : tuple of str
+        The criterion names of the conditions, in the order given.
+    modes : tuple of DropMode
+        The mode of each condition.
+    le, ge, inside_lo, inside_hi : numpy.ndarray
+        The compiled thresholds, one element per condition.
+
+    Raises
+    ------
+    InvalidDropConditionError
+        If a condition has no `"mode"` or `"value"` key, an invalid mode, or a
+        value that does not match its mode.
+    """
+
+    def __init__(
+            self,
+            drop_conditions: Mapping[str, Mapping[str, tp.Any]],
+    ):
+        self.criteria: tuple[str, ...] = tuple(drop_conditions.keys())
+        modes: list[DropMode] = []
+        thresholds: np.ndarray = np.full((4, len(self.criteria)), np.nan)
+        for _num, (_criterion, _condition) in enumerate(drop_conditions.items()):
+            _missing_keys: list[str] = [
+                _key for _key in ('mode', 'value') if _key not in _condition
+            ]
+            if len(_missing_keys) > 0:
+                raise InvalidDropConditionError(
+                    f'The drop condition for {_criterion!r} has no '
+                    f'{_missing_keys} key(s).'
+                )
+            try:
+                _mode: DropMode = DropMode(_condition['mode'])
+            except ValueError as _err:
+                raise InvalidDropConditionError(
+                    f'Invalid mode {_condition["mode"]!r} for the drop '
+                    f'condition for {_criterion!r}. Must be one of '
+                    f'{[str(_m) for _m in DropMode]}.'
+                ) from _err
+            _value: tp.Any = _condition['value']
+            if _mode in (DropMode.LE, DropMode.GE):
+                if not isinstance(_value, (int, float, np.number)):
+                    raise InvalidDropConditionError(
+                        f'The value of the drop condition for {_criterion!r} '
+                        f'must be a number for mode {str(_mode)!r}.'
+                    )
+                thresholds[0 if _mode == DropMode.LE else 1, _num] = _value
+            else:
+                if np.ndim(_value) != 1 or len(_value) != 2:
+                    raise InvalidDropConditionError(
+                        f'The value of the drop condition for {_criterion!r} '
+                        f'must be a pair of numbers for mode {str(_mode)!r}.'
+                    )
+                if _mode == DropMode.OUTSIDE:
+                    thresholds[0:2, _num] = _value
+                else:
+                    thresholds[2:4, _num] = _value
+            modes.append(_mode)
+        self.modes: tuple[DropMode, ...] = tuple(modes)
+        self.le: np.ndarray = thresholds[0]
+        self.ge: np.ndarray = thresholds[1]
+        self.inside_lo: np.ndarray = thresholds[2]
+        self.inside_hi: np.ndarray = thresholds[3]
+    ###END def CompiledDropConditions.__init__
+
+    def __len__(self) -> int:
+        return len(self.criteria)
+    ###END def CompiledDropConditions.__len__
+
+    def __add__(self, other: 'CompiledDropConditions') -> 'CompiledDropConditions':
+        """Combine two sets of conditions, with the conditions of `other` last.
+
+        Raises a `ValueError` if the two sets have conditions for the same
+        criterion.
+        """
+        if not set(self.criteria).isdisjoint(other.criteria):
+            raise ValueError(
+                'Cannot combine drop conditions with overlapping criteria.'
+            )
+        return CompiledDropConditions(
+            self.to_dict() | other.to_dict()
+        )
+    ###END def CompiledDropConditions.__add__
+
+    def to_dict(self) -> dict[str, dict[str, tp.Any]]:
+        """Convert back to the dict format used by `filter_values`."""
+        result: dict[str, dict[str, tp.Any]] = {}
+        for _num, (_criterion, _mode) in enumerate(zip(self.criteria, self.modes)):
+            _value: float|list[float]
+            if _mode == DropMode.LE:
+                _value = float(self.le[_num])
+            elif _mode == DropMode.GE:
+                _value = float(self.ge[_num])
+            elif _mode == DropMode.OUTSIDE:
+                _value = [float(self.le[_num]), float(self.ge[_num])]
+            else:
+                _value = [float(self.inside_lo[_num]), float(self.inside_hi[_num])]
+            result[_criterion] = {'mode': str(_mode), 'value': _value}
+        return result
+    ###END def CompiledDropConditions.to_dict
+
+    def condition_mask(self, values: np.ndarray) -> np.ndarray:
+        """Evaluate all conditions on a 2D array of values.
+
+        Parameters
+        ----------
+        values : numpy.ndarray
+            Array with one row per scenario and one column per condition, in
+            the order of `self.criteria`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of the same shape as `values`, True where the
+            condition of the column drops the row.
+        """
+        with np.errstate(invalid='ignore'):
+            return (values <= self.le) | (values >= self.ge) \
+                | ((values >= self.inside_lo) & (values <= self.inside_hi))
+    ###END def CompiledDropConditions.condition_mask
+
+    def evaluate(self, value_matrix: pd.DataFrame) -> DropConditionsResult:
+        """Evaluate the conditions against a value matrix.
+
+        Parameters
+        ----------
+        value_matrix : pandas.DataFrame
+            DataFrame with one row per scenario (usually with a `model`,
+            `scenario` MultiIndex) and one column per criterion, such as the
+            `values` field of the result of
+            `batch_evaluation.evaluate_target_ranges`. It must have columns
+            for all the criteria in `self.criteria`, other columns are ignored.
+            *NB!* The value matrix returned by
+            `pathways_ensemble_analysis.evaluation.get_values` has criteria as
+            rows, and must be transposed first.
+
+        Returns
+        -------
+        DropConditionsResult
+            The drop mask, the reason for dropping each scenario, and the
+            result of each condition.
+
+        Raises
+        ------
+        ValueError
+            If `value_matrix` does not have a column for each criterion.
+        """
+        missing: list[str] = [
+            _criterion for _criterion in self.criteria
+            if _criterion not in value_matrix.columns
+        ]
+        if len(missing) > 0:
+            raise ValueError(
+                f'The value matrix has no column for the criteria {missing}.'
+            )
+        mask: np.ndarray = self.condition_mask(
+            value_matrix[list(self.criteria)].to_numpy(dtype=float)
+        )
+        drop: np.ndarray = np.asarray(mask.any(axis=1))
+        reason_codes: np.ndarray = np.where(drop, mask.argmax(axis=1), -1)
+        return DropConditionsResult(
+            drop=pd.Series(drop, index=value_matrix.index, name='drop'),
+            reason=pd.Series(
+                pd.Categorical.from_codes(
+                    reason_codes,
+                    categories=pd.Index(self.criteria),
+                ),
+                index=value_matrix.index,
+                name='reason',
+            ),
+            conditions=pd.DataFrame(
+                mask,
+                index=value_matrix.index,
+                columns=pd.Index(self.criteria),
+            ),
+        )
+    ###END def CompiledDropConditions.evaluate
+
+###END class CompiledDropConditions
@@ -1,4 +1,5 @@
 """Functionality for defining Criterion targets and ranges."""
+import dataclasses
 import typing as tp
 from collections.abc import Callable, Mapping
 
@@ -8,6 +9,10 @@ from pandas.api.typing import NAType
 import numpy as np
 from pathways_ensemble_analysis.criteria.base import Criterion
 
+from .. import caching
+from .. import pyam_helpers
+from ..type_helpers import not_none
+
 
 
 class RelativeRange(tuple[float, float]):
@@ -32,20 +37,37 @@ class RelativeRange(tuple[float, float]):
         return super().__new__(cls, (float(lower), float(upper)))
     ###END def RelativeRange.__new__
 
+    @tp.overload
     def get_absolute(self, reference: float) -> tuple[float, float]:
+        ...
+    @tp.overload
+    def get_absolute(
+            self,
+            reference: np.ndarray | pd.Series,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        ...
+    def get_absolute(
+            self,
+            reference: float | np.ndarray | pd.Series,
+    ) -> tuple[float, float] | tuple[np.ndarray, np.ndarray]:
         """Get a tuple with absolute values for the range.
 
         Parameters
         ----------
-        reference : float
+        reference : float or array-like
             Value to use as reference. The returned tuple will be
-            `(lower*reference, upper*reference)`.
+            `(lower*reference, upper*reference)`. If an array or Series of
+            reference values is passed, the bounds are returned as two numpy
+            arrays with one element per reference value.
 
         Returns
         -------
-        tuple[float, float]
+        tuple[float, float] or tuple[numpy.ndarray, numpy.ndarray]
             Tuple with absolute values for the range.
         """
+        if isinstance(reference, (np.ndarray, pd.Series)):
+            reference_array: np.ndarray = np.asarray(reference, dtype=float)
+            return (self[0]*reference_array, self[1]*reference_array)
         return (self[0]*reference, self[1]*reference)
     ###END def RelativeRange.get_absolute
 
@@ -63,6 +85,34 @@ class UnitNotSpecifiedError(ValueError):
 ###END class UnitNotSpecifiedError
 
 
+@dataclasses.dataclass(frozen=True)
+class CriterionTargetRangeResult:
+    """Result of evaluating a `CriterionTargetRange` on an IamDataFrame.
+
+    Returned by `CriterionTargetRange.evaluate`. The criterion values are
+    computed only once, and distances and in-range flags are derived from
+    them. All three Series have the same index as the values.
+
+    *NB!* The dataclass is frozen, but the Series it holds are not copied. Do
+    not modify them in place.
+
+    Fields
+    ------
+    values : pandas.Series
+        The values returned by `CriterionTargetRange.get_values`.
+    distances : pandas.Series
+        The distances of the values from the target, computed with
+        `CriterionTargetRange.distance_func`.
+    in_range : pandas.Series
+        Whether each value is in the target range. NA for NaN values, and for
+        all values if the `CriterionTargetRange` has no range.
+    """
+    values: pd.Series
+    distances: pd.Series
+    in_range: pd.Series
+###END class CriterionTargetRangeResult
+
+
 class CriterionTargetRange:
     """Class for defining Criterion value targets and ranges.
 
@@ -118,6 +168,13 @@ class CriterionTargetRange:
         and the lower bound if the value is less than the target (i.e., it will
         be `0` if the value is equal to the target, `1` if it is equal to the
         upper bound, and `-1` if it is equal to the lower bound).
+    vectorized_distance_func : bool, optional
+        Whether `distance_func` can be called on a numpy array of values and
+        return an array of distances of the same shape. If True, `distance_func`
+        is called once for all values when computing distances, instead of once
+        per value. Should only be set if `distance_func` is specified. The
+        default distance function is always vectorized. Optional, defaults to
+        False.
     description : str or None, optional
         A text description or explanation of the target. Optional, defaults to
         None, which signifies that no description has been set (as opposed to
@@ -156,6 +213,7 @@ class CriterionTargetRange:
             distance_func: tp.Optional[Callable[[float], float]] = None,
             description: str|None = None,
             rename_variable_column: tp.Optional[str|bool] = None,
+            vectorized_distance_func: bool = False,
     ):
         self._criterion: Criterion = criterion
         self.name: str = criterion.criterion_name if name is None else name
@@ -190,6 +248,7 @@ class CriterionTargetRange:
             self.distance_func: Callable[[float], float] = distance_func
         else:
             self.distance_func = self._default_distance_func
+        self.vectorized_distance_func: bool = vectorized_distance_func
         self.description: str|None = description
         self.rename_variable_column: str|bool = False \
             if rename_variable_column is None else rename_variable_column
@@ -309,11 +368,11 @@ class CriterionTargetRange:
                 raise UnitNotSpecifiedError(
                     '`unit` must be specified if `convert_value_units` is True.'
                 )
-            else:
+            elif value_unit is None:
                 if (criterion is None) or (not hasattr(criterion, 'unit')) \
                         or (criterion.unit is None):  # pyright: ignore[reportAttributeAccessIssue]
                     raise UnitNotSpecifiedError(
-                        '`unit` or `criterion.unit` must be specified if '
+                        '`value_unit` or `criterion.unit` must be specified if '
                         '`convert_value_units` is True.'
                     )
         if convert_input_units:
@@ -452,6 +511,124 @@ class CriterionTargetRange:
         return value > self.range[1]
     ###END def CriterionTargetRange.above_range
 
+    def _range_mask(
+            self,
+            values: pd.Series,
+            mask: np.ndarray,
+    ) -> pd.Series:
+        """Make a nullable boolean Series from a mask, with NA for NaN values."""
+        return pd.Series(
+            pd.arrays.BooleanArray(
+                mask,
+                np.isnan(values.to_numpy(dtype=float)),
+            ),
+            index=values.index,
+            name=values.name,
+        )
+    ###END def CriterionTargetRange._range_mask
+
+    def values_in_range(self, values: pd.Series) -> pd.Series:
+        """Check whether each value in a Series is in the target range.
+
+        Vectorized counterpart to `is_in_range`. Returns a Series with the same
+        index as `values` and nullable boolean dtype, with NA for NaN values.
+
+        Raises a `ValueError` if `self.range` is not specified.
+        """
+        if self.range is None:
+            raise ValueError('`self.range` must be specified to use `in_range`.')
+        _values: np.ndarray = values.to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            return self._range_mask(
+                values,
+                (_values >= self.range[0]) & (_values <= self.range[1]),
+            )
+    ###END def CriterionTargetRange.values_in_range
+
+    def values_below_range(self, values: pd.Series) -> pd.Series:
+        """Check whether each value in a Series is below the target range.
+
+        Vectorized counterpart to `is_below_range`, see `values_in_range`.
+        """
+        if self.range is None:
+            raise ValueError('`self.range` must be specified to use `below_range`.')
+        with np.errstate(invalid='ignore'):
+            return self._range_mask(
+                values,
+                values.to_numpy(dtype=float) < self.range[0],
+            )
+    ###END def CriterionTargetRange.values_below_range
+
+    def values_above_range(self, values: pd.Series) -> pd.Series:
+        """Check whether each value in a Series is above the target range.
+
+        Vectorized counterpart to `is_above_range`, see `values_in_range`.
+        """
+        if self.range is None:
+            raise ValueError('`self.range` must be specified to use `above_range`.')
+        with np.errstate(invalid='ignore'):
+            return self._range_mask(
+                values,
+                values.to_numpy(dtype=float) > self.range[1],
+            )
+    ###END def CriterionTargetRange.values_above_range
+
+    def _default_distances(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized version of `_default_distance_func`.
+
+        NaN values give NaN distances. Unlike the scalar version, values on the
+        side of a range bound that coincides with the target do not raise a
+        `ZeroDivisionError`, but get an infinite distance (or zero if the value
+        equals the target).
+        """
+        distances: np.ndarray = values - self.target
+        if self.range is None:
+            return distances
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distances = np.where(
+                values > self.target,
+                distances / (self.range[1] - self.target),
+                distances / (self.target - self.range[0]),
+            )
+        distances[values == self.target] = 0.0
+        return distances
+    ###END def CriterionTargetRange._default_distances
+
+    def distances_from_values(self, values: pd.Series) -> pd.Series:
+        """Compute distances from the target for a Series of values.
+
+        Uses a vectorized computation if `self.distance_func` is the default
+        distance function, or if `self.vectorized_distance_func` is True.
+        Otherwise, `self.distance_func` is applied to each value separately.
+
+        Parameters
+        ----------
+        values : pandas.Series
+            Values as returned by `self.get_values`.
+
+        Returns
+        -------
+        pandas.Series
+            Distances, with the same index as `values`.
+        """
+        if self.distance_func == self._default_distance_func:
+            return pd.Series(
+                self._default_distances(values.to_numpy(dtype=float)),
+                index=values.index,
+                name=values.name,
+            )
+        if self.vectorized_distance_func:
+            return pd.Series(
+                np.asarray(
+                    self.distance_func(values.to_numpy(dtype=float)),  # pyright: ignore[reportArgumentType]
+                    dtype=float,
+                ),
+                index=values.index,
+                name=values.name,
+            )
+        return values.apply(self.distance_func)
+    ###END def CriterionTargetRange.distances_from_values
+
     def get_in_range(
             self,
             file: pyam.IamDataFrame,
@@ -477,8 +654,9 @@ class CriterionTargetRange:
             of True for values that are in the target range, and False for those
             that are not.
         """
-        values: pd.Series = self.get_values(file, **get_values_kwargs)
-        return values.apply(self.is_in_range)
+        if self.range is None:
+            raise ValueError('`self.range` must be specified to use `in_range`.')
+        return self.evaluate(file, get_values_kwargs).in_range
     ###END def CriterionTargetRange.get_in_range
 
     def get_distances(
@@ -506,8 +684,7 @@ class CriterionTargetRange:
             for the distance between the value for a given model/scenario and
             the target value.
         """
-        values: pd.Series = self.get_values(file, **get_values_kwargs)
-        return values.apply(self.distance_func)
+        return self.evaluate(file, get_values_kwargs).distances
     ###END def CriterionTargetRange.get_distances
 
     def get_distances_in_range(self, file: pyam.IamDataFrame) -> pd.DataFrame:
@@ -531,19 +708,68 @@ class CriterionTargetRange:
             model/scenario and the target value and a column `in_range` for
             whether each value is in the target range or not.
         """
-        distances = self.get_distances(file)
-        distances.name = 'distance'
-        in_range = self.get_in_range(file)
-        in_range.name = 'in_range'
-        return pd.concat([distances, in_range], axis=1)
+        if self.range is None:
+            raise ValueError('`self.range` must be specified to use `in_range`.')
+        result: CriterionTargetRangeResult = self.evaluate(file)
+        return pd.concat(
+            [
+                result.distances.rename('distance'),
+                result.in_range.rename('in_range'),
+            ],
+            axis=1,
+        )
     ###END def CriterionTargetRange.get_distances_in_range
 
+    def evaluate(
+            self,
+            file: pyam.IamDataFrame,
+            get_values_kwargs: Mapping[str, tp.Any] = {},
+    ) -> CriterionTargetRangeResult:
+        """Compute values, distances and in-range flags in a single evaluation.
+
+        Calls `self.get_values` once, and derives the distances and in-range
+        flags from the returned values. Use this method rather than calling
+        `get_values`, `get_distances` and `get_in_range` separately if you need
+        more than one of them, since each of those methods evaluates the
+        criterion anew.
+
+        Parameters
+        ----------
+        file : pyam.IamDataFrame
+            The IamDataFrame to check.
+        get_values_kwargs : dict, optional
+            Keyword arguments to pass to `criterion.get_values`
+
+        Returns
+        -------
+        CriterionTargetRangeResult
+            Frozen dataclass with the fields `values`, `distances` and
+            `in_range`.
+        """
+        values: pd.Series = self.get_values(file, get_values_kwargs)
+        in_range: pd.Series = self.values_in_range(values) \
+            if self.range is not None \
+                else pd.Series(pd.NA, index=values.index, dtype='boolean')
+        return CriterionTargetRangeResult(
+            values=values,
+            distances=self.distances_from_values(values),
+            in_range=in_range,
+        )
+    ###END def CriterionTargetRange.evaluate
+
     def get_values(
             self,
             file: pyam.IamDataFrame,
             get_values_kwargs: Mapping[str, tp.Any] = {},
     ) -> pd.Series:
         """Call `self.criterion.get_values` on an IamDataFrame.
+
+        If `self.convert_input_units` is True, all values in `file` are
+        converted to `self.unit` before being passed to the criterion. If
+        `self.convert_value_units` is True, the returned values are converted
+        from `self.value_unit` (or `self.criterion.unit` if `value_unit` is
+        None) to `self.unit`. Both conversions use the cached conversion
+        factors of `pyam_helpers.get_unit_conversion_factor`.
         
         Parameters
         ----------
@@ -555,8 +781,17 @@ class CriterionTargetRange:
         pandas.Series
             The Series returned by the `.get_values` method of `self.criterion`.
         """
+        if self.convert_input_units:
+            file = pyam_helpers.convert_units_to(file, not_none(self.unit))
         values: pd.Series = \
             self._criterion.get_values(file, **get_values_kwargs)
+        if self.convert_value_units:
+            value_unit: str = self.value_unit if self.value_unit is not None \
+                else getattr(self._criterion, 'unit')
+            values = values * pyam_helpers.get_unit_conversion_factor(
+                value_unit,
+                not_none(self.unit),
+            )
         if self.rename_variable_column:
             if 'variable' not in values.index.names:
                 raise ValueError(
@@ -580,5 +815,27 @@ class CriterionTargetRange:
         return values
     ###END def CriterionTargetRange.get_values
 
+    def fingerprint(self) -> str:
+        """Get a fingerprint that identifies the results of `self.get_values`.
+
+        Combines the fingerprint of `self.criterion` (see
+        `caching.criterion_fingerprint`) with the unit settings and
+        `rename_variable_column`, which determine how the values returned by
+        the criterion are converted. The target, range and distance function
+        are not included, since they do not affect the values.
+        """
+        return caching.fingerprint(
+            (
+                caching.callable_name(type(self)),
+                caching.criterion_fingerprint(self._criterion),
+                self.unit,
+                self.value_unit,
+                self.convert_value_units,
+                self.convert_input_units,
+                self.rename_variable_column,
+            )
+        )
+    ###END def CriterionTargetRange.fingerprint
+
 
 ###END class CriterionTargetRange
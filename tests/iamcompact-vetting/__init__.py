@@ -5,7 +5,7 @@ import pyam
 import pandas as pd
 import numpy as np
 
-from iamcompact_vetting.pdhelpers import replace_level_values
+from iam_validation.pdhelpers import replace_level_values
 
 
 
@@ -155,3 +155,4 @@ def get_test_energy_iamdf_tuple() -> tuple[
         notnone(pyam.IamDataFrame(ratio_series))
     )
 ###END def construct_test_iamdf
+
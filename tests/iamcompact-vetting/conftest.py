@@ -0,0 +1,82 @@
+"""Shared pytest fixtures for the tests."""
+import typing as tp
+
+import numpy as np
+import pandas as pd
+import pyam
+import pytest
+
+
+
+def make_data_and_reference(
+        models: tp.Sequence[str] = ('model_a',),
+        scenarios: tp.Sequence[str] = ('scen_a', 'scen_b'),
+        regions: tp.Sequence[str] = ('region_a', 'region_b'),
+        variables: tp.Sequence[str] = ('variable_a',),
+        years: tp.Sequence[int] = (2020, 2030),
+        *,
+        value_range: tp.Optional[tuple[float, float]] = None,
+        nan_positions: tp.Sequence[int] = (),
+        reference_factor: float = 1.0,
+        reference_offset: float = 0.0,
+) -> tuple[pyam.IamDataFrame, pyam.IamDataFrame]:
+    """Make data to vet and a reference for TimeseriesRefCriterion tests.
+
+    The data has the full product of the given models, scenarios, regions,
+    variables and years, with unit `EJ/yr`. The reference is the data for
+    the first model and scenario, renamed to `ref_model` and `ref_scen`, and
+    multiplied by `reference_factor` before adding `reference_offset`.
+
+    Parameters
+    ----------
+    models, scenarios, regions, variables : sequence of str, optional
+        The values of each dimension of the data.
+    years : sequence of int, optional
+        The years of the data.
+    value_range : (float, float), optional
+        The first and last value of the data, with values spaced evenly in
+        between. Optional, by default 1.0, 2.0, 3.0, ...
+    nan_positions : sequence of int, optional
+        Positions of values to set to NaN. NaN values are dropped by pyam, so
+        the data will have no rows for them. Optional, by default none.
+    reference_factor : float, optional
+        Factor to multiply the reference values by. Optional, by default 1.0.
+    reference_offset : float, optional
+        Value to add to the reference values. Optional, by default 0.0.
+
+    Returns
+    -------
+    data, reference : (IamDataFrame, IamDataFrame)
+    """
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [list(models), list(scenarios), list(regions), list(variables),
+         ['EJ/yr'], list(years)],
+        names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+    )
+    values: np.ndarray = np.arange(1.0, len(index) + 1.0) \
+        if value_range is None \
+            else np.linspace(value_range[0], value_range[1], len(index))
+    values[list(nan_positions)] = np.nan
+    data = pyam.IamDataFrame(pd.Series(values, index=index, name='value'))
+    reference = pyam.IamDataFrame(
+        data.filter(model=models[0], scenario=scenarios[0])._data.rename(
+            index={models[0]: 'ref_model', scenarios[0]: 'ref_scen'}
+        ) * reference_factor + reference_offset
+    )
+    return data, reference
+###END def make_data_and_reference
+
+
+@pytest.fixture(scope='class')
+def data_and_reference(request: pytest.FixtureRequest) -> None:
+    """Set `data` and `reference` attributes on a test class.
+
+    The keyword arguments to `make_data_and_reference` are taken from the
+    `data_params` attribute of the test class. A class that defines its own
+    `reference` attribute keeps it.
+    """
+    data, reference = make_data_and_reference(**request.cls.data_params)
+    request.cls.data = data
+    if 'reference' not in vars(request.cls):
+        request.cls.reference = reference
+###END def data_and_reference
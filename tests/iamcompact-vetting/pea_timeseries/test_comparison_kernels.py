@@ -0,0 +1,133 @@
+"""Tests for the comparison kernel registry."""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.comparison_kernels import (
+    COMPARISON_KERNELS,
+    ComparisonKernel,
+    UnknownComparisonKernelError,
+    ZeroDivisionPolicy,
+    get_comparison_kernel,
+    register_comparison_kernel,
+)
+
+
+
+class TestComparisonKernels(unittest.TestCase):
+    """Tests for the built-in kernels and zero-division policies."""
+
+    ref = np.array([2.0, 0.0, 0.0, -4.0, np.nan])
+    data = np.array([3.0, 5.0, 0.0, -2.0, 1.0])
+
+    def test_kernel_values(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected: dict[str, np.ndarray] = {
+                'diff': self.data - self.ref,
+                'absdiff': np.abs(self.data - self.ref),
+                'ratio': np.array([1.5, np.inf, 1.0, 0.5, np.nan]),
+                'log_ratio': np.array(
+                    [np.log(1.5), np.inf, 0.0, np.log(0.5), np.nan]
+                ),
+                'pct_diff': np.array([50.0, np.inf, 0.0, -50.0, np.nan]),
+                'rel_diff': np.array([0.5, np.inf, 0.0, 0.5, np.nan]),
+            }
+        for _name, _expected in expected.items():
+            with self.subTest(kernel=_name):
+                np.testing.assert_allclose(
+                    get_comparison_kernel(_name)(self.ref, self.data),
+                    _expected,
+                )
+    ###END def TestComparisonKernels.test_kernel_values
+
+    def test_inputs_not_modified(self):
+        ref = self.ref.copy()
+        data = self.data.copy()
+        for _kernel in COMPARISON_KERNELS.values():
+            _kernel(ref, data)
+        np.testing.assert_array_equal(ref, self.ref)
+        np.testing.assert_array_equal(data, self.data)
+    ###END def TestComparisonKernels.test_inputs_not_modified
+
+    def test_zero_division_policy(self):
+        result = get_comparison_kernel('ratio')(
+            self.ref,
+            self.data,
+            ZeroDivisionPolicy(div_by_zero_value=43.0, zero_by_zero_value=-1.0),
+        )
+        np.testing.assert_array_equal(result[1:3], [43.0, -1.0])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ieee = get_comparison_kernel('ratio').bind(ZeroDivisionPolicy())(
+                self.ref,
+                self.data,
+            )
+        self.assertEqual(ieee[1], np.inf)
+        self.assertTrue(np.isnan(ieee[2]))
+    ###END def TestComparisonKernels.test_zero_division_policy
+
+    def test_registry(self):
+        with self.assertRaises(UnknownComparisonKernelError):
+            get_comparison_kernel('no_such_kernel')
+        with self.assertRaises(ValueError):
+            register_comparison_kernel(
+                ComparisonKernel('diff', lambda ref, data, _: data - ref)
+            )
+    ###END def TestComparisonKernels.test_registry
+
+###END class TestComparisonKernels
+
+
+class TestNamedKernelCriteria(unittest.TestCase):
+    """Tests for criteria with kernels selected by name."""
+
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['model_a'], ['scen_a', 'scen_b'], ['World'], ['Primary Energy'],
+         ['EJ/yr'], [2020, 2025]],
+        names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+    )
+    data = pyam.IamDataFrame(
+        pd.Series([1.0, 2.0, 0.0, 8.0], index=index, name='value')
+    )
+    reference = pyam.IamDataFrame(
+        pd.Series(
+            [1.0, 0.0],
+            index=index[:2].set_levels(['ref_model'], level='model'),
+            name='value',
+        )
+    )
+
+    def test_engines_agree(self):
+        for _name in ('log_ratio', 'pct_diff', 'rel_diff'):
+            with self.subTest(kernel=_name):
+                pyam_values = TimeseriesRefCriterion(
+                    'test_pyam', self.reference, _name,
+                ).compare(self.data)
+                dense_values = TimeseriesRefCriterion(
+                    'test_dense', self.reference, _name, engine='dense',
+                ).compare(self.data)
+                np.testing.assert_array_equal(
+                    pyam_values.sort_index().to_numpy(),
+                    dense_values.sort_index().to_numpy(),
+                )
+    ###END def TestNamedKernelCriteria.test_engines_agree
+
+    def test_criterion_zero_division(self):
+        criterion = TimeseriesRefCriterion(
+            'test_zero_division', self.reference, 'ratio',
+            zero_division=ZeroDivisionPolicy(
+                div_by_zero_value=-1.0, zero_by_zero_value=-2.0,
+            ),
+        )
+        values = criterion.compare(self.data).sort_index()
+        np.testing.assert_array_equal(values.to_numpy(), [1.0, -1.0, 0.0, -1.0])
+    ###END def TestNamedKernelCriteria.test_criterion_zero_division
+
+    def test_unknown_name(self):
+        with self.assertRaises(ValueError):
+            TimeseriesRefCriterion('test_unknown', self.reference, 'no_such')
+    ###END def TestNamedKernelCriteria.test_unknown_name
+
+###END class TestNamedKernelCriteria
@@ -0,0 +1,100 @@
+"""Tests for parallel evaluation of TimeseriesRefCriterion.get_values."""
+import concurrent.futures
+import multiprocessing
+import pickle
+import typing as tp
+import unittest
+
+import pandas as pd
+import pytest
+
+from iam_validation.criteria import TimeseriesRefCriterion
+
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestParallelGetValues(unittest.TestCase):
+    """Tests for `TimeseriesRefCriterion.get_values` with `n_jobs`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        models=('model_a', 'model_b', 'model_c', 'model_d'),
+        scenarios=('scen_a', 'scen_b', 'scen_c'),
+        variables=('variable_a', 'variable_b'),
+        years=(2020, 2025, 2030),
+        value_range=(1.0, 10.0),
+        reference_factor=1.1,
+    )
+
+    def setUp(self):
+        self.criterion = TimeseriesRefCriterion(
+            'test_parallel', self.reference, 'ratio', default_agg_dims='both',
+        )
+    ###END def TestParallelGetValues.setUp
+
+    def test_process_pool_matches_serial(self):
+        for _agg_dims in ('both', 'time', 'none'):
+            with self.subTest(agg_dims=_agg_dims):
+                pd.testing.assert_series_equal(
+                    self.criterion.get_values(
+                        self.data, agg_dims=_agg_dims, n_jobs=2,
+                    ),
+                    self.criterion.get_values(self.data, agg_dims=_agg_dims),
+                )
+    ###END def TestParallelGetValues.test_process_pool_matches_serial
+
+    def test_executor_matches_serial(self):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as _executor:
+            values = self.criterion.get_values(
+                self.data, n_jobs=3, executor=_executor,
+            )
+        pd.testing.assert_series_equal(
+            values,
+            self.criterion.get_values(self.data),
+        )
+    ###END def TestParallelGetValues.test_executor_matches_serial
+
+    def test_outer_and_reference_joins_match_serial(self):
+        # Drop one block, so that the broadcast model and scenario
+        # coordinates of the full data are not those of each partition.
+        data = self.data.filter(model='model_d', scenario='scen_c', keep=False)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as _executor:
+            for _joint_only in (True, False):
+                for _join in ('outer', 'reference'):
+                    with self.subTest(joint_only=_joint_only, join=_join):
+                        pd.testing.assert_series_equal(
+                            self.criterion.get_values(
+                                data, agg_dims='none', joint_only=_joint_only,
+                                join=_join, n_jobs=3, executor=_executor,
+                            ),
+                            self.criterion.get_values(
+                                data, agg_dims='none', joint_only=_joint_only,
+                                join=_join,
+                            ),
+                        )
+    ###END def TestParallelGetValues.test_outer_and_reference_joins_match_serial
+
+    def test_criterion_is_picklable(self):
+        unpickled = pickle.loads(pickle.dumps(self.criterion))
+        pd.testing.assert_series_equal(
+            unpickled.get_values(self.data),
+            self.criterion.get_values(self.data),
+        )
+    ###END def TestParallelGetValues.test_criterion_is_picklable
+
+    def test_explicit_mp_context(self):
+        pd.testing.assert_series_equal(
+            self.criterion.get_values(
+                self.data,
+                n_jobs=2,
+                mp_context=multiprocessing.get_context('spawn'),
+            ),
+            self.criterion.get_values(self.data),
+        )
+    ###END def TestParallelGetValues.test_explicit_mp_context
+
+    def test_invalid_n_jobs(self):
+        with self.assertRaises(ValueError):
+            self.criterion.get_values(self.data, n_jobs=0)
+    ###END def TestParallelGetValues.test_invalid_n_jobs
+
+###END class TestParallelGetValues
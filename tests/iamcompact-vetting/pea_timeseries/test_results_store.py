@@ -0,0 +1,197 @@
+"""Tests for incremental re-vetting with a results store."""
+import typing as tp
+import unittest
+import unittest.mock
+
+import pandas as pd
+import pyam
+import pytest
+
+from iam_validation.caching import BlockResultStore
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.timeseries_criteria_core import (
+    get_diff_comparison,
+    get_ratio_comparison,
+)
+from iam_validation.pyam_helpers import block_hashes
+
+
+
+def resubmit(data: pyam.IamDataFrame) -> pyam.IamDataFrame:
+    """Change the values of one model/scenario combination."""
+    s: pd.Series = data._data.copy()
+    s.loc['model_b', 'scen_c'] = s.loc['model_b', 'scen_c'].to_numpy() + 1.0
+    return pyam.IamDataFrame(s)
+###END def resubmit
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestBlockHashes(unittest.TestCase):
+    """Tests for `pyam_helpers.block_hashes`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        models=('model_a', 'model_b'),
+        scenarios=('scen_a', 'scen_b', 'scen_c'),
+        value_range=(1.0, 5.0),
+        reference_factor=2.0,
+    )
+
+    def test_only_changed_block_hash_changes(self):
+        hashes = block_hashes(self.data)
+        self.assertEqual(len(hashes), 6)
+        new_hashes = block_hashes(resubmit(self.data))
+        changed = hashes.index[hashes != new_hashes].to_list()
+        self.assertEqual(changed, [('model_b', 'scen_c')])
+        # Hashes do not depend on the other blocks in the data.
+        pd.testing.assert_series_equal(
+            block_hashes(self.data.filter(model='model_a')),
+            hashes.loc[['model_a']],
+            check_index=False,
+        )
+    ###END def TestBlockHashes.test_only_changed_block_hash_changes
+
+###END class TestBlockHashes
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestResultsStore(unittest.TestCase):
+    """Tests for `TimeseriesRefCriterion` with a `results_store`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        models=('model_a', 'model_b'),
+        scenarios=('scen_a', 'scen_b', 'scen_c'),
+        value_range=(1.0, 5.0),
+        reference_factor=2.0,
+    )
+
+    def test_recomputes_changed_blocks_only(self):
+        store = BlockResultStore()
+        criterion = TimeseriesRefCriterion(
+            'test_store', self.reference, 'ratio', default_agg_dims='time',
+            results_store=store,
+        )
+        plain = TimeseriesRefCriterion(
+            'test_plain', self.reference, 'ratio', default_agg_dims='time',
+        )
+        pd.testing.assert_series_equal(
+            criterion.get_values(self.data),
+            plain.get_values(self.data),
+        )
+        self.assertEqual((store.hits, store.misses, len(store)), (0, 6, 6))
+        resubmitted = resubmit(self.data)
+        with unittest.mock.patch.object(
+                criterion,
+                'compare',
+                wraps=criterion.compare,
+        ) as _compare:
+            values = criterion.get_values(resubmitted)
+        compared = _compare.call_args.args[0]
+        self.assertEqual(compared.model, ['model_b'])
+        self.assertEqual(compared.scenario, ['scen_c'])
+        self.assertEqual((store.hits, store.misses, len(store)), (5, 7, 6))
+        pd.testing.assert_series_equal(values, plain.get_values(resubmitted))
+    ###END def TestResultsStore.test_recomputes_changed_blocks_only
+
+    def test_arguments_and_reference_in_key(self):
+        store = BlockResultStore()
+        criterion = TimeseriesRefCriterion(
+            'test_key', self.reference, 'diff', results_store=store,
+        )
+        criterion.get_values(self.data, agg_dims='time')
+        criterion.get_values(self.data, agg_dims='both')
+        self.assertEqual(store.hits, 0)
+        criterion.reference = pyam.IamDataFrame(self.reference._data + 1.0)
+        values = criterion.get_values(self.data, agg_dims='both')
+        self.assertEqual(store.hits, 0)
+        pd.testing.assert_series_equal(
+            values,
+            criterion.get_values(
+                self.data, agg_dims='both', use_results_store=False,
+            ),
+        )
+    ###END def TestResultsStore.test_arguments_and_reference_in_key
+
+    def test_configuration_in_key(self):
+        store = BlockResultStore()
+        ratio = TimeseriesRefCriterion(
+            'test_shared', self.reference, 'ratio', default_agg_dims='time',
+            results_store=store,
+        )
+        diff = TimeseriesRefCriterion(
+            'test_shared', self.reference, 'diff', default_agg_dims='time',
+            results_store=store,
+        )
+        ratio.get_values(self.data)
+        values = diff.get_values(self.data)
+        self.assertEqual(store.hits, 0)
+        pd.testing.assert_series_equal(
+            values,
+            diff.get_values(self.data, use_results_store=False),
+        )
+    ###END def TestResultsStore.test_configuration_in_key
+
+    def test_comparison_closures_in_key(self):
+        store = BlockResultStore()
+        for _func in (get_diff_comparison(), get_ratio_comparison()):
+            criterion = TimeseriesRefCriterion(
+                'test_shared', self.reference, _func, default_agg_dims='time',
+                results_store=store,
+            )
+            pd.testing.assert_series_equal(
+                criterion.get_values(self.data),
+                criterion.get_values(self.data, use_results_store=False),
+            )
+        self.assertEqual(store.hits, 0)
+        criterion = TimeseriesRefCriterion(
+            'test_lambda', self.reference,
+            lambda _ref, _data: _data._data - 1.0,
+            default_agg_dims='time', results_store=store,
+        )
+        criterion.get_values(self.data)
+        self.assertEqual(len(store), 12)
+    ###END def TestResultsStore.test_comparison_closures_in_key
+
+    def test_single_broadcast_dim(self):
+        reference = pyam.IamDataFrame(
+            self.data.filter(model='model_a')._data.rename(
+                index={'model_a': 'ref_model'}
+            )
+        )
+        store = BlockResultStore()
+        criterion = TimeseriesRefCriterion(
+            'test_single_dim', reference, 'ratio', broadcast_dims=['model'],
+            default_agg_dims='time', results_store=store,
+        )
+        expected = criterion.get_values(self.data, use_results_store=False)
+        self.assertEqual(len(expected), 12)
+        pd.testing.assert_series_equal(criterion.get_values(self.data), expected)
+        self.assertEqual((store.misses, len(store)), (2, 2))
+        pd.testing.assert_series_equal(criterion.get_values(self.data), expected)
+        self.assertEqual(store.hits, 2)
+    ###END def TestResultsStore.test_single_broadcast_dim
+
+    def test_outer_and_reference_joins_bypass_store(self):
+        store = BlockResultStore()
+        criterion = TimeseriesRefCriterion(
+            'test_joins', self.reference, 'ratio', default_agg_dims='none',
+            results_store=store,
+        )
+        # Drop one block, so that the broadcast model and scenario
+        # coordinates of the full data are not those of each block.
+        data = self.data.filter(model='model_b', scenario='scen_c', keep=False)
+        for _joint_only in (True, False):
+            for _join in ('outer', 'reference'):
+                with self.subTest(joint_only=_joint_only, join=_join):
+                    pd.testing.assert_series_equal(
+                        criterion.get_values(
+                            data, joint_only=_joint_only, join=_join,
+                        ),
+                        criterion.get_values(
+                            data, joint_only=_joint_only, join=_join,
+                            use_results_store=False,
+                        ),
+                    )
+        self.assertEqual(len(store), 0)
+    ###END def TestResultsStore.test_outer_and_reference_joins_bypass_store
+
+###END class TestResultsStore
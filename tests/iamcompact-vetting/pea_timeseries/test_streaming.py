@@ -0,0 +1,87 @@
+"""Tests for streaming evaluation of TimeseriesRefCriterion."""
+import typing as tp
+import unittest
+
+import pandas as pd
+import pytest
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.streaming import (
+    stream_compare,
+    stream_values,
+)
+from iam_validation.pyam_helpers import iter_partitions
+
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestStreaming(unittest.TestCase):
+    """Tests for `stream_compare` and `stream_values`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        models=('model_a', 'model_b', 'model_c'),
+        years=(2020, 2025, 2030),
+        nan_positions=(5,),
+        reference_offset=1.0,
+    )
+
+    def setUp(self):
+        self.criterion = TimeseriesRefCriterion(
+            'test_streaming', self.reference, 'diff', default_agg_dims='both',
+        )
+    ###END def TestStreaming.setUp
+
+    def test_partitions_hold_complete_blocks(self):
+        partitions = list(iter_partitions(self.data, max_rows=15))
+        # The NaN value is dropped by pyam, so the first block has 5 rows.
+        self.assertEqual([len(_p._data) for _p in partitions], [11, 12, 12])
+        partitions = list(iter_partitions(self.data))
+        self.assertEqual(len(partitions), 6)
+        self.assertEqual(len(partitions[0].index), 1)
+        pd.testing.assert_series_equal(
+            pd.concat([_p._data for _p in partitions]).sort_index(),
+            self.data._data.sort_index(),
+        )
+    ###END def TestStreaming.test_partitions_hold_complete_blocks
+
+    def test_stream_matches_full_evaluation(self):
+        chunks = list(stream_values(self.criterion, self.data, max_rows=24))
+        self.assertEqual([_c.number for _c in chunks], [0, 1])
+        full_values = self.criterion.get_values(self.data)
+        pd.testing.assert_series_equal(
+            pd.concat([_c.values for _c in chunks]).sort_index(),
+            full_values.sort_index(),
+        )
+        compared = list(stream_compare(self.criterion, self.data))
+        full_compared = self.criterion.compare(self.data)
+        summary = compared[-1].summary
+        self.assertEqual(summary.count, full_compared.notna().sum())
+        self.assertEqual(summary.nan_count, full_compared.isna().sum())
+        self.assertAlmostEqual(summary.mean, full_compared.mean())
+        self.assertEqual(summary.max, full_compared.max())
+    ###END def TestStreaming.test_stream_matches_full_evaluation
+
+    def test_split_blocks_raise(self):
+        chunks = [
+            self.data.filter(year=2020),
+            self.data.filter(year=[2025, 2030]),
+        ]
+        with self.assertRaises(ValueError):
+            list(stream_compare(self.criterion, chunks))
+        chunks = [
+            self.data.filter(model='model_a'),
+            self.data.filter(model=['model_b', 'model_c']),
+        ]
+        self.assertEqual(len(list(stream_compare(self.criterion, chunks))), 2)
+    ###END def TestStreaming.test_split_blocks_raise
+
+    def test_outer_and_reference_joins_raise(self):
+        for _join in ('outer', 'reference'):
+            with self.subTest(join=_join):
+                with self.assertRaises(ValueError):
+                    list(stream_compare(self.criterion, self.data, join=_join))
+                with self.assertRaises(ValueError):
+                    list(stream_values(self.criterion, self.data, join=_join))
+    ###END def TestStreaming.test_outer_and_reference_joins_raise
+
+###END class TestStreaming
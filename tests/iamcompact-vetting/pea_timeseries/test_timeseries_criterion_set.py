@@ -0,0 +1,186 @@
+"""Tests for the TimeseriesCriterionSet class."""
+import typing as tp
+import unittest
+import unittest.mock
+
+import pandas as pd
+import pyam
+import pytest
+
+from iam_validation.criteria import (
+    TimeseriesCriterionSet,
+    TimeseriesRefCriterion,
+)
+from iam_validation.criteria import dense_comparison
+from iam_validation.criteria.timeseries_criteria_core import (
+    CompareEngine,
+    get_diff_comparison,
+    get_kernel_comparison,
+)
+
+
+
+def make_partial_reference() -> pyam.IamDataFrame:
+    """Make a reference with an index partially overlapping the data."""
+    ref_index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['ref_model'], ['ref_scen'], ['region_a'],
+         ['variable_a', 'variable_b'], ['TWh/yr'], [2020, 2025]],
+        names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+    )
+    return pyam.IamDataFrame(
+        pd.Series(
+            [0.0] + [1000.0] * (len(ref_index) - 1),
+            index=ref_index,
+            name='value',
+        )
+    )
+###END def make_partial_reference
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestTimeseriesCriterionSet(unittest.TestCase):
+    """Tests for `TimeseriesCriterionSet`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        models=('model_a', 'model_b'),
+        regions=('region_a',),
+        variables=('variable_a', 'variable_b'),
+        years=(2020, 2025, 2030),
+    )
+    reference = make_partial_reference()
+
+    def make_criteria(
+            self,
+            engine: CompareEngine = CompareEngine.DENSE,
+    ) -> list[TimeseriesRefCriterion]:
+        return [
+            TimeseriesRefCriterion(
+                f'test_{_func}', self.reference, _func,
+                default_agg_dims='both', engine=engine,
+            )
+            for _func in ('ratio', 'diff', 'absdiff')
+        ] + [
+            TimeseriesRefCriterion(
+                'test_callable', self.reference, get_diff_comparison(),
+                default_agg_dims='time',
+            )
+        ]
+    ###END def TestTimeseriesCriterionSet.make_criteria
+
+    def test_matches_separate_criteria(self):
+        for _engine in CompareEngine:
+            with self.subTest(engine=_engine):
+                self._check_matches_separate_criteria(
+                    self.make_criteria(_engine)
+                )
+    ###END def TestTimeseriesCriterionSet.test_matches_separate_criteria
+
+    def test_mixed_engines_match_separate_criteria(self):
+        criteria = self.make_criteria(CompareEngine.DENSE) + [
+            TimeseriesRefCriterion(
+                'test_pyam_ratio', self.reference, 'ratio',
+                engine=CompareEngine.PYAM,
+            ),
+            TimeseriesRefCriterion(
+                'test_pyam_kernel', self.reference,
+                get_kernel_comparison('diff'),
+            ),
+        ]
+        self._check_matches_separate_criteria(criteria)
+    ###END def TestTimeseriesCriterionSet.test_mixed_engines_match_separate_criteria
+
+    def _check_matches_separate_criteria(
+            self,
+            criteria: list[TimeseriesRefCriterion],
+    ):
+        criterion_set = TimeseriesCriterionSet(criteria)
+        for _joint_only, _join in (
+                (None, 'inner'),
+                (False, 'input'),
+                (False, 'inner'),
+        ):
+            compared = criterion_set.compare(
+                self.data, joint_only=_joint_only, join=_join,
+            )
+            values = criterion_set.get_values(
+                self.data, joint_only=_joint_only, join=_join,
+            )
+            self.assertEqual(
+                list(compared.keys()),
+                [_criterion.criterion_name for _criterion in criteria],
+            )
+            for _criterion in criteria:
+                pd.testing.assert_series_equal(
+                    compared[_criterion.criterion_name],
+                    _criterion.compare(
+                        self.data, joint_only=_joint_only, join=_join,
+                    ),
+                )
+                pd.testing.assert_series_equal(
+                    values[_criterion.criterion_name],
+                    _criterion.get_values(
+                        self.data, joint_only=_joint_only, join=_join,
+                    ),
+                )
+    ###END def TestTimeseriesCriterionSet._check_matches_separate_criteria
+
+    def test_aligns_once_per_reference(self):
+        criterion_set = TimeseriesCriterionSet(self.make_criteria())
+        with unittest.mock.patch.object(
+                dense_comparison.DenseReference,
+                'align',
+                autospec=True,
+                side_effect=dense_comparison.DenseReference.align,
+        ) as mock_align:
+            criterion_set.compare(self.data)
+        self.assertEqual(mock_align.call_count, 1)
+    ###END def TestTimeseriesCriterionSet.test_aligns_once_per_reference
+
+    def test_joins_once_per_reference_with_pyam_engine(self):
+        criteria = self.make_criteria(CompareEngine.PYAM)
+        criterion_set = TimeseriesCriterionSet(criteria)
+        with unittest.mock.patch.object(
+                TimeseriesRefCriterion,
+                '_join_reference',
+                autospec=True,
+                side_effect=TimeseriesRefCriterion._join_reference,
+        ) as mock_join, unittest.mock.patch.object(
+                dense_comparison.DenseReference,
+                'align',
+                autospec=True,
+                side_effect=dense_comparison.DenseReference.align,
+        ) as mock_align:
+            criterion_set.compare(self.data)
+        # `get_diff_comparison` also returns a kernel comparison, so all
+        # criteria share one join. The dense alignment must not be used for
+        # criteria with the pyam engine.
+        self.assertEqual(mock_join.call_count, 1)
+        self.assertEqual(mock_align.call_count, 0)
+    ###END def TestTimeseriesCriterionSet.test_joins_once_per_reference_with_pyam_engine
+
+    def test_groups_by_reference_content(self):
+        criteria = [
+            TimeseriesRefCriterion(
+                f'test_{_func}', make_partial_reference(), _func,
+                engine=CompareEngine.DENSE,
+            )
+            for _func in ('ratio', 'diff')
+        ]
+        criterion_set = TimeseriesCriterionSet(criteria)
+        with unittest.mock.patch.object(
+                dense_comparison.DenseReference,
+                'align',
+                autospec=True,
+                side_effect=dense_comparison.DenseReference.align,
+        ) as mock_align:
+            criterion_set.compare(self.data)
+        self.assertEqual(mock_align.call_count, 1)
+    ###END def TestTimeseriesCriterionSet.test_groups_by_reference_content
+
+    def test_duplicate_names_raise(self):
+        criteria = self.make_criteria()
+        with self.assertRaises(ValueError):
+            TimeseriesCriterionSet(criteria + criteria[:1])
+    ###END def TestTimeseriesCriterionSet.test_duplicate_names_raise
+
+###END class TestTimeseriesCriterionSet
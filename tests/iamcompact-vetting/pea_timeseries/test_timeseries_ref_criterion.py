@@ -0,0 +1,259 @@
+"""Tests for the engines and caches of TimeseriesRefCriterion."""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.timeseries_criteria_core import CompareEngine
+
+
+
+def make_unit_data_and_reference() -> tuple[
+        pyam.IamDataFrame,
+        pyam.IamDataFrame,
+]:
+    """Make data in `EJ/yr` and a reference for it in `TWh/yr`.
+
+    The reference values are 0.5 and 1.0 EJ/yr for 2020 and 2025.
+    """
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['model_a', 'model_b'], ['scen_a'], ['region_a'], ['variable_a'],
+         ['EJ/yr'], [2020, 2025]],
+        names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+    )
+    data = pyam.IamDataFrame(
+        pd.Series([1.0, 2.0, 3.0, 4.0], index=index, name='value')
+    )
+    ref_index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['ref_model'], ['ref_scen'], ['region_a'], ['variable_a'],
+         ['TWh/yr'], [2020, 2025]],
+        names=index.names,
+    )
+    reference = pyam.IamDataFrame(
+        pd.Series(
+            [0.5 * 1000.0 / 3.6, 1000.0 / 3.6],
+            index=ref_index,
+            name='value',
+        )
+    )
+    return data, reference
+###END def make_unit_data_and_reference
+
+
+class TestTimeseriesRefCriterionDenseEngine(unittest.TestCase):
+    """Test comparisons with the dense engine of TimeseriesRefCriterion."""
+
+    data, reference = make_unit_data_and_reference()
+
+    def test_dense_diff_comparisons(self):
+        criterion = TimeseriesRefCriterion(
+            criterion_name='test_dense_diff',
+            reference=self.reference,
+            comparison_function='diff',
+            engine=CompareEngine.DENSE,
+        )
+        np.testing.assert_allclose(
+            criterion.compare(self.data).to_numpy(),
+            [0.5, 1.0, 2.5, 3.0],
+        )
+    ###END def TestTimeseriesRefCriterionDenseEngine.test_dense_diff_comparisons
+
+    def test_dense_ratio_comparisons(self):
+        criterion = TimeseriesRefCriterion(
+            criterion_name='test_dense_ratio',
+            reference=self.reference,
+            comparison_function='ratio',
+            engine='dense',
+        )
+        np.testing.assert_allclose(
+            criterion.compare(self.data).to_numpy(),
+            [2.0, 2.0, 6.0, 4.0],
+        )
+    ###END def TestTimeseriesRefCriterionDenseEngine.test_dense_ratio_comparisons
+
+    def test_dense_engine_matches_pyam_engine(self):
+        index: pd.MultiIndex = pd.MultiIndex.from_product(
+            [['model_a', 'model_b'], ['scen_a', 'scen_b'], ['region_a'],
+             ['variable_a', 'variable_b'], ['EJ/yr'], [2020, 2025, 2030]],
+            names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+        )
+        data = pyam.IamDataFrame(
+            pd.Series(np.arange(1.0, len(index) + 1.0), index=index,
+                      name='value')
+        )
+        ref_index: pd.MultiIndex = pd.MultiIndex.from_product(
+            [['ref_model'], ['ref_scen'], ['region_a', 'region_b'],
+             ['variable_a', 'variable_c'], ['TWh/yr'], [2020, 2025]],
+            names=index.names,
+        )
+        reference = pyam.IamDataFrame(
+            pd.Series(
+                [0.0] + [1000.0] * (len(ref_index) - 1),
+                index=ref_index,
+                name='value',
+            )
+        )
+        for _func in ('ratio', 'diff', 'absdiff'):
+            for _joint_only, _join in ((True, 'inner'), (False, 'input')):
+                pd.testing.assert_series_equal(
+                    TimeseriesRefCriterion(
+                        'test_pyam', reference, _func,
+                    ).compare(data, joint_only=_joint_only, join=_join),
+                    TimeseriesRefCriterion(
+                        'test_dense', reference, _func, engine='dense',
+                    ).compare(data, joint_only=_joint_only, join=_join),
+                )
+    ###END def TestTimeseriesRefCriterionDenseEngine.test_dense_engine_matches_pyam_engine
+
+    def test_dense_engine_sorts_result(self):
+        index: pd.MultiIndex = pd.MultiIndex.from_product(
+            [['model_b', 'model_a'], ['scen_a'], ['region_a'],
+             ['variable_a'], ['EJ/yr'], [2020, 2025]],
+            names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+        )
+        data = pyam.IamDataFrame(
+            pd.Series([1.0, 2.0, 3.0, 4.0], index=index, name='value')
+        )
+        for _joint_only, _join in ((True, 'inner'), (False, 'input')):
+            dense_values: pd.Series = TimeseriesRefCriterion(
+                'test_dense', self.reference, 'ratio', engine='dense',
+            ).compare(data, joint_only=_joint_only, join=_join)
+            self.assertTrue(dense_values.index.is_monotonic_increasing)
+            pd.testing.assert_series_equal(
+                TimeseriesRefCriterion(
+                    'test_pyam', self.reference, 'ratio',
+                ).compare(
+                    data, joint_only=_joint_only, join=_join,
+                ).sort_index(),
+                dense_values,
+            )
+    ###END def TestTimeseriesRefCriterionDenseEngine.test_dense_engine_sorts_result
+
+    def test_dense_engine_requires_named_comparison(self):
+        with self.assertRaises(ValueError):
+            TimeseriesRefCriterion(
+                criterion_name='test_dense_callable',
+                reference=self.reference,
+                comparison_function=lambda df1, df2: pd.Series([1.0]),
+                engine='dense',
+            )
+    ###END def TestTimeseriesRefCriterionDenseEngine.test_dense_engine_requires_named_comparison
+
+###END class TestTimeseriesRefCriterionDenseEngine
+
+
+class TestTimeseriesRefCriterionCompactResults(unittest.TestCase):
+    """Test compact and float32 results from TimeseriesRefCriterion."""
+
+    data, reference = make_unit_data_and_reference()
+
+    def setUp(self):
+        self.criterion = TimeseriesRefCriterion(
+            criterion_name='test_compact',
+            reference=self.reference,
+            comparison_function='diff',
+            default_agg_dims='time',
+        )
+    ###END def TestTimeseriesRefCriterionCompactResults.setUp
+
+    def test_compact_compare(self):
+        pd.testing.assert_series_equal(
+            self.criterion.compare(self.data, compact=True),
+            self.criterion.compare(self.data),
+        )
+    ###END def TestTimeseriesRefCriterionCompactResults.test_compact_compare
+
+    def test_float32_values(self):
+        values32: pd.Series = self.criterion.get_values(
+            self.data,
+            float32=True,
+        )
+        self.assertEqual(values32.dtype, np.float32)
+        np.testing.assert_allclose(
+            values32.to_numpy(),
+            self.criterion.get_values(self.data).to_numpy(),
+            rtol=1e-6,
+        )
+    ###END def TestTimeseriesRefCriterionCompactResults.test_float32_values
+
+###END class TestTimeseriesRefCriterionCompactResults
+
+
+class TestTimeseriesRefCriterionReferenceIndex(unittest.TestCase):
+    """Test caching of the reference index of TimeseriesRefCriterion."""
+
+    data, reference = make_unit_data_and_reference()
+
+    def test_reference_index_reused(self):
+        criterion = TimeseriesRefCriterion(
+            criterion_name='test_reference_index',
+            reference=self.reference,
+            comparison_function='diff',
+            engine='dense',
+        )
+        reference_index = criterion.reference_index
+        self.assertIs(reference_index.data, self.reference._data)
+        criterion.compare(self.data)
+        criterion.compare(self.data)
+        self.assertIs(criterion.reference_index, reference_index)
+        self.assertIs(criterion.reference_index.dense, reference_index.dense)
+    ###END def TestTimeseriesRefCriterionReferenceIndex.test_reference_index_reused
+
+    def test_reference_index_invalidated(self):
+        criterion = TimeseriesRefCriterion(
+            criterion_name='test_reference_index',
+            reference=self.reference.copy(),
+            comparison_function='diff',
+        )
+        reference_index = criterion.reference_index
+        criterion.reference = self.reference.copy()
+        self.assertIsNot(criterion.reference_index, reference_index)
+        reference_index = criterion.reference_index
+        criterion.reference.filter(year=[2020], keep=False, inplace=True)
+        self.assertIsNot(criterion.reference_index, reference_index)
+        self.assertNotIn(
+            2020,
+            criterion.reference_index.coordinates['year'],
+        )
+    ###END def TestTimeseriesRefCriterionReferenceIndex.test_reference_index_invalidated
+
+    def test_reference_cache(self):
+        index: pd.MultiIndex = pd.MultiIndex.from_product(
+            [['model_a', 'model_b'], ['scen_a'], ['region_a'],
+             ['variable_a', 'variable_b'], ['EJ/yr'], [2020, 2025]],
+            names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+        )
+        data = pyam.IamDataFrame(
+            pd.Series(np.arange(1.0, len(index) + 1.0), index=index,
+                      name='value')
+        )
+        reference = pyam.IamDataFrame(
+            data.filter(model='model_a')._data.rename(
+                index={'model_a': 'ref_model', 'scen_a': 'ref_scen'}
+            ) * 2.0
+        )
+        criterion = TimeseriesRefCriterion(
+            'test_reference_cache', reference.copy(), 'diff',
+            reference_cache_nbytes=10**7,
+        )
+        reference_cache = criterion.reference_cache
+        assert reference_cache is not None
+        first = criterion.compare(data)
+        second = criterion.compare(data)
+        pd.testing.assert_series_equal(first, second)
+        pd.testing.assert_series_equal(
+            first,
+            TimeseriesRefCriterion('test_uncached', reference, 'diff') \
+                .compare(data),
+        )
+        self.assertEqual(reference_cache.stats.hits, 1)
+        self.assertEqual(reference_cache.stats.misses, 1)
+        criterion.compare(data, filter={'year': [2020]})
+        self.assertEqual(reference_cache.stats.entries, 2)
+        criterion.reference = reference
+        self.assertEqual(reference_cache.stats.entries, 0)
+    ###END def TestTimeseriesRefCriterionReferenceIndex.test_reference_cache
+
+###END class TestTimeseriesRefCriterionReferenceIndex
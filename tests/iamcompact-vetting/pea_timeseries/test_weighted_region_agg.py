@@ -0,0 +1,128 @@
+"""Tests for weighted region aggregation in TimeseriesRefCriterion."""
+import typing as tp
+import unittest
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.timeseries_criteria_core import (
+    AggDims,
+    MissingRegionWeightsError,
+    WeightedRegionAgg,
+)
+
+
+
+def weighted_mean_per_group(
+        s: pd.Series,
+        weights: pd.Series,
+) -> pd.Series:
+    """Weighted mean over regions, computed one group at a time."""
+    def _weighted_mean(g: pd.Series) -> float:
+        _weights = weights.reindex(g.index.get_level_values('region')) \
+            .to_numpy()
+        _valid = ~np.isnan(g.to_numpy())
+        return float(
+            np.sum(g.to_numpy()[_valid] * _weights[_valid])
+            / np.sum(_weights[_valid])
+        )
+    return s.groupby(
+        [_name for _name in s.index.names if _name != 'region']
+    ).agg(_weighted_mean)
+###END def weighted_mean_per_group
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestWeightedRegionAgg(unittest.TestCase):
+    """Tests for `WeightedRegionAgg`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        regions=('region_a', 'region_b', 'region_c'),
+        nan_positions=(3,),
+        reference_factor=2.0,
+    )
+    weights = pd.Series(
+        [1.0, 2.0, 5.0],
+        index=pd.Index(['region_a', 'region_b', 'region_c'], name='region'),
+    )
+
+    def make_criterion(self, region_agg, **kwargs) -> TimeseriesRefCriterion:
+        return TimeseriesRefCriterion(
+            criterion_name='test_criterion',
+            reference=self.reference,
+            comparison_function='ratio',
+            region_agg=region_agg,
+            **kwargs,
+        )
+    ###END def TestWeightedRegionAgg.make_criterion
+
+    def test_weighted_mean_matches_per_group(self):
+        criterion = self.make_criterion(WeightedRegionAgg(self.weights))
+        compared = criterion.compare(self.data)
+        result = criterion.get_values(self.data, agg_dims=AggDims.REGION)
+        expected = weighted_mean_per_group(compared, self.weights)
+        pd.testing.assert_series_equal(
+            result,
+            expected.reorder_levels(result.index.names),
+            check_names=False,
+        )
+    ###END def TestWeightedRegionAgg.test_weighted_mean_matches_per_group
+
+    def test_weighted_sum_and_time_aggregation(self):
+        criterion = self.make_criterion(WeightedRegionAgg(self.weights, 'sum'))
+        compared = criterion.compare(self.data).fillna(0.0)
+        result = criterion.get_values(
+            self.data,
+            agg_dims=AggDims.TIME_AND_REGION,
+        )
+        expected = (
+            compared * self.weights.reindex(
+                compared.index.get_level_values('region')
+            ).to_numpy()
+        ).groupby(['model', 'scenario', 'variable']).sum() / 2.0
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+    ###END def TestWeightedRegionAgg.test_weighted_sum_and_time_aggregation
+
+    def test_weights_by_region_and_year(self):
+        weights = pd.Series(
+            [1.0, 1.0, 1.0, 1.0, 0.0, 3.0],
+            index=pd.MultiIndex.from_product(
+                [['region_a', 'region_b', 'region_c'], [2020, 2030]],
+                names=['region', 'year'],
+            ),
+        )
+        criterion = self.make_criterion(WeightedRegionAgg(weights))
+        compared = criterion.compare(self.data)
+        result = criterion.get_values(self.data, agg_dims=AggDims.REGION)
+        self.assertAlmostEqual(
+            result.loc[('model_a', 'scen_b', 'variable_a', 'EJ/yr', 2030)],
+            # The reference has no value for region_b in 2030.
+            np.average(
+                compared.xs(('scen_b', 2030), level=('scenario', 'year')),
+                weights=[1.0, 3.0],
+            ),
+        )
+        time_first = self.make_criterion(
+            WeightedRegionAgg(weights),
+            agg_dim_order='time_first',
+        )
+        with self.assertRaises(ValueError):
+            time_first.get_values(self.data, agg_dims=AggDims.TIME_AND_REGION)
+    ###END def TestWeightedRegionAgg.test_weights_by_region_and_year
+
+    def test_missing_weights_raise(self):
+        criterion = self.make_criterion(
+            WeightedRegionAgg(self.weights.iloc[:2])
+        )
+        with self.assertRaises(MissingRegionWeightsError):
+            criterion.get_values(self.data, agg_dims=AggDims.REGION)
+    ###END def TestWeightedRegionAgg.test_missing_weights_raise
+
+    def test_invalid_func(self):
+        with self.assertRaises(ValueError):
+            WeightedRegionAgg(self.weights, 'median')
+    ###END def TestWeightedRegionAgg.test_invalid_func
+
+###END class TestWeightedRegionAgg
@@ -0,0 +1,178 @@
+"""Tests for the targets.batch_evaluation module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+from pathways_ensemble_analysis.criteria.base import (
+    SingleVariableCriterion,
+    ChangeOverTimeCriterion,
+)
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.targets import (
+    BatchEvaluationResult,
+    evaluate_target_ranges,
+)
+from iam_validation.targets.batch_evaluation import (
+    UnsupportedBatchCriterionError,
+)
+from iam_validation.targets.target_classes import (
+    CriterionTargetRange,
+    RelativeRange,
+)
+
+
+
+def make_vetting_data() -> pyam.IamDataFrame:
+    """Make data with emissions and energy for three scenarios."""
+    return pyam.IamDataFrame(pd.DataFrame(
+        [
+            ['m1', 's1', 'World', 'Emissions|CO2', 'Mt CO2/yr', 2010, 30000.0],
+            ['m1', 's1', 'World', 'Emissions|CO2', 'Mt CO2/yr', 2020, 36000.0],
+            ['m1', 's1', 'World', 'Primary Energy', 'EJ/yr', 2020, 580.0],
+            ['m1', 's1', 'Europe', 'Primary Energy', 'EJ/yr', 2020, 80.0],
+            ['m1', 's2', 'World', 'Emissions|CO2', 'Gt CO2/yr', 2010, 30.0],
+            ['m1', 's2', 'World', 'Emissions|CO2', 'Gt CO2/yr', 2020, 51.0],
+            ['m1', 's2', 'World', 'Primary Energy', 'EJ/yr', 2020, 300.0],
+            ['m2', 's1', 'World', 'Emissions|CO2', 'Mt CO2/yr', 2020, 40000.0],
+            ['m2', 's3', 'Europe', 'Primary Energy', 'EJ/yr', 2020, 90.0],
+        ],
+        columns=['model', 'scenario', 'region', 'variable', 'unit', 'year',
+                 'value'],
+    ))
+###END def make_vetting_data
+
+
+def make_vetting_targets() -> list[CriterionTargetRange]:
+    """Make targets with single-variable and change-over-time criteria."""
+    return [
+        CriterionTargetRange(
+            criterion=SingleVariableCriterion(
+                criterion_name='CO2 2020',
+                region='World',
+                year=2020,
+                variable='Emissions|CO2',
+                unit='Mt CO2/yr',
+            ),
+            target=40000.0,
+            unit='Mt CO2/yr',
+            range=RelativeRange(0.8, 1.2),
+        ),
+        CriterionTargetRange(
+            criterion=ChangeOverTimeCriterion(
+                criterion_name='CO2 2010-2020 change',
+                region='World',
+                year=2020,
+                reference_year=2010,
+                variable='Emissions|CO2',
+            ),
+            target=0.25,
+            range=(0.0, 0.5),
+        ),
+        CriterionTargetRange(
+            criterion=SingleVariableCriterion(
+                criterion_name='Primary Energy 2020',
+                region='World',
+                year=2020,
+                variable='Primary Energy',
+                unit='EJ/yr',
+            ),
+            target=578.0,
+            unit='EJ/yr',
+            range=RelativeRange(0.8, 1.2),
+        ),
+    ]
+###END def make_vetting_targets
+
+
+class TestEvaluateTargetRanges(unittest.TestCase):
+    """Tests for `evaluate_target_ranges`."""
+
+    def test_values_and_in_range(self):
+        data = make_vetting_data()
+        result = evaluate_target_ranges(make_vetting_targets(), data)
+        self.assertIsInstance(result, BatchEvaluationResult)
+        self.assertEqual(
+            list(result.values.index),
+            [('m1', 's1'), ('m1', 's2'), ('m2', 's1'), ('m2', 's3')],
+        )
+        np.testing.assert_allclose(
+            result.values.to_numpy(),
+            [
+                [36000.0, 0.2, 580.0],
+                [51000.0, 0.7, 300.0],
+                [40000.0, np.nan, np.nan],
+                [np.nan, np.nan, np.nan],
+            ],
+        )
+        self.assertEqual(
+            result.in_range.astype(object).where(
+                result.in_range.notna(), None
+            ).values.tolist(),
+            [
+                [True, True, True],
+                [False, False, False],
+                [True, None, None],
+                [None, None, None],
+            ],
+        )
+        self.assertTrue((result.in_range.dtypes == 'boolean').all())
+    ###END def TestEvaluateTargetRanges.test_values_and_in_range
+
+    def test_matches_separate_evaluation(self):
+        data = make_vetting_data()
+        targets = make_vetting_targets()
+        result = evaluate_target_ranges(targets, data)
+        for _target in targets:
+            _values = result.values[_target.name]
+            pd.testing.assert_series_equal(
+                result.distances[_target.name],
+                _target.distances_from_values(_values),
+            )
+            pd.testing.assert_series_equal(
+                result.in_range[_target.name],
+                _target.values_in_range(_values),
+            )
+    ###END def TestEvaluateTargetRanges.test_matches_separate_evaluation
+
+    def test_fallback_for_unsupported_targets(self):
+        data = make_vetting_data()
+        reference = pyam.IamDataFrame(pd.DataFrame(
+            [['ref', 'ref', 'World', 'Primary Energy', 'EJ/yr', 2020, 578.0]],
+            columns=['model', 'scenario', 'region', 'variable', 'unit',
+                     'year', 'value'],
+        ))
+        ratio_target = CriterionTargetRange(
+            TimeseriesRefCriterion(
+                criterion_name='Primary Energy ratio',
+                reference=reference,
+                comparison_function='ratio',
+                default_agg_dims='both',
+            ),
+            target=1.0,
+            range=(0.8, 1.2),
+        )
+        result = evaluate_target_ranges([ratio_target], data)
+        separate_values = ratio_target.get_values(data)
+        separate_values.index = separate_values.index.droplevel(
+            [_name for _name in separate_values.index.names
+             if _name not in ('model', 'scenario')]
+        )
+        pd.testing.assert_series_equal(
+            result.values[ratio_target.name],
+            separate_values.reindex(result.values.index),
+            check_names=False,
+        )
+        self.assertTrue(np.isnan(result.values[ratio_target.name].iloc[-1]))
+        with self.assertRaises(UnsupportedBatchCriterionError):
+            evaluate_target_ranges([ratio_target], data, fallback=False)
+    ###END def TestEvaluateTargetRanges.test_fallback_for_unsupported_targets
+
+    def test_duplicate_names_raise(self):
+        targets = make_vetting_targets()
+        with self.assertRaises(ValueError):
+            evaluate_target_ranges(targets + targets[:1], make_vetting_data())
+    ###END def TestEvaluateTargetRanges.test_duplicate_names_raise
+
+###END class TestEvaluateTargetRanges
@@ -0,0 +1,60 @@
+"""Tests for the caching module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from iam_validation.caching import (
+    ByteSizeLRUCache,
+    fingerprint,
+    series_nbytes,
+)
+
+
+
+class TestByteSizeLRUCache(unittest.TestCase):
+    """Tests for `ByteSizeLRUCache`."""
+
+    def test_eviction_and_stats(self):
+        cache: ByteSizeLRUCache[bytes] = ByteSizeLRUCache(10, sizeof=len)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        self.assertEqual(cache.get('a'), b'aaaa')
+        cache.put('c', b'cccc')
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertIsNone(cache.get('b'))
+        cache.put('d', b'd'*11)
+        self.assertNotIn('d', cache)
+        stats = cache.stats
+        self.assertEqual(
+            (stats.hits, stats.misses, stats.evictions, stats.entries,
+             stats.nbytes),
+            (1, 1, 1, 2, 8),
+        )
+        cache.clear()
+        self.assertEqual(cache.stats.entries, 0)
+        self.assertEqual(cache.stats.nbytes, 0)
+    ###END def TestByteSizeLRUCache.test_eviction_and_stats
+
+    def test_replace_existing_key(self):
+        cache: ByteSizeLRUCache[pd.Series] = ByteSizeLRUCache(10**6)
+        s = pd.Series(np.arange(10.0))
+        cache.put('a', s)
+        cache.put('a', s.iloc[:5])
+        self.assertEqual(cache.stats.nbytes, series_nbytes(s.iloc[:5]))
+        self.assertEqual(len(cache), 1)
+    ###END def TestByteSizeLRUCache.test_replace_existing_key
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint([('model', ['a', 'b']), None]),
+            fingerprint([('model', ['a', 'b']), None]),
+        )
+        self.assertNotEqual(
+            fingerprint([('model', ['a', 'b'])]),
+            fingerprint([('model', ['a', 'c'])]),
+        )
+    ###END def TestByteSizeLRUCache.test_fingerprint
+
+###END class TestByteSizeLRUCache
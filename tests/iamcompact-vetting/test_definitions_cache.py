@@ -0,0 +1,90 @@
+"""Tests for the on-disk cache of parsed definitions."""
+from pathlib import Path
+import tempfile
+import unittest
+import unittest.mock
+
+from iam_validation.nomenclature import definitions_cache
+from iam_validation.nomenclature import multi_load
+from iam_validation.nomenclature.multi_load import read_multi_definitions
+
+
+
+def write_definitions(root: Path, variables: list[str]) -> Path:
+    """Write a minimal definitions directory, and return its path."""
+    definitions: Path = root / 'definitions'
+    (definitions / 'variable').mkdir(parents=True, exist_ok=True)
+    (definitions / 'region').mkdir(parents=True, exist_ok=True)
+    (definitions / 'variable' / 'variables.yaml').write_text(
+        ''.join(f'- {_var}:\n    unit: EJ/yr\n' for _var in variables)
+    )
+    (definitions / 'region' / 'regions.yaml').write_text(
+        '- World:\n  - World\n- Countries:\n  - Norway\n  - Sweden\n'
+    )
+    return definitions
+###END def write_definitions
+
+
+class TestDefinitionsCache(unittest.TestCase):
+    """Tests for `read_multi_definitions` with a cache directory."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = Path(self.tmpdir.name)
+        self.cache_dir = self.root / 'cache'
+        self.paths = [
+            write_definitions(self.root / 'first', ['Primary Energy']),
+            write_definitions(self.root / 'second', ['Final Energy']),
+        ]
+    ###END def TestDefinitionsCache.setUp
+
+    def test_second_load_is_read_from_cache(self):
+        dsd, individual = read_multi_definitions(
+            self.paths,
+            return_individual_dsds=True,
+            cache_dir=self.cache_dir,
+        )
+        with unittest.mock.patch.object(
+                multi_load,
+                '_load_single_path_definitions',
+                side_effect=AssertionError('definitions should not be parsed'),
+        ):
+            cached_dsd, cached_individual = read_multi_definitions(
+                self.paths,
+                return_individual_dsds=True,
+                cache_dir=self.cache_dir,
+            )
+        self.assertIsInstance(cached_dsd, multi_load.MergedDataStructureDefinition)
+        # The codelists are stored merged, and not merged again on access.
+        self.assertEqual(cached_dsd._source_codelists, {})
+        self.assertEqual(
+            list(cached_dsd.variable.mapping),
+            list(dsd.variable.mapping),
+        )
+        self.assertEqual(
+            list(cached_dsd.region.mapping),
+            list(dsd.region.mapping),
+        )
+        self.assertEqual(len(cached_individual), len(individual))
+    ###END def TestDefinitionsCache.test_second_load_is_read_from_cache
+
+    def test_changed_files_are_reloaded(self):
+        read_multi_definitions(self.paths, cache_dir=self.cache_dir)
+        write_definitions(self.root / 'second', ['Final Energy', 'Emissions'])
+        dsd = read_multi_definitions(self.paths, cache_dir=self.cache_dir)
+        self.assertIn('Emissions', dsd.variable.mapping)
+        self.assertEqual(len(list(self.cache_dir.glob('*.pkl'))), 2)
+    ###END def TestDefinitionsCache.test_changed_files_are_reloaded
+
+    def test_corrupt_cache_file_is_rebuilt(self):
+        read_multi_definitions(self.paths, cache_dir=self.cache_dir)
+        cache_file: Path = next(self.cache_dir.glob('*.pkl'))
+        cache_file.write_bytes(b'not a pickle')
+        with self.assertLogs(definitions_cache.logger, level='WARNING'):
+            dsd = read_multi_definitions(self.paths, cache_dir=self.cache_dir)
+        self.assertIn('Primary Energy', dsd.variable.mapping)
+        self.assertNotEqual(cache_file.read_bytes(), b'not a pickle')
+    ###END def TestDefinitionsCache.test_corrupt_cache_file_is_rebuilt
+
+###END class TestDefinitionsCache
@@ -0,0 +1,106 @@
+"""Tests for the targets.drop_conditions module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from iam_validation.targets.drop_conditions import (
+    CompiledDropConditions,
+    DropMode,
+    InvalidDropConditionError,
+)
+
+
+
+DROP_CONDITIONS: dict[str, dict] = {
+    'a': {'mode': 'outside', 'value': [1.0, 2.0]},
+    'b': {'mode': '<=', 'value': 0},
+    'c': {'mode': '>=', 'value': 10.0},
+    'd': {'mode': 'inside', 'value': [5.0, 6.0]},
+}
+
+
+def reference_drop(
+        value_matrix: pd.DataFrame,
+        drop_conditions: dict[str, dict],
+) -> pd.Series:
+    """Row-by-row drop mask with the semantics of pea `filter_values`."""
+    drop = pd.Series(False, index=value_matrix.index)
+    for _criterion, _condition in drop_conditions.items():
+        _values = value_matrix[_criterion]
+        _mode, _value = _condition['mode'], _condition['value']
+        if _mode == '<=':
+            drop |= _values <= _value
+        elif _mode == '>=':
+            drop |= _values >= _value
+        elif _mode == 'inside':
+            drop |= (_values >= _value[0]) & (_values <= _value[1])
+        else:
+            drop |= (_values <= _value[0]) | (_values >= _value[1])
+    return drop
+###END def reference_drop
+
+
+class TestCompiledDropConditions(unittest.TestCase):
+    """Tests for `CompiledDropConditions`."""
+
+    def test_matches_row_by_row_evaluation(self):
+        rng = np.random.default_rng(1)
+        value_matrix = pd.DataFrame(
+            rng.uniform(-2.0, 12.0, size=(200, 4)),
+            columns=list(DROP_CONDITIONS.keys()),
+        )
+        value_matrix.iloc[::7, 0] = np.nan
+        value_matrix.iloc[3, :] = [1.0, 0.0, 10.0, 5.0]
+        result = CompiledDropConditions(DROP_CONDITIONS).evaluate(value_matrix)
+        pd.testing.assert_series_equal(
+            result.drop,
+            reference_drop(value_matrix, DROP_CONDITIONS),
+            check_names=False,
+        )
+        self.assertTrue(result.conditions.iloc[3].all())
+        self.assertEqual(result.reason.iloc[3], 'a')
+        self.assertTrue(result.reason[~result.drop].isna().all())
+    ###END def TestCompiledDropConditions.test_matches_row_by_row_evaluation
+
+    def test_reason_is_first_failing_condition(self):
+        value_matrix = pd.DataFrame(
+            {'a': [1.5, 1.5, 0.0, np.nan],
+             'b': [1.0, 1.0, 1.0, np.nan],
+             'c': [20.0, 0.0, 0.0, np.nan],
+             'd': [5.5, 5.5, 0.0, np.nan]},
+            index=['s1', 's2', 's3', 's4'],
+        )
+        result = CompiledDropConditions(DROP_CONDITIONS).evaluate(value_matrix)
+        self.assertEqual(list(result.drop), [True, True, True, False])
+        self.assertEqual(list(result.reason.iloc[:3]), ['c', 'd', 'a'])
+        self.assertTrue(pd.isna(result.reason.iloc[3]))
+    ###END def TestCompiledDropConditions.test_reason_is_first_failing_condition
+
+    def test_invalid_conditions_raise(self):
+        with self.assertRaises(InvalidDropConditionError):
+            CompiledDropConditions({'a': {'mode': '<', 'value': 1.0}})
+        with self.assertRaises(InvalidDropConditionError):
+            CompiledDropConditions({'a': {'mode': 'outside', 'value': 1.0}})
+        with self.assertRaises(InvalidDropConditionError):
+            CompiledDropConditions({'a': {'mode': '>=', 'value': [1.0, 2.0]}})
+        with self.assertRaises(InvalidDropConditionError):
+            CompiledDropConditions({'a': {'value': 1.0}})
+        with self.assertRaises(InvalidDropConditionError):
+            CompiledDropConditions({'a': {'mode': '>='}})
+    ###END def TestCompiledDropConditions.test_invalid_conditions_raise
+
+    def test_to_dict_and_combine(self):
+        compiled = CompiledDropConditions(DROP_CONDITIONS)
+        self.assertEqual(compiled.modes[3], DropMode.INSIDE)
+        roundtrip = CompiledDropConditions(compiled.to_dict())
+        np.testing.assert_array_equal(roundtrip.le, compiled.le)
+        np.testing.assert_array_equal(roundtrip.inside_hi, compiled.inside_hi)
+        combined = CompiledDropConditions({'a': DROP_CONDITIONS['a']}) \
+            + CompiledDropConditions({'b': DROP_CONDITIONS['b']})
+        self.assertEqual(combined.criteria, ('a', 'b'))
+        with self.assertRaises(ValueError):
+            compiled + compiled
+    ###END def TestCompiledDropConditions.test_to_dict_and_combine
+
+###END class TestCompiledDropConditions
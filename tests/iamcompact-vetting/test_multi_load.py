@@ -0,0 +1,201 @@
+"""Tests for loading definitions from multiple directories."""
+import copy
+from pathlib import Path
+import pickle
+import tempfile
+import threading
+import typing as tp
+import unittest
+import unittest.mock
+
+from nomenclature import RegionProcessor
+
+from iam_validation.nomenclature import multi_load
+from iam_validation.nomenclature.multi_load import (
+    MergedDataStructureDefinition,
+    read_multi_definitions,
+    read_multi_region_processors,
+)
+
+
+
+def write_project(root: Path, variables: list[str], model: str) -> Path:
+    """Write definitions and a region mapping for one model under `root`."""
+    (root / 'definitions' / 'variable').mkdir(parents=True, exist_ok=True)
+    (root / 'definitions' / 'region').mkdir(parents=True, exist_ok=True)
+    (root / 'mappings').mkdir(parents=True, exist_ok=True)
+    (root / 'definitions' / 'variable' / 'variables.yaml').write_text(
+        ''.join(f'- {_var}:\n    unit: EJ/yr\n' for _var in variables)
+    )
+    (root / 'definitions' / 'region' / 'regions.yaml').write_text(
+        '- World:\n  - World\n- Countries:\n  - Norway\n  - Sweden\n'
+    )
+    (root / 'mappings' / f'{model}.yaml').write_text(
+        f'model: {model}\nnative_regions:\n  - Norway\n  - Sweden\n'
+    )
+    return root
+###END def write_project
+
+
+class TestParallelMultiLoad(unittest.TestCase):
+    """Tests for `read_multi_definitions` and `read_multi_region_processors`
+    with `n_jobs`."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = Path(self.tmpdir.name)
+        self.projects = [
+            write_project(root / 'first', ['Primary Energy'], 'model_a'),
+            write_project(root / 'second', ['Final Energy'], 'model_b'),
+            write_project(root / 'third', ['Primary Energy', 'Emissions'],
+                          'model_c'),
+        ]
+        self.paths = [_project / 'definitions' for _project in self.projects]
+    ###END def TestParallelMultiLoad.setUp
+
+    def test_parallel_definitions_match_sequential(self):
+        dsd, individual = read_multi_definitions(
+            self.paths,
+            return_individual_dsds=True,
+        )
+        with self.assertLogs(multi_load.logger, level='INFO') as _logs:
+            parallel_dsd, parallel_individual = read_multi_definitions(
+                self.paths,
+                return_individual_dsds=True,
+                n_jobs=-1,
+            )
+        self.assertEqual(
+            list(parallel_dsd.variable.mapping),
+            list(dsd.variable.mapping),
+        )
+        self.assertEqual(
+            list(parallel_dsd.region.mapping),
+            list(dsd.region.mapping),
+        )
+        self.assertEqual(
+            [list(_dsd.variable.mapping) for _dsd in parallel_individual],
+            [list(_dsd.variable.mapping) for _dsd in individual],
+        )
+        # One timing per path, in the order of `paths`.
+        path_messages: list[str] = [
+            _message for _message in _logs.output
+            if 'Loaded definitions from' in _message
+        ]
+        self.assertEqual(len(path_messages), len(self.paths))
+        for _path, _message in zip(self.paths, path_messages):
+            self.assertIn(str(_path), _message)
+    ###END def TestParallelMultiLoad.test_parallel_definitions_match_sequential
+
+    def test_parallel_region_processors(self):
+        dsd, individual = read_multi_definitions(
+            self.paths,
+            return_individual_dsds=True,
+        )
+        region_processor = read_multi_region_processors(
+            [_project / 'mappings' for _project in self.projects],
+            individual,
+            merged_dsd=dsd,
+            n_jobs=2,
+        )
+        self.assertIsInstance(region_processor, RegionProcessor)
+        self.assertEqual(
+            sorted(region_processor.mappings),
+            ['model_a', 'model_b', 'model_c'],
+        )
+        # A single definition object is shared by all paths.
+        shared_processor = read_multi_region_processors(
+            [_project / 'mappings' for _project in self.projects],
+            dsd,
+            merged_dsd=dsd,
+            n_jobs=2,
+        )
+        self.assertEqual(
+            sorted(shared_processor.mappings),
+            ['model_a', 'model_b', 'model_c'],
+        )
+    ###END def TestParallelMultiLoad.test_parallel_region_processors
+
+    def test_invalid_n_jobs(self):
+        with self.assertRaises(ValueError):
+            read_multi_definitions(self.paths, n_jobs=0)
+    ###END def TestParallelMultiLoad.test_invalid_n_jobs
+
+###END class TestParallelMultiLoad
+
+
+class TestLazyCodelists(unittest.TestCase):
+    """Tests for lazy merging of codelists in
+    `MergedDataStructureDefinition`."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = Path(self.tmpdir.name)
+        _, self.definitions = read_multi_definitions(
+            [
+                write_project(root / 'first', ['Primary Energy'], 'model_a')
+                    / 'definitions',
+                write_project(root / 'second', ['Final Energy'], 'model_b')
+                    / 'definitions',
+            ],
+            return_individual_dsds=True,
+        )
+    ###END def TestLazyCodelists.setUp
+
+    def test_codelists_are_merged_once_on_access(self):
+        with unittest.mock.patch.object(
+                MergedDataStructureDefinition,
+                'merge_codelists',
+                wraps=MergedDataStructureDefinition.merge_codelists,
+        ) as _merge:
+            dsd = MergedDataStructureDefinition(self.definitions)
+            self.assertEqual(_merge.call_count, 0)
+            variable_codelist = dsd.variable
+            self.assertIs(dsd.variable, variable_codelist)
+            self.assertEqual(_merge.call_count, 1)
+        self.assertEqual(
+            list(variable_codelist.mapping),
+            ['Final Energy', 'Primary Energy'],
+        )
+        self.assertCountEqual(dsd.dimensions, ['region', 'variable'])
+        with self.assertRaises(AttributeError):
+            dsd.scenario
+    ###END def TestLazyCodelists.test_codelists_are_merged_once_on_access
+
+    def test_concurrent_first_access(self):
+        dsd = MergedDataStructureDefinition(self.definitions)
+        num_threads: int = 8
+        barrier = threading.Barrier(num_threads)
+        results: list[tp.Any] = []
+        def _access() -> None:
+            barrier.wait()
+            results.append(dsd.variable)
+        with unittest.mock.patch.object(
+                MergedDataStructureDefinition,
+                'merge_codelists',
+                wraps=MergedDataStructureDefinition.merge_codelists,
+        ) as _merge:
+            threads = [
+                threading.Thread(target=_access) for _ in range(num_threads)
+            ]
+            for _thread in threads:
+                _thread.start()
+            for _thread in threads:
+                _thread.join()
+        self.assertEqual(_merge.call_count, 1)
+        self.assertEqual(len(results), num_threads)
+        self.assertTrue(all(_result is dsd.variable for _result in results))
+    ###END def TestLazyCodelists.test_concurrent_first_access
+
+    def test_copy_and_pickle_before_access(self):
+        dsd = MergedDataStructureDefinition(self.definitions)
+        for _copied in (copy.deepcopy(dsd), pickle.loads(pickle.dumps(dsd))):
+            with self.subTest(copied=_copied):
+                self.assertEqual(
+                    list(_copied.region.mapping),
+                    list(dsd.region.mapping),
+                )
+    ###END def TestLazyCodelists.test_copy_and_pickle_before_access
+
+###END class TestLazyCodelists
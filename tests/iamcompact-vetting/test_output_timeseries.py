@@ -0,0 +1,58 @@
+"""Tests for the output.timeseries module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.output.base import NoWriter
+from iam_validation.output.timeseries import TimeseriesRefFullComparisonOutput
+
+
+
+class TestTimeseriesRefFullComparisonOutput(unittest.TestCase):
+    """Tests for `TimeseriesRefFullComparisonOutput`."""
+
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['model_a'], ['scen_a', 'scen_b'], ['World'], ['Primary Energy'],
+         ['EJ/yr'], [2020, 2025]],
+        names=['model', 'scenario', 'region', 'variable', 'unit', 'year'],
+    )
+    data = pyam.IamDataFrame(
+        pd.Series([1.0, 2.0, 0.0, 8.0], index=index, name='value')
+    )
+    reference = pyam.IamDataFrame(
+        pd.Series(
+            [1.0, 0.0],
+            index=index[:2].set_levels(['ref_model'], level='model'),
+            name='value',
+        )
+    )
+
+    def setUp(self):
+        self.criterion = TimeseriesRefCriterion(
+            'test_output', self.reference, 'diff', default_agg_dims='time',
+        )
+    ###END def TestTimeseriesRefFullComparisonOutput.setUp
+
+    def test_float32_output(self):
+        output = TimeseriesRefFullComparisonOutput(
+            criteria=self.criterion, writer=NoWriter(), float32=True,
+        )
+        output_df: pd.DataFrame = output.prepare_output(self.data)
+        self.assertTrue((output_df.dtypes == np.float32).all())
+    ###END def TestTimeseriesRefFullComparisonOutput.test_float32_output
+
+    def test_compact_input(self):
+        output = TimeseriesRefFullComparisonOutput(
+            criteria=self.criterion, writer=NoWriter(),
+        )
+        full: pd.Series = self.criterion.compare(self.data)
+        pd.testing.assert_frame_equal(
+            output.prepare_output(self.criterion.compare(self.data, compact=True)),
+            full.unstack('year'),
+        )
+    ###END def TestTimeseriesRefFullComparisonOutput.test_compact_input
+
+###END class TestTimeseriesRefFullComparisonOutput
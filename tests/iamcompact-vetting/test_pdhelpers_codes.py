@@ -0,0 +1,138 @@
+"""Tests for the level-code based functions in the pdhelpers module."""
+import unittest
+import typing as tp
+
+import numpy as np
+import pandas as pd
+
+from iam_validation.pdhelpers import (
+    LevelGrouping,
+    SEGMENT_REDUCTIONS,
+    compact_series,
+    unstack_level,
+)
+
+
+
+class TestLevelGrouping(unittest.TestCase):
+    """Tests for the `LevelGrouping` class."""
+
+    @classmethod
+    def get_series(cls) -> pd.Series:
+        """Create a shuffled Series with NaN and infinite values."""
+        rng = np.random.default_rng(7)
+        index = pd.MultiIndex.from_product(
+            [['m_b', 'm_a'], ['r_2', 'r_1', 'r_3'], ['v'], [2030, 2020, 2025]],
+            names=['model', 'region', 'variable', 'year'],
+        )
+        s = pd.Series(rng.normal(size=len(index)) * 1e3, index=index,
+                      name='value')
+        s.iloc[[0, 1, 2, 7]] = np.nan
+        s.iloc[10] = np.inf
+        return s.iloc[rng.permutation(len(s))]
+    ###END def TestLevelGrouping.get_series
+
+    def test_reduce_matches_pandas(self):
+        s = self.get_series()
+        for _drop in (['year'], ['region'], ['region', 'year']):
+            grouping = LevelGrouping.from_index(s.index, _drop)
+            for _func in sorted(SEGMENT_REDUCTIONS):
+                expected = s.groupby(s.index.names.difference(_drop)).agg(_func)
+                result = pd.Series(
+                    grouping.reduce(s.to_numpy(), _func),
+                    index=grouping.result_index,
+                    name=s.name,
+                )
+                pd.testing.assert_series_equal(result, expected)
+    ###END def TestLevelGrouping.test_reduce_matches_pandas
+
+    def test_drop_levels_matches_sequential_groupby(self):
+        s = self.get_series()
+        grouping = LevelGrouping.from_index(s.index, ['region'])
+        first = grouping.reduce(s.to_numpy(), 'sum')
+        second_grouping = grouping.drop_levels(['year'])
+        expected = s.groupby(['model', 'variable', 'year']).sum() \
+            .groupby(['model', 'variable']).max()
+        pd.testing.assert_series_equal(
+            pd.Series(
+                second_grouping.reduce(first, 'max'),
+                index=second_grouping.result_index,
+                name=s.name,
+            ),
+            expected,
+        )
+    ###END def TestLevelGrouping.test_drop_levels_matches_sequential_groupby
+
+###END class TestLevelGrouping
+
+
+class TestCompactSeries(unittest.TestCase):
+    """Tests for the `compact_series` function."""
+
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['model_a', 'model_b'], ['scen_a', 'scen_b', 'scen_c'],
+         [2020, 2025, 2030]],
+        names=['model', 'scenario', 'year'],
+    )
+    s: pd.Series = pd.Series(
+        np.linspace(0.1, 1.7, len(index)),
+        index=index,
+        name='value',
+    )
+
+    def test_same_values_and_order(self):
+        filtered: pd.Series = self.s[
+            self.s.index.get_level_values('scenario') != 'scen_b'
+        ]
+        filtered.index.get_loc(('model_a', 'scen_a', 2020))
+        compact: pd.Series = compact_series(filtered)
+        # The hash table built by the lookup is not carried over.
+        self.assertNotIn('_engine', compact.index._cache)
+        pd.testing.assert_series_equal(compact, filtered)
+        self.assertEqual(
+            list(tp.cast(pd.MultiIndex, compact.index).levels[1]),
+            ['scen_a', 'scen_c'],
+        )
+    ###END def TestCompactSeries.test_same_values_and_order
+
+    def test_float32(self):
+        compact: pd.Series = compact_series(self.s, float32=True)
+        self.assertEqual(compact.dtype, np.float32)
+        np.testing.assert_allclose(compact.to_numpy(), self.s.to_numpy(),
+                                   rtol=1e-6)
+        self.assertTrue(compact.index.equals(self.s.index))
+    ###END def TestCompactSeries.test_float32
+
+###END class TestCompactSeries
+
+
+class TestUnstackLevel(unittest.TestCase):
+    """Tests for the `unstack_level` function."""
+
+    index: pd.MultiIndex = pd.MultiIndex.from_product(
+        [['model_b', 'model_a'], ['scen_b', 'scen_a'], [2030, 2020, 2025]],
+        names=['model', 'scenario', 'year'],
+    )
+    # Shuffled, and with some rows missing.
+    s: pd.Series = pd.Series(
+        np.linspace(0.1, 1.2, len(index)),
+        index=index,
+        name='value',
+    ).iloc[[5, 0, 7, 2, 11, 9, 1, 3, 10]]
+
+    def test_matches_pandas_unstack(self):
+        for _s in (self.s, compact_series(self.s, float32=True),
+                   self.s.droplevel('scenario').iloc[:3]):
+            with self.subTest(dtype=_s.dtype, nlevels=_s.index.nlevels):
+                pd.testing.assert_frame_equal(
+                    unstack_level(_s, 'year'),
+                    _s.unstack('year'),
+                )
+    ###END def TestUnstackLevel.test_matches_pandas_unstack
+
+    def test_duplicates_raise(self):
+        with self.assertRaises(ValueError):
+            unstack_level(pd.concat([self.s, self.s]), 'year')
+    ###END def TestUnstackLevel.test_duplicates_raise
+
+###END class TestUnstackLevel
@@ -0,0 +1,141 @@
+"""Tests for the cached and level-code based functions in pyam_helpers."""
+import unittest
+import typing as tp
+
+import pyam
+import pandas as pd
+
+from iam_validation.pyam_helpers import (
+    as_pandas_series,
+    broadcast_dims,
+    get_unit_conversion_factor,
+    unit_conversion_cache_info,
+    clear_unit_conversion_cache,
+    convert_units_to,
+    exact_match_mask,
+    filter_series,
+    used_level_values,
+)
+
+
+
+class TestUnitConversionFactors(unittest.TestCase):
+    """Tests for cached unit conversion factors."""
+
+    def test_factor_and_cache_statistics(self):
+        clear_unit_conversion_cache()
+        self.assertAlmostEqual(
+            get_unit_conversion_factor('EJ/yr', 'TWh/yr'),
+            1000.0/3.6,
+        )
+        self.assertAlmostEqual(
+            get_unit_conversion_factor('EJ/yr', 'TWh/yr'),
+            1000.0/3.6,
+        )
+        self.assertEqual(get_unit_conversion_factor('Mt CO2', 'Mt CO2'), 1.0)
+        cache_info = unit_conversion_cache_info()
+        self.assertEqual(cache_info.misses, 2)
+        self.assertEqual(cache_info.hits, 1)
+        clear_unit_conversion_cache()
+        self.assertEqual(unit_conversion_cache_info().currsize, 0)
+    ###END def TestUnitConversionFactors.test_factor_and_cache_statistics
+
+    def test_convert_units_to(self):
+        df = pyam.IamDataFrame(pd.DataFrame([
+            ['model_a', 'scen_a', 'region_a', 'variable_a', 'EJ/yr', 2005, 3.6],
+            ['model_a', 'scen_a', 'region_a', 'variable_b', 'TWh/yr', 2005, 2.0],
+        ], columns=['model', 'scenario', 'region', 'variable', 'unit', 'year', 'value']))
+        result = convert_units_to(df, 'TWh/yr')
+        self.assertEqual(result.unit, ['TWh/yr'])
+        self.assertEqual(
+            result.filter(variable='variable_a')._data.iloc[0],  # pyright: ignore[reportOptionalMemberAccess]
+            1000.0,
+        )
+        self.assertEqual(
+            result.filter(variable='variable_b')._data.iloc[0],  # pyright: ignore[reportOptionalMemberAccess]
+            2.0,
+        )
+    ###END def TestUnitConversionFactors.test_convert_units_to
+
+###END class TestUnitConversionFactors
+
+
+class TestBroadcastDimsCodes(unittest.TestCase):
+    """Tests for the `codes` method of the broadcast_dims function."""
+
+    # The `codes` and `rename` methods should give the same data
+    def test_codes_and_rename_methods_equal(self):
+        df = pyam.IamDataFrame(pd.DataFrame([
+            ['model_a', 'scen_a', 'region_a', 'variable_a', 'unit_a', 2005, 1.0],
+            ['model_a', 'scen_a', 'region_a', 'variable_b', 'unit_b', 2010, 2.5]
+        ], columns=['model', 'scenario', 'region', 'variable', 'unit', 'year', 'value']))
+        target = pyam.IamDataFrame(pd.DataFrame([
+            ['model_b', 'scen_b', 'region_b', 'variable_a', 'unit_a', 2005, 1.0],
+            ['model_c', 'scen_c', 'region_c', 'variable_a', 'unit_a', 2005, 3.0],
+            ['model_c', 'scen_d', 'region_c', 'variable_a', 'unit_a', 2005, 3.0]
+        ], columns=['model', 'scenario', 'region', 'variable', 'unit', 'year', 'value']))
+
+        result_codes = broadcast_dims(df, target, ['model', 'scenario'],
+                                      method='codes')
+        result_rename = broadcast_dims(df, target, ['model', 'scenario'],
+                                       method='rename')
+
+        self.assertEqual(len(result_codes._data), 2*2*3)
+        pd.testing.assert_series_equal(
+            result_codes._data.sort_index(),
+            result_rename._data.sort_index(),
+        )
+    ###END def TestBroadcastDimsCodes.test_codes_and_rename_methods_equal
+
+###END class TestBroadcastDimsCodes
+
+
+class TestFilterSeries(unittest.TestCase):
+    """Tests for exact-match filtering on level codes."""
+
+    df = pyam.IamDataFrame(pd.DataFrame([
+        ['model_a', 'scen_a', 'region_a', 'variable_a', 'unit_a', 2005, 1.0],
+        ['model_a', 'scen_a', 'region_b', 'variable_a', 'unit_a', 2005, 2.0],
+        ['model_a', 'scen_a', 'region_a', 'variable_b', 'unit_b', 2010, 3.0],
+        ['model_a', 'scen_a', 'region_b', 'variable_*', 'unit_b', 2010, 4.0],
+    ], columns=['model', 'scenario', 'region', 'variable', 'unit', 'year', 'value']))
+
+    def test_same_as_pyam_filter(self):
+        coords = {'region': ['region_a'], 'variable': ['variable_a', 'variable_b']}
+        s = as_pandas_series(self.df)
+        pd.testing.assert_series_equal(
+            filter_series(s, coords),
+            as_pandas_series(
+                tp.cast(pyam.IamDataFrame, self.df.filter(**coords))
+            ),
+        )
+    ###END def TestFilterSeries.test_same_as_pyam_filter
+
+    def test_no_pattern_matching(self):
+        s = as_pandas_series(self.df)
+        self.assertEqual(
+            filter_series(s, {'variable': ['variable_*']}).to_list(),
+            [4.0],
+        )
+    ###END def TestFilterSeries.test_no_pattern_matching
+
+    def test_all_rows_kept_returns_input(self):
+        s = as_pandas_series(self.df)
+        self.assertIs(filter_series(s, {'model': ['model_a']}), s)
+    ###END def TestFilterSeries.test_all_rows_kept_returns_input
+
+    def test_unused_level_values_and_missing_codes(self):
+        s = as_pandas_series(self.df).iloc[:2]
+        self.assertEqual(
+            used_level_values(s.index, 'variable').to_list(),
+            ['variable_a'],
+        )
+        index = s.index.set_codes([0, -1], level='region')
+        self.assertEqual(
+            exact_match_mask(index, {'region': ['region_a', 'region_b']})
+                .tolist(),
+            [True, False],
+        )
+    ###END def TestFilterSeries.test_unused_level_values_and_missing_codes
+
+###END class TestFilterSeries
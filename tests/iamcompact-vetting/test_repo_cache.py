@@ -0,0 +1,109 @@
+"""Tests for loading definitions from a URL through a local mirror cache."""
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import git
+
+from iam_validation.nomenclature import NomenclatureDefs
+from iam_validation.nomenclature.repo_cache import (
+    RepoMirrorCache,
+    RepositoryNotCachedError,
+)
+
+
+
+def commit_definitions(repo: git.Repo, variables: list[str]) -> str:
+    """Write definitions to the working tree of `repo` and commit them."""
+    root = Path(repo.working_dir)
+    (root / 'definitions' / 'variable').mkdir(parents=True, exist_ok=True)
+    (root / 'definitions' / 'region').mkdir(parents=True, exist_ok=True)
+    (root / 'definitions' / 'variable' / 'variables.yaml').write_text(
+        ''.join(f'- {_var}:\n    unit: EJ/yr\n' for _var in variables)
+    )
+    (root / 'definitions' / 'region' / 'regions.yaml').write_text(
+        '- World:\n  - World\n'
+    )
+    repo.index.add(['definitions'])
+    return repo.index.commit(
+        'Update definitions',
+        author=git.Actor('test', 'test@example.com'),
+        committer=git.Actor('test', 'test@example.com'),
+    ).hexsha
+###END def commit_definitions
+
+
+class TestRepoMirrorCache(unittest.TestCase):
+    """Tests for `NomenclatureDefs.from_url` with a cache directory."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = Path(self.tmpdir.name)
+        self.source = git.Repo.init(root / 'source', initial_branch='main')
+        self.first_commit = commit_definitions(self.source, ['Primary Energy'])
+        # Use a local bare repository as a stand-in for the remote.
+        self.url = str(root / 'remote.git')
+        self.source.clone(self.url, bare=True)
+        self.source.create_remote('origin', self.url)
+        self.cache_dir = root / 'cache'
+    ###END def TestRepoMirrorCache.setUp
+
+    def load(self, **kwargs) -> NomenclatureDefs:
+        return NomenclatureDefs.from_url(
+            self.url,
+            dimensions=['variable', 'region'],
+            region_mappings=False,
+            cache_dir=self.cache_dir,
+            **kwargs,
+        )
+    ###END def TestRepoMirrorCache.load
+
+    def test_parsed_definitions_are_reused(self):
+        defs = self.load()
+        self.assertIn('Primary Energy', defs.dsd.variable.mapping)
+        with unittest.mock.patch.object(
+                NomenclatureDefs,
+                '_load_from_url',
+                side_effect=AssertionError('definitions should not be parsed'),
+        ):
+            cached = self.load()
+        self.assertEqual(
+            list(cached.dsd.variable.mapping),
+            list(defs.dsd.variable.mapping),
+        )
+    ###END def TestRepoMirrorCache.test_parsed_definitions_are_reused
+
+    def test_new_commit_is_fetched_and_parsed(self):
+        self.load()
+        second_commit = commit_definitions(
+            self.source,
+            ['Primary Energy', 'Final Energy'],
+        )
+        self.source.remotes.origin.push('main')
+        self.assertEqual(
+            RepoMirrorCache(self.cache_dir).resolve_commit(self.url),
+            second_commit,
+        )
+        self.assertIn('Final Energy', self.load().dsd.variable.mapping)
+        # The pinned first commit still gives the old definitions.
+        self.assertNotIn(
+            'Final Energy',
+            self.load(git_hash=self.first_commit).dsd.variable.mapping,
+        )
+    ###END def TestRepoMirrorCache.test_new_commit_is_fetched_and_parsed
+
+    def test_offline_with_pinned_commit(self):
+        with self.assertRaises(RepositoryNotCachedError):
+            self.load(offline=True)
+        self.load(git_hash=self.first_commit)
+        shutil.rmtree(self.url)
+        defs = self.load(git_hash=self.first_commit[:10], offline=True)
+        self.assertIn('Primary Energy', defs.dsd.variable.mapping)
+        with self.assertRaises(RepositoryNotCachedError):
+            self.load(git_hash='0' * 40, offline=True)
+    ###END def TestRepoMirrorCache.test_offline_with_pinned_commit
+
+###END class TestRepoMirrorCache
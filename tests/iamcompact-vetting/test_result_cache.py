@@ -0,0 +1,238 @@
+"""Tests for the on-disk result cache in `iam_validation.result_cache`."""
+import tempfile
+import typing as tp
+import unittest
+import unittest.mock
+
+import pandas as pd
+import pyam
+import pytest
+
+from iam_validation.caching import (
+    UnidentifiableCallableError,
+    criterion_fingerprint,
+)
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.criteria.timeseries_criteria_core import (
+    get_diff_comparison,
+    get_ratio_comparison,
+)
+from iam_validation.result_cache import ResultCache
+from iam_validation.targets.target_classes import CriterionTargetRange
+
+
+
+def make_criterion(
+        reference: pyam.IamDataFrame,
+        comparison_function: str = 'ratio',
+) -> TimeseriesRefCriterion:
+    return TimeseriesRefCriterion(
+        criterion_name='test_criterion',
+        reference=reference,
+        comparison_function=comparison_function,
+    )
+###END def make_criterion
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestCriterionFingerprint(unittest.TestCase):
+    """Tests for criterion fingerprints."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        value_range=(1.0, 4.0),
+        reference_factor=2.0,
+    )
+
+    def test_fingerprint_is_deterministic(self):
+        self.assertEqual(
+            make_criterion(self.reference).fingerprint(),
+            make_criterion(self.reference.copy()).fingerprint(),
+        )
+    ###END def TestCriterionFingerprint.test_fingerprint_is_deterministic
+
+    def test_fingerprint_changes_with_configuration(self):
+        fingerprint: str = make_criterion(self.reference).fingerprint()
+        self.assertNotEqual(
+            fingerprint,
+            make_criterion(self.reference, 'diff').fingerprint(),
+        )
+        self.assertNotEqual(
+            fingerprint,
+            make_criterion(self.reference.multiply(2.0, 'variable_a',
+                                                   'variable_a',
+                                                   ignore_units=True))
+                .fingerprint(),
+        )
+    ###END def TestCriterionFingerprint.test_fingerprint_changes_with_configuration
+
+    def test_target_range_fingerprint(self):
+        target = CriterionTargetRange(
+            criterion=make_criterion(self.reference),
+            target=1.0,
+            range=(0.8, 1.2),
+        )
+        self.assertEqual(criterion_fingerprint(target), target.fingerprint())
+        self.assertNotEqual(
+            target.fingerprint(),
+            make_criterion(self.reference).fingerprint(),
+        )
+    ###END def TestCriterionFingerprint.test_target_range_fingerprint
+
+    def test_kernel_comparison_functions(self):
+        fingerprints: list[str] = [
+            TimeseriesRefCriterion(
+                'test_criterion', self.reference, _func,
+            ).fingerprint()
+            for _func in (
+                get_diff_comparison(),
+                get_ratio_comparison(),
+                get_ratio_comparison(div_by_zero_value=0.0),
+                get_ratio_comparison(div_by_zero_value=0.0),
+            )
+        ]
+        self.assertEqual(len(set(fingerprints[:3])), 3)
+        self.assertEqual(fingerprints[2], fingerprints[3])
+    ###END def TestCriterionFingerprint.test_kernel_comparison_functions
+
+    def test_unidentifiable_function(self):
+        criterion = TimeseriesRefCriterion(
+            'test_criterion', self.reference,
+            lambda _ref, _data: _data._data - 1.0,
+        )
+        with self.assertRaises(UnidentifiableCallableError):
+            criterion.fingerprint()
+    ###END def TestCriterionFingerprint.test_unidentifiable_function
+
+###END class TestCriterionFingerprint
+
+
+@pytest.mark.usefixtures('data_and_reference')
+class TestResultCache(unittest.TestCase):
+    """Tests for `ResultCache`."""
+
+    data_params: tp.ClassVar[dict[str, tp.Any]] = dict(
+        value_range=(1.0, 4.0),
+        reference_factor=2.0,
+    )
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    ###END def TestResultCache.setUp
+
+    def test_second_call_is_read_from_cache(self):
+        cache = ResultCache(self.tmpdir.name)
+        criterion: TimeseriesRefCriterion = make_criterion(self.reference)
+        expected: pd.Series = criterion.get_values(self.data)
+        first: pd.Series = cache.get_values(criterion, self.data)
+        pd.testing.assert_series_equal(first, expected)
+        with unittest.mock.patch.object(
+                TimeseriesRefCriterion,
+                'get_values',
+                side_effect=AssertionError('get_values should not be called'),
+        ):
+            second: pd.Series = cache.get_values(criterion, self.data)
+        pd.testing.assert_series_equal(second, expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 1)
+    ###END def TestResultCache.test_second_call_is_read_from_cache
+
+    def test_closures_do_not_share_results(self):
+        cache = ResultCache(self.tmpdir.name)
+        diff = TimeseriesRefCriterion(
+            'test_criterion', self.reference, get_diff_comparison(),
+        )
+        ratio = TimeseriesRefCriterion(
+            'test_criterion', self.reference, get_ratio_comparison(),
+        )
+        cache.get_values(diff, self.data)
+        pd.testing.assert_series_equal(
+            cache.get_values(ratio, self.data),
+            ratio.get_values(self.data),
+        )
+        self.assertEqual(len(cache), 2)
+    ###END def TestResultCache.test_closures_do_not_share_results
+
+    def test_unidentifiable_function_is_not_cached(self):
+        cache = ResultCache(self.tmpdir.name)
+        criterion = TimeseriesRefCriterion(
+            'test_criterion', self.reference,
+            lambda _ref, _data: _data._data - 1.0,
+        )
+        pd.testing.assert_series_equal(
+            cache.get_values(criterion, self.data),
+            criterion.get_values(self.data),
+        )
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+    ###END def TestResultCache.test_unidentifiable_function_is_not_cached
+
+    def test_cache_persists_across_instances(self):
+        criterion: TimeseriesRefCriterion = make_criterion(self.reference)
+        expected: pd.Series = ResultCache(self.tmpdir.name).get_values(
+            criterion,
+            self.data,
+            agg_dims='time',
+        )
+        cache = ResultCache(self.tmpdir.name)
+        pd.testing.assert_series_equal(
+            cache.get_values(
+                make_criterion(self.reference),
+                self.data,
+                agg_dims='time',
+            ),
+            expected,
+        )
+        self.assertEqual(cache.hits, 1)
+    ###END def TestResultCache.test_cache_persists_across_instances
+
+    def test_changes_are_cache_misses(self):
+        cache = ResultCache(self.tmpdir.name)
+        criterion: TimeseriesRefCriterion = make_criterion(self.reference)
+        cache.get_values(criterion, self.data)
+        changed_data = pyam.IamDataFrame(self.data._data + 1.0)
+        pd.testing.assert_series_equal(
+            cache.get_values(criterion, changed_data),
+            criterion.get_values(changed_data),
+        )
+        cache.get_values(make_criterion(self.reference, 'diff'), self.data)
+        cache.get_values(criterion, self.data, agg_dims='time')
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+        self.assertEqual(len(cache), 4)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+    ###END def TestResultCache.test_changes_are_cache_misses
+
+    def test_lookup_does_not_depend_on_index(self):
+        cache = ResultCache(self.tmpdir.name)
+        criterion: TimeseriesRefCriterion = make_criterion(self.reference)
+        cache.get_values(criterion, self.data)
+        # Simulate an index entry lost to a concurrent writer.
+        (cache.directory / ResultCache.INDEX_FILE_NAME).write_text('{}')
+        key: str = ResultCache.make_key(criterion, self.data, {})
+        self.assertIn(key, cache)
+        self.assertEqual(len(cache), 1)
+        pd.testing.assert_series_equal(
+            cache.get(key),
+            criterion.get_values(self.data),
+        )
+        cache.clear()
+        self.assertNotIn(key, cache)
+    ###END def TestResultCache.test_lookup_does_not_depend_on_index
+
+    def test_target_range_values(self):
+        cache = ResultCache(self.tmpdir.name)
+        target = CriterionTargetRange(
+            criterion=make_criterion(self.reference),
+            target=1.0,
+            range=(0.8, 1.2),
+        )
+        expected: pd.Series = target.get_values(self.data)
+        cache.get_values(target, self.data)
+        pd.testing.assert_series_equal(
+            cache.get_values(target, self.data),
+            expected,
+        )
+        self.assertEqual(cache.hits, 1)
+    ###END def TestResultCache.test_target_range_values
+
+###END class TestResultCache
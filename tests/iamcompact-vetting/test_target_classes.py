@@ -0,0 +1,244 @@
+"""Tests for the targets.target_classes module."""
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+
+from iam_validation.criteria import TimeseriesRefCriterion
+from iam_validation.targets.target_classes import (
+    CriterionTargetRange,
+    CriterionTargetRangeResult,
+    RelativeRange,
+)
+
+
+
+def make_ratio_target_range(
+        range: tuple[float, float]|RelativeRange|None = (0.8, 1.2),
+) -> tuple[CriterionTargetRange, pyam.IamDataFrame]:
+    """Make a CriterionTargetRange for mean ratios and data to evaluate."""
+    reference = pyam.IamDataFrame(pd.DataFrame({
+        'model': ['ref_model']*2,
+        'scenario': ['ref_scen']*2,
+        'region': ['World']*2,
+        'variable': ['Primary Energy']*2,
+        'unit': ['EJ/yr']*2,
+        'year': [2020, 2025],
+        'value': [100.0, 200.0],
+    }))
+    data = pyam.IamDataFrame(pd.DataFrame({
+        'model': ['model_a']*6,
+        'scenario': ['scen_a']*2 + ['scen_b']*2 + ['scen_c']*2,
+        'region': ['World']*6,
+        'variable': ['Primary Energy']*6,
+        'unit': ['EJ/yr']*6,
+        'year': [2020, 2025]*3,
+        'value': [100.0, 200.0, 150.0, 300.0, 0.0, np.nan],
+    }))
+    criterion = TimeseriesRefCriterion(
+        criterion_name='Primary Energy ratio',
+        reference=reference,
+        comparison_function='ratio',
+        default_agg_dims='both',
+    )
+    return CriterionTargetRange(criterion, target=1.0, range=range), data
+###END def make_ratio_target_range
+
+
+class TestCriterionTargetRangeEvaluate(unittest.TestCase):
+    """Tests for `CriterionTargetRange.evaluate` and the methods using it."""
+
+    def test_evaluate_consistent_with_separate_methods(self):
+        target_range, data = make_ratio_target_range()
+        result = target_range.evaluate(data)
+        self.assertIsInstance(result, CriterionTargetRangeResult)
+        pd.testing.assert_series_equal(
+            result.values, target_range.get_values(data)
+        )
+        pd.testing.assert_series_equal(
+            result.distances, target_range.get_distances(data)
+        )
+        pd.testing.assert_series_equal(
+            result.in_range, target_range.get_in_range(data)
+        )
+        self.assertEqual(
+            list(result.in_range),
+            [True, False, False],
+        )
+        np.testing.assert_allclose(
+            result.distances.to_numpy(dtype=float),
+            [0.0, 2.5, -5.0],
+        )
+    ###END def TestCriterionTargetRangeEvaluate.test_evaluate_consistent_with_separate_methods
+
+    def test_evaluate_calls_get_values_once(self):
+        target_range, data = make_ratio_target_range()
+        call_count: list[int] = [0]
+        get_values = target_range.criterion.get_values
+        def _counting_get_values(*args, **kwargs):
+            call_count[0] += 1
+            return get_values(*args, **kwargs)
+        target_range.criterion.get_values = _counting_get_values  # pyright: ignore[reportAttributeAccessIssue]
+        target_range.evaluate(data)
+        self.assertEqual(call_count[0], 1)
+    ###END def TestCriterionTargetRangeEvaluate.test_evaluate_calls_get_values_once
+
+    def test_evaluate_without_range(self):
+        target_range, data = make_ratio_target_range(range=None)
+        result = target_range.evaluate(data)
+        self.assertTrue(result.in_range.isna().all())
+        with self.assertRaises(ValueError):
+            target_range.get_in_range(data)
+    ###END def TestCriterionTargetRangeEvaluate.test_evaluate_without_range
+
+###END class TestCriterionTargetRangeEvaluate
+
+
+def make_unit_data_and_criterion(
+        comparison_function: str,
+) -> tuple[TimeseriesRefCriterion, pyam.IamDataFrame]:
+    """Make a criterion with a reference in `EJ/yr` and data in `TWh/yr`.
+
+    The data values are 1.0 and 2.0 EJ/yr expressed in TWh/yr, and the
+    reference values are 0.5 and 1.0 EJ/yr.
+    """
+    reference = pyam.IamDataFrame(pd.DataFrame({
+        'model': ['ref_model']*2,
+        'scenario': ['ref_scen']*2,
+        'region': ['World']*2,
+        'variable': ['Primary Energy']*2,
+        'unit': ['EJ/yr']*2,
+        'year': [2020, 2025],
+        'value': [0.5, 1.0],
+    }))
+    data = pyam.IamDataFrame(pd.DataFrame({
+        'model': ['model_a']*2,
+        'scenario': ['scen_a']*2,
+        'region': ['World']*2,
+        'variable': ['Primary Energy']*2,
+        'unit': ['TWh/yr']*2,
+        'year': [2020, 2025],
+        'value': [1000.0 / 3.6, 2000.0 / 3.6],
+    }))
+    criterion = TimeseriesRefCriterion(
+        criterion_name=f'Primary Energy {comparison_function}',
+        reference=reference,
+        comparison_function=comparison_function,
+        default_agg_dims='both',
+    )
+    return criterion, data
+###END def make_unit_data_and_criterion
+
+
+class TestCriterionTargetRangeUnits(unittest.TestCase):
+    """Tests for the unit conversions of `CriterionTargetRange.get_values`."""
+
+    def test_convert_input_units(self):
+        criterion, data = make_unit_data_and_criterion('diff')
+        target_range = CriterionTargetRange(
+            criterion, target=0.0, unit='PJ/yr', convert_input_units=True,
+        )
+        # The data is converted to PJ/yr before the comparison, so the
+        # differences of 0.5 and 1.0 EJ/yr are in PJ/yr.
+        np.testing.assert_allclose(
+            target_range.get_values(data).to_numpy(dtype=float),
+            [750.0],
+        )
+    ###END def TestCriterionTargetRangeUnits.test_convert_input_units
+
+    def test_convert_value_units(self):
+        criterion, data = make_unit_data_and_criterion('diff')
+        target_range = CriterionTargetRange(
+            criterion, target=0.0, unit='TWh/yr', convert_input_units=False,
+            convert_value_units=True, value_unit='EJ/yr',
+        )
+        # The criterion does no unit conversion, so its values are the
+        # differences of the TWh/yr data and the EJ/yr reference values.
+        # Those are then converted as if they were in EJ/yr.
+        criterion_values: pd.Series = criterion.get_values(data)
+        pd.testing.assert_series_equal(
+            target_range.get_values(data),
+            criterion_values * 1000.0 / 3.6,
+        )
+    ###END def TestCriterionTargetRangeUnits.test_convert_value_units
+
+    def test_convert_input_and_value_units(self):
+        criterion, data = make_unit_data_and_criterion('diff')
+        target_range = CriterionTargetRange(
+            criterion, target=0.0, unit='TWh/yr', convert_input_units=True,
+            convert_value_units=True, value_unit='EJ/yr',
+        )
+        # The data is converted to TWh/yr (a no-op here), so the criterion
+        # values are the same as without input conversion.
+        np.testing.assert_allclose(
+            target_range.get_values(data).to_numpy(dtype=float),
+            criterion.get_values(data).to_numpy(dtype=float) * 1000.0 / 3.6,
+        )
+    ###END def TestCriterionTargetRangeUnits.test_convert_input_and_value_units
+
+    def test_no_conversion_by_default(self):
+        criterion, data = make_unit_data_and_criterion('ratio')
+        target_range = CriterionTargetRange(
+            criterion, target=2.0, unit='EJ/yr',
+        )
+        pd.testing.assert_series_equal(
+            target_range.get_values(data),
+            criterion.get_values(data),
+        )
+    ###END def TestCriterionTargetRangeUnits.test_no_conversion_by_default
+
+###END class TestCriterionTargetRangeUnits
+
+
+class TestCriterionTargetRangeVectorized(unittest.TestCase):
+    """Tests for the vectorized in-range and distance methods."""
+
+    def test_vectorized_matches_scalar_methods(self):
+        target_range, _ = make_ratio_target_range(range=RelativeRange(0.5, 2.0))
+        values = pd.Series([1.0, 0.5, 2.0, 0.25, 4.0, np.nan])
+        for _vector_method, _scalar_method in (
+                (target_range.values_in_range, target_range.is_in_range),
+                (target_range.values_below_range, target_range.is_below_range),
+                (target_range.values_above_range, target_range.is_above_range),
+        ):
+            result = _vector_method(values)
+            self.assertEqual(result.dtype, 'boolean')
+            self.assertTrue(pd.isna(result.iloc[-1]))
+            self.assertEqual(
+                list(result.iloc[:-1]),
+                [_scalar_method(_v) for _v in values.iloc[:-1]],
+            )
+        np.testing.assert_allclose(
+            target_range.distances_from_values(values).to_numpy(),
+            values.apply(target_range.distance_func).to_numpy(),
+        )
+    ###END def TestCriterionTargetRangeVectorized.test_vectorized_matches_scalar_methods
+
+    def test_zero_width_range_side(self):
+        target_range, _ = make_ratio_target_range(range=(1.0, 2.0))
+        distances = target_range.distances_from_values(
+            pd.Series([0.5, 1.0, 1.5])
+        )
+        np.testing.assert_array_equal(
+            distances.to_numpy(),
+            [-np.inf, 0.0, 0.5],
+        )
+    ###END def TestCriterionTargetRangeVectorized.test_zero_width_range_side
+
+    def test_vectorized_distance_func(self):
+        calls: list[object] = []
+        def _distance_func(x):
+            calls.append(x)
+            return x * 2.0
+        target_range, _ = make_ratio_target_range()
+        target_range.distance_func = _distance_func
+        target_range.vectorized_distance_func = True
+        values = pd.Series([1.0, 2.0, np.nan])
+        distances = target_range.distances_from_values(values)
+        self.assertEqual(len(calls), 1)
+        self.assertIsInstance(calls[0], np.ndarray)
+        np.testing.assert_array_equal(distances.to_numpy(), [2.0, 4.0, np.nan])
+    ###END def TestCriterionTargetRangeVectorized.test_vectorized_distance_func
+
+###END class TestCriterionTargetRangeVectorized
@@ -0,0 +1,110 @@
+"""Tests for validating names against codelists."""
+import types
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyam
+from nomenclature.code import Code
+from nomenclature.codelist import CodeList
+
+from iam_validation.nomenclature.validation import (
+    CodeListValidator,
+    get_codelist_validator,
+    get_invalid_names,
+)
+
+
+
+def make_codelist(names: list[str], name: str = 'variable') -> CodeList:
+    """Make a CodeList with codes for `names`."""
+    codelist = CodeList(name=name, mapping={})
+    codelist.mapping = {_name: Code(name=_name) for _name in names}
+    return codelist
+###END def make_codelist
+
+
+class TestCodeListValidator(unittest.TestCase):
+    """Tests for `CodeListValidator` and `get_codelist_validator`."""
+
+    codelist = make_codelist([
+        'Primary Energy',
+        'Primary Energy|Coal (w/ CCS)',
+        'Emissions|*',
+        'Price|*|Index',
+        'Share.of [%]',
+    ])
+    items = [
+        'Emissions|CO2',
+        'Emissions',
+        'Final Energy',
+        'Price|Oil|Index',
+        'Price|Oil|Index2',
+        'Primary Energy',
+        'Primary Energy|Coal (w/ CCS)',
+        'Primary Energy|Coal',
+        'Share.of [%]',
+        'ShareXof [%]',
+    ]
+
+    def test_matches_validate_items(self):
+        self.assertEqual(
+            CodeListValidator(self.codelist.mapping.keys())
+                .invalid_items(self.items),
+            self.codelist.validate_items(self.items),
+        )
+    ###END def TestCodeListValidator.test_matches_validate_items
+
+    def test_valid_mask_with_duplicates_and_missing(self):
+        validator = CodeListValidator(self.codelist.mapping.keys())
+        np.testing.assert_array_equal(
+            validator.valid_mask(
+                ['Emissions|CO2', 'Final Energy', np.nan, 'Emissions|CO2']
+            ),
+            [True, False, False, True],
+        )
+        self.assertEqual(
+            validator.invalid_items(
+                ['Final Energy', 'Emissions', 'Final Energy']
+            ),
+            ['Final Energy', 'Emissions'],
+        )
+        self.assertEqual(validator.invalid_items([]), [])
+    ###END def TestCodeListValidator.test_valid_mask_with_duplicates_and_missing
+
+    def test_validator_is_reused_until_codes_change(self):
+        codelist = make_codelist(['Primary Energy'])
+        validator = get_codelist_validator(codelist)
+        self.assertIs(get_codelist_validator(codelist), validator)
+        codelist.mapping['Final Energy'] = Code(name='Final Energy')
+        updated = get_codelist_validator(codelist)
+        self.assertIsNot(updated, validator)
+        self.assertEqual(updated.invalid_items(['Final Energy']), [])
+    ###END def TestCodeListValidator.test_validator_is_reused_until_codes_change
+
+    def test_get_invalid_names(self):
+        df = pyam.IamDataFrame(
+            pd.DataFrame(
+                [
+                    ['model_a', 'scen_a', 'World', _variable, 'EJ/yr', 1.0]
+                    for _variable in self.items
+                ],
+                columns=['model', 'scenario', 'region', 'variable', 'unit',
+                         2020],
+            )
+        )
+        dsd = types.SimpleNamespace(
+            dimensions=['region', 'variable'],
+            region=make_codelist(['World'], name='region'),
+            variable=self.codelist,
+        )
+        self.assertEqual(
+            get_invalid_names(df, dsd),
+            {
+                'region': [],
+                'variable': self.codelist.validate_items(df.variable),
+            },
+        )
+    ###END def TestCodeListValidator.test_get_invalid_names
+
+###END class TestCodeListValidator